@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.crawlers import CRAWLERS
+from src.utils.structured_data import extract_structured
+
+
+# Synthetic pages built from each roastery's markup templates, not captured from the live shops; they measure parser
+# cost on a representative structure, so real pages may be heavier
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def load_fixture(name: str, page: str) -> str:
+    path = os.path.join(FIXTURE_DIR, name, f'{page}.html') if name else os.path.join(FIXTURE_DIR, f'{page}.html')
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+class FixtureServer:
+    def __init__(self, name: str):
+        self.listing = load_fixture(name, 'listing')
+        self.detail = load_fixture(name, 'detail')
+        self.empty = load_fixture('', 'empty_listing')
+        self.detail_mode = False
+        self.pages = 0
+    
+    def fetch_html(self, url: str) -> Optional[str]:
+        self.pages += 1
+        if self.detail_mode:
+            return self.detail
+        if 'page=' in url and not url.endswith('page=1'):
+            return self.empty
+        return self.listing
+
+
+def calibrate(rounds: int = 10) -> float:
+    # Pure-Python reference workload so baselines can be compared across machines
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        total = 0
+        for i in range(300000):
+            total += i * i % 7
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def best_rate(run, iterations: int, repeats: int) -> float:
+    # Best of several timed rounds, like calibrate(): scheduler noise only ever makes a round slower
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        best = min(best, time.perf_counter() - start)
+    return iterations / best
+
+
+def bench_crawler(name: str, iterations: int, repeats: int = 5) -> Dict[str, float]:
+    crawler = CRAWLERS[name]()
+    server = FixtureServer(name)
+    crawler.fetch_html = server.fetch_html
+    
+    # Warm-up: first calls pay for imports, compiled selectors and parser caches
+    urls = crawler.get_coffee_list_urls()
+    listing_pages = server.pages
+    if not urls:
+        raise RuntimeError(f"{name}: no product URLs found in listing fixture")
+    listing_rate = best_rate(crawler.get_coffee_list_urls, iterations, repeats) * listing_pages
+    
+    server.detail_mode = True
+    coffee = crawler.parse_coffee_detail(urls[0])
+    if coffee is None:
+        raise RuntimeError(f"{name}: detail fixture did not parse")
+    detail_rate = best_rate(lambda: crawler.parse_coffee_detail(urls[0]), iterations, repeats)
+    
+    tracemalloc.start()
+    try:
+        baseline_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        soup = crawler.make_soup(server.detail)
+        crawler.parse_coffee_page(soup, urls[0], extract_structured(server.detail))
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        del soup
+    finally:
+        tracemalloc.stop()
+    
+    stats = snapshot.statistics('filename')
+    return {
+        'listing_pages_per_sec': listing_rate,
+        'detail_pages_per_sec': detail_rate,
+        'alloc_blocks': sum(stat.count for stat in stats),
+        'alloc_kib': sum(stat.size for stat in stats) / 1024,
+        'peak_kib': (peak - baseline_current) / 1024,
+        'detail_bytes': len(server.detail.encode('utf-8')),
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict, calibration: float,
+            threshold: float) -> List[Tuple[str, str]]:
+    # A slower machine (higher calibration time) is expected to parse fewer pages per second
+    scale = baseline['calibration'] / calibration
+    regressions = []
+    
+    for name, result in results.items():
+        expected = baseline['results'].get(name)
+        if not expected:
+            continue
+        for metric in ('listing_pages_per_sec', 'detail_pages_per_sec'):
+            floor = expected[metric] * scale * (1 - threshold)
+            if result[metric] < floor:
+                regressions.append((name, f"{name} {metric}: {result[metric]:.1f} < {floor:.1f} "
+                                          f"(baseline {expected[metric]:.1f}, threshold {threshold:.0%})"))
+    
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark crawler parse paths on stored fixtures')
+    parser.add_argument('--roasteries', nargs='+', choices=list(CRAWLERS.keys()), default=list(CRAWLERS.keys()))
+    parser.add_argument('--iterations', type=int, default=20, help='Pages parsed per timed round')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed rounds per metric; the fastest one counts')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown before failing (0.2 = 20%%)')
+    parser.add_argument('--confirm', type=int, default=2,
+                        help='Times a roastery that looks slower is measured again before it counts as a regression')
+    parser.add_argument('--json', help='Also write the results to this file')
+    
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    
+    calibration = calibrate()
+    results = {}
+    
+    print(f"{'roastery':<16}{'listing p/s':>12}{'detail p/s':>12}{'blocks':>10}{'alloc KiB':>11}{'peak KiB':>10}")
+    for name in args.roasteries:
+        result = bench_crawler(name, args.iterations, args.repeats)
+        results[name] = result
+        print(f"{name:<16}{result['listing_pages_per_sec']:>12.1f}{result['detail_pages_per_sec']:>12.1f}"
+              f"{result['alloc_blocks']:>10}{result['alloc_kib']:>11.1f}{result['peak_kib']:>10.1f}")
+    
+    report = {'calibration': calibration, 'iterations': args.iterations, 'repeats': args.repeats, 'results': results}
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --save-baseline to create one")
+        return 0
+    
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    
+    regressions = compare(results, baseline, calibration, args.threshold)
+    for _ in range(args.confirm):
+        if not regressions:
+            break
+        # A slow round on a busy machine looks like a regression; only one that reproduces fails the run
+        flagged = sorted({name for name, _ in regressions})
+        print(f"Re-measuring {', '.join(flagged)}")
+        calibration = min(calibration, calibrate())
+        for name in flagged:
+            rerun = bench_crawler(name, args.iterations, args.repeats)
+            for metric in ('listing_pages_per_sec', 'detail_pages_per_sec'):
+                results[name][metric] = max(results[name][metric], rerun[metric])
+        regressions = compare(results, baseline, calibration, args.threshold)
+    
+    for _, regression in regressions:
+        print(f"REGRESSION {regression}")
+    
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('selenium', 'webdriver_manager', 'pandas', 'numpy', 'scipy')
+
+# name -> (command, budget in ms, modules that must not be imported)
+SCENARIOS: Dict[str, Tuple[List[str], float, Tuple[str, ...]]] = {
+    'cli-help': (
+        [os.path.join(ROOT, 'main.py'), '--help'],
+        80.0,
+        HEAVY_MODULES + ('requests', 'bs4', 'lxml', 'src.crawlers.base_crawler'),
+    ),
+    'single-crawler': (
+        ['-c', f"import sys; sys.path.insert(0, {ROOT!r}); "
+               "from src.crawlers import CRAWLERS; CRAWLERS['fritz']()"],
+        350.0,
+        HEAVY_MODULES,
+    ),
+}
+
+
+def measure(command: List[str]) -> Tuple[float, Dict[str, int], Dict[str, int]]:
+    # -X importtime lines: "import time: self | cumulative | name", nested imports are indented
+    with tempfile.TemporaryDirectory() as workdir:
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime'] + command,
+            cwd=workdir, capture_output=True, text=True
+        )
+    
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'failed')
+    
+    modules: Dict[str, int] = {}
+    top_level: Dict[str, int] = {}
+    after_site = False
+    
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        module = name.strip()
+        modules[module] = int(cumulative)
+        
+        # Interpreter startup imports finish with site; everything after is ours
+        if not name.startswith('  ') and name.strip() == 'site':
+            after_site = True
+            continue
+        if after_site and not name[1:].startswith(' '):
+            top_level[module] = int(cumulative)
+    
+    return sum(top_level.values()) / 1000, modules, top_level
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that CLI startup stays within its import-time budget')
+    parser.add_argument('--runs', type=int, default=5, help='Best-of runs per scenario')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget (e.g. 2 on slow CI machines)')
+    parser.add_argument('--top', type=int, default=0, help='Show the N slowest top-level imports per scenario')
+    
+    args = parser.parse_args()
+    failures = []
+    
+    for name, (command, budget, forbidden) in SCENARIOS.items():
+        runs = [measure(command) for _ in range(args.runs)]
+        best, modules, top_level = min(runs, key=lambda run: run[0])
+        limit = budget * args.scale
+        loaded = [module for module in forbidden
+                  if any(m == module or m.startswith(module + '.') for m in modules)]
+        
+        status = 'ok' if best <= limit and not loaded else 'FAIL'
+        print(f"{name:<16}{best:>8.1f} ms  (budget {limit:.0f} ms)  {status}")
+        
+        if args.top:
+            for module, cumulative in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+                print(f"    {cumulative / 1000:>8.1f} ms  {module}")
+        
+        if best > limit:
+            failures.append(f"{name}: {best:.1f} ms exceeds {limit:.0f} ms")
+        if loaded:
+            failures.append(f"{name}: imported {', '.join(loaded)}")
+    
+    for failure in failures:
+        print(f"BUDGET {failure}")
+    
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
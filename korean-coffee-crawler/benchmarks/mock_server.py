@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_parsers import load_fixture
+from src.crawlers import CRAWLERS
+from src.utils.urls import product_key
+
+
+PRODUCT_NUMBER = re.compile(r'(product_no=|goodsNo=|/product/[^/"]+/|/shop/product/[^"]*-|anchorBoxId_)(\d+)')
+
+
+def mock_base_url(server: str, name: str) -> str:
+    # Every roastery gets its own port so per-host politeness behaves as it does against the real shops
+    parsed = urlparse(server if '://' in server else f'http://{server}')
+    port = (parsed.port or 80) + list(CRAWLERS).index(name)
+    return f"{parsed.scheme}://{parsed.hostname}:{port}"
+
+
+class TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = max(rate, 1.0)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(max(self.rate, 1.0), self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class RoasteryStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.statuses: Dict[int, int] = {}
+        self.bytes_sent = 0
+        self.first_at: Optional[float] = None
+        self.last_at: Optional[float] = None
+        self.min_gap: Optional[float] = None
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    def arrived(self):
+        with self.lock:
+            now = time.monotonic()
+            if self.last_at is not None:
+                gap = now - self.last_at
+                self.min_gap = gap if self.min_gap is None else min(self.min_gap, gap)
+            self.first_at = self.first_at or now
+            self.last_at = now
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+    
+    def finished(self, status: int, size: int):
+        with self.lock:
+            self.in_flight -= 1
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.bytes_sent += size
+    
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = (self.last_at - self.first_at) if self.requests > 1 else 0.0
+        return {
+            'requests': self.requests,
+            'statuses': self.statuses,
+            'bytes_sent': self.bytes_sent,
+            'requests_per_sec': (self.requests - 1) / elapsed if elapsed else None,
+            'min_gap_sec': self.min_gap,
+            'max_concurrent': self.max_in_flight,
+        }
+
+
+class MockRoasteryServer(ThreadingHTTPServer):
+    daemon_threads = True
+    
+    def __init__(self, address, name: str, options: argparse.Namespace, registry: Dict[str, 'MockRoasteryServer']):
+        super().__init__(address, MockRoasteryHandler)
+        self.name = name
+        self.options = options
+        self.registry = registry
+        self.listing = load_fixture(name, 'listing')
+        self.detail = load_fixture(name, 'detail').encode('utf-8')
+        self.empty = load_fixture('', 'empty_listing').encode('utf-8')
+        self.bucket = TokenBucket(options.rate_limit) if options.rate_limit else None
+        self.random = random.Random(f"{options.seed}:{name}")
+        self.random_lock = threading.Lock()
+        self.stats = RoasteryStats()
+    
+    def roll(self) -> float:
+        with self.random_lock:
+            return self.random.random()
+    
+    def listing_page(self, page: int) -> bytes:
+        if page > self.options.pages:
+            return self.empty
+        offset = (page - 1) * 1000
+        html = PRODUCT_NUMBER.sub(lambda m: f"{m.group(1)}{int(m.group(2)) + offset}", self.listing)
+        return html.encode('utf-8')
+
+
+class MockRoasteryHandler(BaseHTTPRequestHandler):
+    server: MockRoasteryServer
+    
+    def do_GET(self):
+        # Stats requests are not crawler traffic, so they stay out of the counts they report
+        stats = self.server.stats if urlparse(self.path).path != '/__stats' else RoasteryStats()
+        stats.arrived()
+        status, body, headers = self.route()
+        
+        self.send_response(status)
+        self.send_header('Content-Type', headers.pop('Content-Type', 'text/html; charset=utf-8'))
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+        stats.finished(status, len(body))
+    
+    def route(self):
+        options = self.server.options
+        parsed = urlparse(self.path)
+        
+        if parsed.path == '/__stats':
+            stats = {name: server.stats.to_dict() for name, server in self.server.registry.items()}
+            return 200, json.dumps(stats, indent=2).encode('utf-8'), {'Content-Type': 'application/json'}
+        
+        if self.server.bucket and not self.server.bucket.take():
+            return 429, b'Too Many Requests', {'Retry-After': str(options.retry_after)}
+        
+        if options.latency:
+            time.sleep(max(0.0, options.latency + (self.server.roll() * 2 - 1) * options.jitter))
+        
+        if options.error_rate and self.server.roll() < options.error_rate:
+            return 503, b'Service Unavailable', {}
+        
+        if not product_key(parsed.path + '?' + parsed.query).startswith('url:') or '/shop/product/' in parsed.path:
+            return 200, self.server.detail, {}
+        
+        page = parse_qs(parsed.query).get('page', ['1'])[0]
+        return 200, self.server.listing_page(int(page) if page.isdigit() else 1), {}
+    
+    def log_message(self, format, *args):
+        if self.server.options.verbose:
+            super().log_message(format, *args)
+
+
+def serve(options: argparse.Namespace) -> Dict[str, MockRoasteryServer]:
+    registry: Dict[str, MockRoasteryServer] = {}
+    
+    for name in options.roasteries:
+        url = urlparse(mock_base_url(f"{options.host}:{options.port}", name))
+        server = MockRoasteryServer((url.hostname, url.port), name, options, registry)
+        registry[name] = server
+        thread = threading.Thread(target=server.serve_forever, name=f"mock-{name}", daemon=True)
+        thread.start()
+    
+    return registry
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve stored roastery pages locally for offline crawl testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8800, help='Port of the first roastery; the rest follow in order')
+    parser.add_argument('--roasteries', nargs='+', choices=list(CRAWLERS.keys()), default=list(CRAWLERS.keys()))
+    parser.add_argument('--pages', type=int, default=1, help='Listing pages per category before an empty page')
+    parser.add_argument('--latency', type=float, default=0.0, help='Mean response delay in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Uniform +/- spread around --latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Requests per second per roastery before 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for latency and error sampling')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    
+    options = parser.parse_args()
+    registry = serve(options)
+    
+    for name in registry:
+        print(f"{name:<16}{mock_base_url(f'{options.host}:{options.port}', name)}")
+    # Ports follow the full roastery list, so with --roasteries nothing may listen on --port itself
+    first = mock_base_url(f'{options.host}:{options.port}', next(iter(registry)))
+    print(f"Stats: {first}/__stats on any roastery's port  (Ctrl-C to stop)")
+    
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stats = {name: server.stats.to_dict() for name, server in registry.items()}
+        print(json.dumps(stats, indent=2))
+        for server in registry.values():
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,21 @@
 #!/usr/bin/env python3
 import logging
+import os
 import sys
 from datetime import datetime
+from typing import Optional, Tuple
 import argparse
 
-from src.crawlers.fritz_crawler import FritzCrawler
-from src.crawlers.center_crawler import CenterCrawler
-from src.crawlers.terarosa_crawler import TerarosaCrawler
-from src.crawlers.coffeelibre_crawler import CoffeeLibreCrawler
-from src.crawlers.momos_crawler import MomosCrawler
-from src.crawlers.anthracite_crawler import AnthraciteCrawler
-from src.crawlers.elcafe_crawler import ElCafeCrawler
-from src.crawlers.beanbrothers_crawler import BeanBrothersCrawler
-from src.crawlers.lowkey_crawler import LowkeyCrawler
-from src.crawlers.kihei_crawler import KiheiCrawler
-from src.crawlers.leesar_crawler import LeesarCrawler
-from src.crawlers.reflect_crawler import ReflectCrawler
-from src.crawlers.coffeeroasters_crawler import CoffeeRoastersCrawler
-from src.utils.data_saver import DataSaver
+from src.crawlers import CRAWLERS
+from src.utils.browser import BrowserService
+from src.utils.checkpoint import CrawlJournal
+from src.utils.data_saver import DataSaver, StreamingSink
+from src.utils.metrics import CrawlMetrics
+from src.utils.price_history import PriceHistory
+from src.utils.retry_queue import RetryQueue
+from src.utils.robots import RobotsCache
+from src.utils.seen_urls import SeenURLs
+from src.utils.urls import url_product_id
 
 
 logging.basicConfig(
@@ -31,22 +29,249 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Shared by real and mock runs: it is the same browser either way
+BROWSER_DIR = os.path.join('data', 'browser')
 
-CRAWLERS = {
-    'fritz': FritzCrawler,
-    'center': CenterCrawler,
-    'terarosa': TerarosaCrawler,
-    'coffeelibre': CoffeeLibreCrawler,
-    'momos': MomosCrawler,
-    'anthracite': AnthraciteCrawler,
-    'elcafe': ElCafeCrawler,
-    'beanbrothers': BeanBrothersCrawler,
-    'lowkey': LowkeyCrawler,
-    'kihei': KiheiCrawler,
-    'leesar': LeesarCrawler,
-    'reflect': ReflectCrawler,
-    'coffeeroasters': CoffeeRoastersCrawler,
-}
+
+def make_crawler(name: str, metrics: CrawlMetrics, args, robots: Optional[RobotsCache] = None):
+    crawler = CRAWLERS[name]()
+    crawler.metrics = metrics.roastery(name)
+    crawler.robots = robots
+    crawler.driver_max_pages = args.driver_max_pages
+    crawler.driver_max_rss = int(args.driver_max_rss * 1024 * 1024)
+    crawler.hedge_requests = args.hedge
+    # Attaches to the browser from --browser-service start when it is running; checked only when a page needs it
+    crawler.browser_service = BrowserService(BROWSER_DIR)
+    
+    if args.mock_server:
+        from benchmarks.mock_server import mock_base_url
+        crawler.base_url = mock_base_url(args.mock_server, name)
+    
+    return crawler
+
+
+def run_worker(args, data_dir: str):
+    # Imported here so the single-process crawl never loads the distributed machinery
+    from src.distributed import CrawlWorker
+    from src.utils.job_queue import open_queue
+    
+    queue = open_queue(args.queue)
+    metrics = CrawlMetrics()
+    robots = RobotsCache(os.path.join(data_dir, 'robots.json'))
+    worker = CrawlWorker(
+        queue,
+        lambda name: make_crawler(name, metrics, args, robots),
+        metrics,
+        host_interval=args.host_interval,
+        idle_timeout=args.worker_idle
+    )
+    
+    try:
+        worker.run()
+    finally:
+        queue.close()
+    
+    metrics_dir = os.path.join(args.metrics_dir or os.path.join(data_dir, 'metrics'),
+                               'worker_' + worker.worker_id.replace(':', '_'))
+    report_path, prom_path = metrics.write(metrics_dir)
+    logger.info(f"Worker metrics written to {report_path} and {prom_path}")
+
+
+def run_scheduler(args, selected_crawlers, data_dir: str):
+    from src.scheduler import HOUR, RecrawlScheduler
+    
+    # Mock runs keep their own history so the real one only learns from real shops
+    history_db = os.path.join(data_dir, 'history.db') if args.mock_server else args.history_db
+    history = PriceHistory(history_db)
+    metrics = CrawlMetrics()
+    robots = RobotsCache(os.path.join(data_dir, 'robots.json'))
+    scheduler = RecrawlScheduler(
+        history,
+        lambda name: make_crawler(name, metrics, args, robots),
+        selected_crawlers,
+        budget_per_day=args.budget,
+        min_interval=args.min_interval * HOUR,
+        max_interval=args.max_interval * HOUR
+    )
+    
+    try:
+        scheduler.run(once=args.once)
+    except KeyboardInterrupt:
+        logger.info("Scheduler stopped")
+    finally:
+        logger.info(f"Recorded {history.changes} price/availability changes in {history_db}")
+        history.close()
+        report_path, prom_path = metrics.write(args.metrics_dir or os.path.join(data_dir, 'metrics'))
+        logger.info(f"Run metrics written to {report_path} and {prom_path}")
+
+
+def parse_range(value: Optional[str]) -> Optional[Tuple[Optional[float], Optional[float]]]:
+    if not value:
+        return None
+    low, _, high = value.partition(':')
+    return (float(low) if low else None), (float(high) if high else None)
+
+
+def run_search(args):
+    # Imported here so the crawl never loads the search index
+    from src.search.catalog_index import CatalogIndex
+    
+    if args.similar:
+        run_similar(args)
+        return
+    
+    filters = {}
+    for item in args.filter:
+        name, sep, values = item.partition('=')
+        if not sep or not values:
+            raise ValueError(f"--filter expects FACET=VALUE[,VALUE], got {item!r}")
+        filters.setdefault(name.strip(), []).extend(value.strip() for value in values.split(','))
+    
+    index = CatalogIndex.from_csv(args.search)
+    result = index.search(filters, price=parse_range(args.price), altitude=parse_range(args.altitude))
+    
+    print(f"{result.total} of {len(index)} coffees match")
+    for coffee in result.coffees:
+        print(f"  {coffee.roastery_name}  {coffee.coffee_name}  {coffee.price or '-'}원  {coffee.url or ''}")
+    for name, counts in result.facets.items():
+        if not counts:
+            continue
+        top = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:10]
+        print(f"{name}: " + ', '.join(f"{value} ({count})" for value, count in top))
+
+
+def run_similar(args):
+    import csv
+    from src.models import Coffee
+    from src.search.similarity import SimilarityModel
+    from src.utils.urls import canonical_url
+    
+    with open(args.search, newline='', encoding='utf-8-sig') as f:
+        coffees = [Coffee.from_dict(row) for row in csv.DictReader(f)]
+    
+    url = canonical_url(args.similar)
+    target = next((coffee for coffee in coffees if coffee.url and canonical_url(coffee.url) == url), None)
+    if target is None:
+        raise ValueError(f"No coffee with URL {args.similar} in {args.search}")
+    
+    model = SimilarityModel()
+    model.add(coffees)
+    print(f"Most like {target.roastery_name} {target.coffee_name}:")
+    for coffee, score in model.similar_to(target, k=10, other_roasteries=args.other_roasteries):
+        print(f"  {score:.2f}  {coffee.roastery_name}  {coffee.coffee_name}  {coffee.url or ''}")
+
+
+def run_lot_matching(args):
+    # Imported here so the crawl never loads numpy and scipy
+    from src.search.lot_matching import LotMatcher, write_clusters
+    
+    matcher = LotMatcher.from_csv(args.match_lots, threshold=args.match_threshold)
+    clusters = matcher.clusters()
+    print(f"{len(clusters)} lots sold by more than one roastery among {len(matcher)} coffees")
+    
+    if args.lots_output:
+        write_clusters(clusters, args.lots_output)
+        print(f"Saved to {args.lots_output}")
+        return
+    for number, cluster in enumerate(clusters, 1):
+        print(f"{number}. score {cluster.score:.2f}, {', '.join(cluster.roasteries)}")
+        for coffee in cluster.coffees:
+            print(f"  {coffee.roastery_name}  {coffee.coffee_name}  {coffee.price or '-'}원  {coffee.url or ''}")
+
+
+def crawl_locally(args, selected_crawlers, journal: CrawlJournal, resumed: bool, sink: StreamingSink,
+                  history: Optional[PriceHistory], metrics: CrawlMetrics, seen: SeenURLs, robots: RobotsCache,
+                  retries: RetryQueue):
+    parse_pool = None
+    if args.parse_workers:
+        # Imported here so a run without --parse-workers never starts worker processes
+        from src.parse_pool import ParsePool
+        parse_pool = ParsePool(args.parse_workers)
+    
+    for crawler_name in selected_crawlers:
+        logger.info(f"\n{'='*50}")
+        logger.info(f"Starting crawl for {crawler_name}")
+        logger.info(f"{'='*50}")
+        
+        count = 0
+        progress = journal.progress(crawler_name)
+        roastery_metrics = metrics.roastery(crawler_name)
+        
+        try:
+            if resumed:
+                with roastery_metrics.timer('save'):
+                    for coffee in journal.iter_saved_coffees(crawler_name):
+                        sink.write(coffee)
+                        count += 1
+            
+            if not progress.finished:
+                crawler = make_crawler(crawler_name, metrics, args, robots)
+                crawler.parse_pool = parse_pool
+                crawler.seen = seen
+                crawler.retries = retries
+                
+                for coffee in crawler.iter_coffees(progress):
+                    with roastery_metrics.timer('save'):
+                        sink.write(coffee)
+                        if history:
+                            history.record(coffee)
+                    roastery_metrics.saved += 1
+                    count += 1
+                
+                if history and progress.finished and not crawler.robots_unavailable():
+                    # Everything discovered in this run is still listed, including pages replayed from the
+                    # checkpoint, pages that failed and wait in the retry queue, and pages --skip-seen skipped
+                    listed = (url_product_id(crawler.roastery_name, url) for url in progress.known)
+                    history.mark_unlisted(crawler.roastery_name, listed=listed)
+            
+            if count:
+                logger.info(f"Successfully crawled {count} coffees from {crawler_name}")
+            else:
+                logger.warning(f"No coffees found for {crawler_name}")
+        
+        except Exception as e:
+            logger.error(f"Failed to crawl {crawler_name}: {e}")
+    
+    if parse_pool:
+        parse_pool.close()
+    
+    if all(journal.progress(name).finished for name in selected_crawlers):
+        journal.complete()
+    else:
+        journal.close()
+        logger.warning("Some roasteries did not finish; rerun with --resume to continue them")
+
+
+def collect_from_queue(args, selected_crawlers, sink: StreamingSink,
+                       history: Optional[PriceHistory], metrics: CrawlMetrics):
+    from src.crawlers.spec import load_spec
+    from src.distributed import CrawlCoordinator
+    from src.utils.job_queue import open_queue
+    
+    queue = open_queue(args.queue)
+    if not args.resume:
+        queue.clear()
+    
+    coordinator = CrawlCoordinator(queue)
+    coordinator.submit(selected_crawlers)
+    logger.info(f"Waiting for workers on {args.queue} (start them with: python main.py --worker --queue {args.queue})")
+    
+    for crawler_name, coffee in coordinator.iter_results():
+        roastery_metrics = metrics.roastery(crawler_name)
+        with roastery_metrics.timer('save'):
+            sink.write(coffee)
+            if history:
+                history.record(coffee)
+        roastery_metrics.saved += 1
+    
+    if history:
+        for crawler_name in queue.discovered():
+            # Pages that failed, did not parse or were never fetched are still listed, as in crawl_locally
+            roastery_name = load_spec(crawler_name).roastery_name
+            listed = (url_product_id(roastery_name, url) for url in queue.detail_urls(crawler_name))
+            history.mark_unlisted(roastery_name, listed=listed)
+    
+    queue.close()
 
 
 def main():
@@ -64,49 +289,293 @@ def main():
         default='both',
         help='How to save the data'
     )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue the last interrupted crawl from its checkpoint'
+    )
+    parser.add_argument(
+        '--history-db',
+        default='data/history.db',
+        help='SQLite file that keeps price and availability changes across runs'
+    )
+    parser.add_argument(
+        '--no-history',
+        action='store_true',
+        help='Do not record price history for this run'
+    )
+    parser.add_argument(
+        '--changes-since',
+        metavar='YYYY-MM-DD',
+        help='Print price and availability changes since a date and exit'
+    )
+    parser.add_argument(
+        '--search',
+        metavar='CSV',
+        help='Search a saved coffee CSV with --filter, --price and --altitude, print matches and facet counts, and exit'
+    )
+    parser.add_argument(
+        '--filter',
+        action='append',
+        default=[],
+        metavar='FACET=VALUE[,VALUE]',
+        help='With --search: keep coffees with any of the values (facets: tasting_notes, origin, process, variety)'
+    )
+    parser.add_argument(
+        '--price',
+        metavar='MIN:MAX',
+        help='With --search: price range in won; either end may be left out'
+    )
+    parser.add_argument(
+        '--altitude',
+        metavar='MIN:MAX',
+        help='With --search: altitude range in metres that the farm\'s range must overlap'
+    )
+    parser.add_argument(
+        '--similar',
+        metavar='URL',
+        help='With --search: print the coffees most like the one at this product URL instead of filtering'
+    )
+    parser.add_argument(
+        '--other-roasteries',
+        action='store_true',
+        help='With --similar: only suggest coffees from other roasteries'
+    )
+    parser.add_argument(
+        '--match-lots',
+        metavar='CSV',
+        help='Group coffees in a saved CSV that different roasteries sell from the same green lot, print them, and exit'
+    )
+    parser.add_argument(
+        '--match-threshold',
+        type=float,
+        default=0.75,
+        help='With --match-lots: name similarity (0-1) at which two roasteries\' coffees count as the same lot'
+    )
+    parser.add_argument(
+        '--lots-output',
+        metavar='CSV',
+        help='With --match-lots: write one row per coffee with its lot number, score and roasteries instead of printing'
+    )
+    parser.add_argument(
+        '--mock-server',
+        metavar='HOST:PORT',
+        help='Crawl the local mock roastery server (python -m benchmarks.mock_server) instead of the real shops'
+    )
+    parser.add_argument(
+        '--metrics-dir',
+        help='Where to write the JSON run report and Prometheus textfile (default: <data dir>/metrics)'
+    )
+    parser.add_argument(
+        '--queue',
+        metavar='LOCATION',
+        help='Distribute the crawl through a job queue (SQLite file or redis://host:port/db); '
+             'this process collects results while --worker processes crawl'
+    )
+    parser.add_argument(
+        '--worker',
+        action='store_true',
+        help='Crawl jobs from --queue instead of collecting results'
+    )
+    parser.add_argument(
+        '--host-interval',
+        type=float,
+        default=1.0,
+        help='Minimum seconds between requests to one host, shared by all workers of a queue'
+    )
+    parser.add_argument(
+        '--worker-idle',
+        type=float,
+        default=30.0,
+        help='Seconds a worker waits for new jobs before exiting'
+    )
+    parser.add_argument(
+        '--schedule',
+        action='store_true',
+        help='Keep running and recrawl each listing and product as often as it has been seen to change'
+    )
+    parser.add_argument(
+        '--budget',
+        type=float,
+        default=2000,
+        help='Most requests the scheduler may make in any 24 hours'
+    )
+    parser.add_argument(
+        '--min-interval',
+        type=float,
+        default=1.0,
+        help='Hours between checks of the fastest-changing pages'
+    )
+    parser.add_argument(
+        '--max-interval',
+        type=float,
+        default=168.0,
+        help='Hours between checks of pages that never change'
+    )
+    parser.add_argument(
+        '--once',
+        action='store_true',
+        help='With --schedule: check whatever is due now and exit (for cron)'
+    )
+    parser.add_argument(
+        '--skip-seen',
+        type=float,
+        metavar='HOURS',
+        help='Skip detail pages that an earlier run fetched within this many hours'
+    )
+    parser.add_argument(
+        '--parse-workers',
+        type=int,
+        default=0,
+        help='Parse detail pages in this many worker processes while fetching continues (default: parse inline)'
+    )
+    parser.add_argument(
+        '--failures',
+        action='store_true',
+        help='List detail pages that kept failing after their deferred retries and exit'
+    )
+    parser.add_argument(
+        '--hedge',
+        action='store_true',
+        help='Send a duplicate of a static request that runs past its host\'s p95 latency and use the first answer'
+    )
+    parser.add_argument(
+        '--driver-max-pages',
+        type=int,
+        default=300,
+        help='Restart Chrome after this many page loads (0: never)'
+    )
+    parser.add_argument(
+        '--driver-max-rss',
+        type=float,
+        default=1536,
+        metavar='MB',
+        help='Restart Chrome once it and its child processes use this much memory (0: no limit)'
+    )
+    parser.add_argument(
+        '--browser-service',
+        choices=['start', 'stop', 'status'],
+        help='Manage a headless Chrome that stays up between runs so crawls attach to it instead of launching one'
+    )
     
     args = parser.parse_args()
     
+    if args.changes_since:
+        history = PriceHistory(args.history_db)
+        for change in history.changed_since(datetime.fromisoformat(args.changes_since)):
+            print(f"{change['changed_at']}  {change['roastery']}  {change['coffee_name']}  "
+                  f"price={change['price']}  available={change['available']}")
+        history.close()
+        return
+    
+    if args.search:
+        try:
+            run_search(args)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+    
+    if args.match_lots:
+        run_lot_matching(args)
+        return
+    
+    if args.browser_service:
+        service = BrowserService(BROWSER_DIR)
+        if args.browser_service == 'start':
+            try:
+                print(f"Browser service running at {service.start()}")
+            except RuntimeError as e:
+                logger.error(str(e))
+                sys.exit(1)
+        elif args.browser_service == 'stop':
+            print('Browser service stopped' if service.stop() else 'Browser service was not running')
+        else:
+            address = service.address()
+            print(f"Browser service running at {address}" if address else 'Browser service is not running')
+        return
+    
     if 'all' in args.roasteries:
         selected_crawlers = list(CRAWLERS.keys())
     else:
         selected_crawlers = args.roasteries
     
-    all_coffees = []
+    data_dir = 'data'
     
-    for crawler_name in selected_crawlers:
-        logger.info(f"\n{'='*50}")
-        logger.info(f"Starting crawl for {crawler_name}")
-        logger.info(f"{'='*50}")
+    if args.mock_server:
+        # Keep test runs out of the real output, checkpoints and price history
+        data_dir = os.path.join('data', 'mock')
+        args.no_history = True
+        logger.info(f"Crawling mock server at {args.mock_server}; output goes to {data_dir}")
+    
+    if args.failures:
+        retries = RetryQueue(os.path.join(data_dir, 'retry.db'))
+        for failure in retries.failures():
+            failed_at = datetime.fromtimestamp(failure['last_failed_at']).isoformat(timespec='seconds')
+            print(f"{failed_at}  {failure['roastery']}  {failure['kind']}  {failure['url']}  "
+                  f"attempts={failure['attempts']}  {failure['error'] or ''}")
+        retries.close()
+        return
+    
+    if args.worker:
+        if not args.queue:
+            parser.error('--worker needs --queue')
+        run_worker(args, data_dir)
+        return
+    
+    if args.schedule:
+        run_scheduler(args, selected_crawlers, data_dir)
+        return
+    
+    if not args.queue:
+        # A distributed crawl keeps its progress in the queue itself
+        journal = CrawlJournal(os.path.join(data_dir, 'checkpoints'))
+        resumed = args.resume and journal.resume()
         
+        if resumed:
+            selected_crawlers = journal.options['roasteries']
+            args.save_mode = journal.options['save_mode']
+        else:
+            if args.resume:
+                logger.warning("No interrupted crawl to resume; starting a new one")
+            journal.start({'roasteries': selected_crawlers, 'save_mode': args.save_mode})
+    
+    sink = StreamingSink(DataSaver(data_dir), save_mode=args.save_mode)
+    history = None if args.no_history else PriceHistory(args.history_db)
+    metrics = CrawlMetrics()
+    
+    if args.queue:
+        collect_from_queue(args, selected_crawlers, sink, history, metrics)
+    else:
+        seen = SeenURLs(os.path.join(data_dir, 'seen_urls.db'),
+                        window=args.skip_seen * 3600 if args.skip_seen else None)
+        retries = RetryQueue(os.path.join(data_dir, 'retry.db'))
         try:
-            crawler_class = CRAWLERS[crawler_name]
-            crawler = crawler_class()
-            coffees = crawler.crawl()
-            
-            if coffees:
-                all_coffees.extend(coffees)
-                logger.info(f"Successfully crawled {len(coffees)} coffees from {crawler_name}")
-            else:
-                logger.warning(f"No coffees found for {crawler_name}")
-                
-        except Exception as e:
-            logger.error(f"Failed to crawl {crawler_name}: {e}")
+            crawl_locally(args, selected_crawlers, journal, resumed, sink, history, metrics, seen,
+                          RobotsCache(os.path.join(data_dir, 'robots.json')), retries)
+        finally:
+            seen.close()
+            retries.close()
     
-    if all_coffees:
+    with metrics.finalizing():
+        saved = sink.close()
+    
+    if history:
+        logger.info(f"Recorded {history.changes} price/availability changes in {args.history_db}")
+        history.close()
+    
+    report_path, prom_path = metrics.write(args.metrics_dir or os.path.join(data_dir, 'metrics'))
+    logger.info(f"Run metrics written to {report_path} and {prom_path}")
+    
+    if sink.count:
         logger.info(f"\n{'='*50}")
-        logger.info(f"Total coffees crawled: {len(all_coffees)}")
+        logger.info(f"Total coffees crawled: {sink.count}")
         logger.info(f"{'='*50}")
         
-        saver = DataSaver()
-        
-        if args.save_mode in ['combined', 'both']:
-            files = saver.save_combined(all_coffees)
-            logger.info(f"Saved combined data: {files}")
+        if saved['combined']:
+            logger.info(f"Saved combined data: {saved['combined']}")
         
-        if args.save_mode in ['separate', 'both']:
-            files = saver.save_by_roastery(all_coffees)
-            logger.info(f"Saved separate files: {files}")
+        if saved['separate']:
+            logger.info(f"Saved separate files: {saved['separate']}")
     else:
         logger.warning("No coffee data was collected")
 
@@ -0,0 +1,36 @@
+import os
+from functools import partial
+from importlib import import_module
+from typing import Callable, Dict, Iterator, List, Mapping
+
+
+SPEC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'specs')
+
+
+def spec_names() -> List[str]:
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(SPEC_DIR) if name.endswith('.json'))
+
+
+class CrawlerRegistry(Mapping):
+    def __init__(self, names: List[str]):
+        self.names = names
+        self._loaded: Dict[str, Callable] = {}
+    
+    def __getitem__(self, name: str) -> Callable:
+        if name not in self.names:
+            raise KeyError(name)
+        if name not in self._loaded:
+            # Imported on first use so listing roasteries never pulls in requests/bs4
+            spec = import_module('.spec', __name__)
+            spec_crawler = import_module('.spec_crawler', __name__)
+            self._loaded[name] = partial(spec_crawler.SpecCrawler, spec.load_spec(name))
+        return self._loaded[name]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+    
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+CRAWLERS = CrawlerRegistry(spec_names())
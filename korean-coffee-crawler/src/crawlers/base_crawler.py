@@ -1,96 +1,714 @@
+import codecs
+import json
 import logging
+import re
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
 import requests
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 import time
 
 from ..models import Coffee
+from ..utils.browser import USER_AGENT, BrowserService, driver_service, process_tree_rss
+from ..utils.checkpoint import RoasteryProgress
+from ..utils.discovery import SitemapDiscovery, is_platform_product
+from ..utils.job_queue import HostPacer, LocalHostSlots
+from ..utils.latency import MAX_TIMEOUT, HostLatency
+from ..utils.metrics import RoasteryMetrics
+from ..utils.retry_queue import RetryQueue, classify_error
+from ..utils.robots import RobotsCache, RobotsRules
+from ..utils.structured_data import extract_structured
+from ..utils.urls import canonical_url
+
+
+FETCH_MODES = ('static', 'browser', 'hybrid')
+
+STREAM_CHUNK = 16384
+CHARSET_SNIFF_BYTES = 1024
+# Browser memory is sampled every this many page loads; walking the process tree costs a few milliseconds
+RSS_CHECK_EVERY = 10
+# Threads for hedged requests; a losing copy keeps its thread until it finishes or times out
+HEDGE_THREADS = 4
+META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class PartialHTML(str):
+    # Detail HTML cut off at a stream_until marker; refetched in full if the required fields are not in it
+    pass
+
+
+# A fetched detail page: HTML, or the object an in-browser extraction script returned
+Page = Union[str, Dict[str, Any]]
+
+
+def release_response(future: Future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
 
 
 class BaseCrawler(ABC):
-    def __init__(self, roastery_name: str, base_url: str, use_selenium: bool = False):
+    def __init__(self, roastery_name: str, base_url: str, use_selenium: bool = False,
+                 fetch_mode: Optional[str] = None):
         self.roastery_name = roastery_name
         self.base_url = base_url
-        self.use_selenium = use_selenium
+        # hybrid: plain HTTP first, the browser only for pages whose required fields did not parse
+        self.fetch_mode = fetch_mode or ('browser' if use_selenium else 'static')
+        self.required_fields: List[str] = ['coffee_name']
+        self._browser_listing = False
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._driver = None
+        # Long-running browser to attach to instead of launching Chrome; see main.py --browser-service
+        self.browser_service: Optional[BrowserService] = None
+        self._attached = False
+        # Chrome is restarted after this many page loads, or once it holds more than this many bytes (0 = no limit)
+        self.driver_max_pages = 300
+        self.driver_max_rss = 1536 * 1024 * 1024
+        self._driver_pages = 0
+        self.metrics = RoasteryMetrics(roastery_name)
+        # Set by distributed workers to share per-host request spacing across processes
+        self.pacer = None
+        # Spaces this crawler's own requests when no shared pacer is set
+        self.local_pacer = HostPacer(LocalHostSlots(), interval=0)
+        # Sitemap and feed discovery; None means look them up in robots.txt, then /sitemap.xml
+        self.use_sitemaps = True
+        # Sitemaps list every product in the shop, merch included; they replace the coffee listings only when
+        # is_product_url can tell coffee apart, and otherwise just date the pages the listings found
+        self.sitemap_scope = False
+        self.sitemaps: Optional[List[str]] = None
+        self.feeds: List[str] = []
+        self.lastmod: Dict[str, Optional[datetime]] = {}
+        # Read JSON-LD, og:/product: meta and platform script variables before the DOM selectors
+        self.use_structured_data = True
+        # (script, argument) run in the browser for detail pages instead of transferring page_source
+        self.browser_extraction: Optional[Tuple[str, Any]] = None
+        # Markers where detail content the parser never reads begins; static detail fetches stop there
+        self.stream_until: List[str] = []
+        # Process pool for the parse stage; parse workers rebuild this crawler from its registry name
+        self.parse_pool = None
+        self.crawler_name: Optional[str] = None
+        # SeenURLs shared across crawlers (and runs, when persisted); discovery skips URLs it already handed out
+        self.seen = None
+        # robots.txt rules and Crawl-delay; a RobotsCache shared by the run, else one per crawler on first use
+        self.respect_robots = True
+        self.robots: Optional[RobotsCache] = None
+        self.request_interval = 1.0
+        # Per-host latency window behind the adaptive timeouts; hedge_requests also duplicates slow static fetches
+        self.latency = HostLatency()
+        self.hedge_requests = False
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        # Failed detail pages go here and are retried after the main pass; fetch_failures holds why a fetch failed
+        self.retries: Optional[RetryQueue] = None
+        self.fetch_failures: Dict[str, Tuple[str, str]] = {}
+        
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT
+        })
+    
+    @property
+    def use_selenium(self) -> bool:
+        return self.fetch_mode == 'browser'
+    
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = self._setup_driver()
+        return self._driver
+    
+    def browser_get(self, url: str):
+        if self._driver is not None and self.driver_worn_out():
+            self.close_driver('recycled')
+            self.metrics.driver_restarts += 1
         
-        if use_selenium:
-            self.driver = self._setup_driver()
+        driver = self.driver
+        self._driver_pages += 1
+        try:
+            driver.get(url)
+        except Exception:
+            # A crashed or hung Chrome fails every later page too; the next load starts a fresh one
+            self.close_driver('failed')
+            self.metrics.driver_restarts += 1
+            raise
+    
+    def driver_rss(self) -> Optional[int]:
+        if self._driver is None:
+            return None
+        if self._attached:
+            # The shared service browser, including other crawlers' tabs
+            state = self.browser_service.read_state()
+            pid = state['pid'] if state else None
         else:
-            self.session = requests.Session()
-            self.session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            })
+            process = getattr(self._driver.service, 'process', None)
+            pid = process.pid if process else None
+        
+        rss = process_tree_rss(pid) if pid else None
+        if rss:
+            self.metrics.browser_peak_rss = max(self.metrics.browser_peak_rss, rss)
+        return rss
+    
+    def driver_worn_out(self) -> bool:
+        if self.driver_max_pages and self._driver_pages >= self.driver_max_pages:
+            return True
+        # An attached tab shares the service browser's memory with other crawlers, and closing the tab would not
+        # free it, so attached tabs are recycled by page count only
+        if self.driver_max_rss and not self._attached and self._driver_pages % RSS_CHECK_EVERY == 0:
+            rss = self.driver_rss()
+            return rss is not None and rss >= self.driver_max_rss
+        return False
     
     def _setup_driver(self):
+        # Imported here so requests-only crawlers never load selenium
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
         options = Options()
+        address = self.browser_service.address() if self.browser_service else None
+        if address:
+            options.debugger_address = address
+            driver = webdriver.Chrome(service=driver_service(), options=options)
+            # A tab of our own, so crawlers sharing the browser do not navigate each other's pages
+            driver.switch_to.new_window('tab')
+            self._attached = True
+            self.logger.info(f"Attached to browser service at {address}")
+            return driver
+        
         options.add_argument('--headless')
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-gpu')
         options.add_argument('--window-size=1920,1080')
-        options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
+        options.add_argument(f'user-agent={USER_AGENT}')
+        return webdriver.Chrome(service=driver_service(), options=options)
+    
+    def robots_rules(self, url: str) -> Optional[RobotsRules]:
+        if not self.respect_robots:
+            return None
+        if self.robots is None:
+            self.robots = RobotsCache(session=self.session)
+        return self.robots.for_url(url, self.metrics, self.session)
+    
+    def allowed_by_robots(self, url: str) -> bool:
+        rules = self.robots_rules(url)
+        return rules is None or rules.allowed(url)
+    
+    def robots_unavailable(self) -> bool:
+        # Discovery found nothing because robots.txt failed, not because the shop lists nothing
+        rules = self.robots_rules(self.base_url)
+        return rules is not None and rules.unavailable
+    
+    def request_delay(self, url: str) -> float:
+        rules = self.robots_rules(url)
+        return max(self.request_interval, rules.crawl_delay or 0) if rules else self.request_interval
+    
+    def hedge_after(self, url: str, host: str) -> Optional[float]:
+        if not self.hedge_requests:
+            return None
+        rules = self.robots_rules(url)
+        if rules is not None and rules.crawl_delay:
+            # The site asked for spacing between requests, which a duplicate would break
+            return None
+        return self.latency.hedge_after(host)
+    
+    def http_get(self, url: str, stream: bool = False, timeout: Optional[float] = None) -> requests.Response:
+        host = urlparse(url).netloc.lower()
+        timeout = timeout or self.latency.timeout(host)
+        # Streamed bodies are consumed by the caller, so only whole responses are hedged
+        delay = None if stream else self.hedge_after(url, host)
+        
+        start = time.perf_counter()
+        try:
+            if delay is None:
+                response = self.session.get(url, timeout=timeout, stream=stream)
+            else:
+                response = self.hedged_get(url, host, timeout, delay)
+        except requests.Timeout:
+            # Counted at the limit, so a host that slows down is given longer timeouts
+            self.latency.observe(host, timeout)
+            raise
+        self.latency.observe(host, time.perf_counter() - start)
+        return response
+    
+    def hedged_get(self, url: str, host: str, timeout: float, delay: float) -> requests.Response:
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_THREADS, thread_name_prefix='hedge')
+        
+        futures = [self._hedge_executor.submit(self.session.get, url, timeout=timeout)]
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            # Slower than the host's p95: send a duplicate and take whichever answers first
+            self.latency.record_hedge(host)
+            self.metrics.hedged_requests += 1
+            futures.append(self._hedge_executor.submit(self.session.get, url, timeout=timeout))
+        
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if future.exception() is None), None)
+            if winner is None:
+                continue
+            for future in futures:
+                if future is not winner:
+                    # The other copy finishes in the background and gives its connection back to the pool
+                    future.add_done_callback(release_response)
+            if len(futures) > 1 and winner is futures[1]:
+                self.metrics.hedge_wins += 1
+            return winner.result()
         
-        service = Service(ChromeDriverManager().install())
-        return webdriver.Chrome(service=service, options=options)
+        raise futures[0].exception()
+    
+    def before_request(self, url: str) -> bool:
+        rules = self.robots_rules(url)
+        if rules is not None and not rules.allowed(url):
+            self.metrics.robots_blocked += 1
+            if rules.unavailable:
+                # Retried like a server error once robots.txt can be fetched again
+                self.logger.warning(f"Skipping {url}: robots.txt could not be fetched")
+                self.record_failure(url, 'server', 'robots.txt unavailable')
+            else:
+                self.logger.warning(f"Skipping {url}: disallowed by robots.txt")
+                self.record_failure(url, 'robots', 'disallowed by robots.txt')
+            return False
+        
+        self.pace(url)
+        return True
+    
+    def pace(self, url: str):
+        # Every request waits for its host's next slot: listings, sitemaps, detail pages and browser loads alike
+        with self.metrics.timer('wait'):
+            if self.pacer is not None:
+                rules = self.robots_rules(url)
+                # Only the site's Crawl-delay; the pacer applies --host-interval itself
+                self.pacer.wait(url, rules.crawl_delay if rules else None)
+            else:
+                self.local_pacer.wait(url, self.request_delay(url))
+    
+    def record_failure(self, url: str, kind: str, error: str):
+        # Only kept while a retry queue will pick it up in iter_parsed
+        if self.retries is not None:
+            self.fetch_failures[url] = (kind, error)
     
-    def get_page(self, url: str) -> Optional[BeautifulSoup]:
+    def fetch_html(self, url: str, browser: Optional[bool] = None, timeout: Optional[float] = None) -> Optional[str]:
+        if not self.before_request(url):
+            return None
+        
+        if browser is None:
+            browser = self.fetch_mode == 'browser'
+        
+        start = time.perf_counter()
         try:
-            if self.use_selenium:
-                self.driver.get(url)
+            if browser:
+                self.browser_get(url)
                 time.sleep(2)
                 html = self.driver.page_source
-            else:
-                response = self.session.get(url, timeout=10)
+                self.metrics.record_fetch(time.perf_counter() - start, len(html.encode('utf-8')))
+                return html
+            
+            response = self.http_get(url, timeout=timeout)
+            response.raise_for_status()
+            self.metrics.record_fetch(time.perf_counter() - start, len(response.content))
+            return response.text
+        except Exception as e:
+            self.metrics.record_fetch(time.perf_counter() - start, None)
+            self.logger.error(f"Error fetching {url}: {e}")
+            self.record_failure(url, classify_error(e), str(e))
+            return None
+    
+    def fetch_rendered(self, url: str) -> Optional[Dict[str, Any]]:
+        if not self.before_request(url):
+            return None
+        
+        script, argument = self.browser_extraction
+        start = time.perf_counter()
+        try:
+            self.browser_get(url)
+            time.sleep(2)
+            page = self.driver.execute_script(script, argument)
+            if not isinstance(page, dict):
+                raise ValueError(f"extraction script returned {type(page).__name__}")
+            self.metrics.record_fetch(time.perf_counter() - start, len(json.dumps(page, ensure_ascii=False).encode('utf-8')))
+            return page
+        except Exception as e:
+            self.metrics.record_fetch(time.perf_counter() - start, None)
+            self.logger.error(f"Error extracting {url} in the browser: {e}")
+            self.record_failure(url, classify_error(e), str(e))
+            return None
+    
+    def fetch_streamed(self, url: str) -> Optional[str]:
+        if not self.before_request(url):
+            return None
+        
+        start = time.perf_counter()
+        received = 0
+        try:
+            with self.http_get(url, stream=True) as response:
                 response.raise_for_status()
-                html = response.text
+                chunks = response.iter_content(STREAM_CHUNK)
+                first = next(chunks, b'')
+                # <meta charset> must sit in the first 1024 bytes, which a short first chunk may not hold
+                while 0 < len(first) < CHARSET_SNIFF_BYTES:
+                    more = next(chunks, b'')
+                    if not more:
+                        break
+                    first += more
+                received = len(first)
+                
+                # requests falls back to ISO-8859-1 for text/* without a charset; the page's meta tag knows better
+                encoding = response.encoding if 'charset' in response.headers.get('content-type', '').lower() else None
+                if encoding is None:
+                    declared = META_CHARSET.search(first)
+                    encoding = declared.group(1).decode('ascii') if declared else 'utf-8'
+                try:
+                    decoder = codecs.getincrementaldecoder(encoding)('replace')
+                except LookupError:
+                    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+                
+                overlap = max(len(marker) for marker in self.stream_until)
+                parts: List[str] = []
+                length = 0
+                tail = ''
+                chunk = first
+                while chunk:
+                    text = decoder.decode(chunk)
+                    # The end of the previous chunk is searched again to catch a marker split between chunks
+                    window = tail + text
+                    cut = min((i for i in (window.find(marker) for marker in self.stream_until) if i >= 0), default=-1)
+                    if cut >= 0:
+                        html = (''.join(parts) + text)[:length - len(tail) + cut]
+                        self.metrics.streamed_pages += 1
+                        self.metrics.record_fetch(time.perf_counter() - start, received)
+                        return PartialHTML(html)
+                    
+                    parts.append(text)
+                    length += len(text)
+                    tail = window[-overlap:]
+                    chunk = next(chunks, b'')
+                    received += len(chunk)
+                
+                parts.append(decoder.decode(b'', final=True))
             
-            return BeautifulSoup(html, 'lxml')
+            self.metrics.record_fetch(time.perf_counter() - start, received)
+            return ''.join(parts)
         except Exception as e:
+            self.metrics.record_fetch(time.perf_counter() - start, None)
             self.logger.error(f"Error fetching {url}: {e}")
+            self.record_failure(url, classify_error(e), str(e))
             return None
     
+    def fetch_page(self, url: str, browser: Optional[bool] = None) -> Optional[Page]:
+        if browser is None:
+            browser = self.fetch_mode == 'browser'
+        if browser and self.browser_extraction:
+            return self.fetch_rendered(url)
+        if not browser and self.stream_until:
+            return self.fetch_streamed(url)
+        return self.fetch_html(url, browser=browser)
+    
+    def make_soup(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, 'lxml')
+    
+    def get_page(self, url: str, browser: Optional[bool] = None) -> Optional[BeautifulSoup]:
+        html = self.fetch_html(url) if browser is None else self.fetch_html(url, browser=browser)
+        if html is None:
+            return None
+        with self.metrics.timer('parse'):
+            return self.make_soup(html)
+    
     @abstractmethod
-    def get_coffee_list_urls(self) -> List[str]:
+    def iter_coffee_list_urls(self) -> Iterator[str]:
         pass
     
+    def get_coffee_list_urls(self) -> List[str]:
+        return list(self.iter_coffee_list_urls())
+    
+    def is_product_url(self, url: str) -> bool:
+        return is_platform_product(url)
+    
+    def iter_discovered_urls(self, on_skipped: Optional[Callable[[str], None]] = None) -> Iterator[str]:
+        emitted = set()
+        for url in self.iter_candidate_urls():
+            url = canonical_url(url)
+            if url in emitted:
+                self.metrics.duplicate_urls += 1
+                continue
+            emitted.add(url)
+            
+            if not self.allowed_by_robots(url):
+                self.metrics.robots_blocked += 1
+                continue
+            if self.seen is not None and not self.seen.claim(url):
+                self.metrics.seen_skipped += 1
+                if on_skipped is not None:
+                    on_skipped(url)
+                continue
+            yield url
+    
+    def iter_candidate_urls(self) -> Iterator[str]:
+        if self.use_sitemaps:
+            sitemaps = self.sitemaps
+            rules = self.robots_rules(self.base_url)
+            if sitemaps is None and rules is not None:
+                # The cached robots.txt already lists the sitemaps, so discovery does not fetch it again
+                sitemaps = rules.sitemaps or ['/sitemap.xml']
+            
+            discovery = SitemapDiscovery(
+                self.base_url,
+                session=getattr(self, 'session', None),
+                metrics=self.metrics,
+                sitemaps=sitemaps,
+                feeds=self.feeds,
+                is_product=self.is_product_url,
+                pace=self.pace
+            )
+            found = discovery.discover()
+            if found and self.sitemap_scope:
+                self.logger.info(f"Found {len(found)} product URLs in sitemaps/feeds with {discovery.fetches} requests")
+                self.lastmod.update(found)
+                yield from found
+                return
+            if found:
+                self.lastmod.update(found)
+            else:
+                self.logger.info("No usable sitemap or feed")
+        
+        yield from self.iter_coffee_list_urls()
+    
     @abstractmethod
-    def parse_coffee_detail(self, url: str) -> Optional[Coffee]:
+    def parse_coffee_page(self, soup: BeautifulSoup, url: str,
+                          known: Optional[Dict[str, Any]] = None) -> Optional[Coffee]:
+        # known: fields already read from structured data; selectors only need to fill the rest
         pass
     
-    def crawl(self) -> List[Coffee]:
+    def parse_html(self, html: str, url: str) -> Optional[Coffee]:
+        known = extract_structured(html) if self.use_structured_data else {}
+        if known:
+            self.metrics.structured_pages += 1
+        return self.parse_coffee_page(self.make_soup(html), url, known)
+    
+    def parse_rendered(self, page: Dict[str, Any], url: str) -> Optional[Coffee]:
+        # Only reached when browser_extraction is set on a crawler that cannot read its result
+        self.logger.error(f"{self.__class__.__name__} sets browser_extraction but does not parse its result; "
+                          f"skipping {url}")
+        return None
+    
+    def parse_page(self, page: Page, url: str) -> Optional[Coffee]:
+        if isinstance(page, str):
+            return self.parse_html(page, url)
+        return self.parse_rendered(page, url)
+    
+    def parse_coffee_detail(self, url: str) -> Optional[Coffee]:
+        html = self.fetch_html(url)
+        if html is None:
+            return None
+        return self.parse_fetched(url, html)
+    
+    def is_complete(self, coffee: Optional[Coffee]) -> bool:
+        return coffee is not None and all(getattr(coffee, name, None) for name in self.required_fields)
+    
+    def parse_fetched(self, url: str, page: Page) -> Optional[Coffee]:
+        with self.metrics.timer('parse'):
+            coffee = self.parse_page(page, url)
+        return self.check_parsed(url, page, coffee)
+    
+    def check_parsed(self, url: str, page: Page, coffee: Optional[Coffee]) -> Optional[Coffee]:
+        # Refetches that a parse result calls for; runs in the fetching process even when a pool parsed the page
+        if isinstance(page, PartialHTML) and not self.is_complete(coffee):
+            self.metrics.stream_refetches += 1
+            self.logger.info(f"Required fields missing before the stream marker; fetching all of {url}")
+            html = self.fetch_html(url, browser=False)
+            if html is not None:
+                with self.metrics.timer('parse'):
+                    coffee = self.parse_html(html, url)
+        
+        if self.fetch_mode != 'hybrid':
+            return coffee
+        if self.is_complete(coffee):
+            self.metrics.static_pages += 1
+            return coffee
+        
+        self.metrics.browser_pages += 1
+        self.logger.info(f"Required fields missing from static HTML; loading {url} in the browser")
+        page = self.fetch_page(url, browser=True)
+        if page is None:
+            return coffee
+        
+        with self.metrics.timer('parse'):
+            rendered = self.parse_page(page, url)
+        return rendered if rendered is not None else coffee
+    
+    def get_listing_page(self, url: str) -> Optional[BeautifulSoup]:
+        return self.get_page(url, browser=True) if self._browser_listing else self.get_page(url)
+    
+    def listing_needs_browser(self, url: str, found_links: bool) -> bool:
+        # A hybrid crawler whose first listing page shows no products statically renders listings in the browser
+        if self.fetch_mode != 'hybrid' or found_links or self._browser_listing:
+            return False
+        self._browser_listing = True
+        self.metrics.browser_listings += 1
+        self.logger.info(f"No product links in static listing {url}; using the browser for listings")
+        return True
+    
+    def iter_pages(self, urls: Iterable[str]) -> Iterator[Tuple[str, Optional[Page]]]:
+        for i, url in enumerate(urls, 1):
+            self.logger.info(f"Crawling #{i}: {url}")
+            page = self.fetch_page(url)
+            if page is not None and self.seen is not None:
+                self.seen.mark_fetched(url)
+            yield url, page
+    
+    def iter_parsed_inline(self, pages: Iterable[Tuple[str, Optional[Page]]]
+                           ) -> Iterator[Tuple[str, Optional[Page], Optional[Coffee]]]:
+        for url, page in pages:
+            coffee = None
+            if page:
+                with self.metrics.timer('parse'):
+                    coffee = self.parse_page(page, url)
+            yield url, page, coffee
+    
+    def iter_parsed(self, pages: Iterable[Tuple[str, Optional[Page]]]) -> Iterator[Tuple[str, Optional[Coffee]]]:
+        if self.parse_pool is not None and self.crawler_name:
+            parsed = self.parse_pool.imap(self, pages)
+        else:
+            parsed = self.iter_parsed_inline(pages)
+        
+        for url, page, coffee in parsed:
+            if page:
+                coffee = self.check_parsed(url, page, coffee)
+            failure = self.fetch_failures.pop(url, None)
+            
+            if coffee:
+                self.metrics.parsed += 1
+                self.logger.info(f"Successfully parsed: {coffee.coffee_name}")
+                if self.retries is not None:
+                    self.retries.resolve(self.roastery_name, url)
+            else:
+                self.metrics.failed += 1
+                if page is None:
+                    self.logger.warning(f"Failed to fetch {url}")
+                else:
+                    self.logger.warning(f"Failed to parse coffee from {url}")
+                # Retried after the main pass so a transient failure does not hold up the rest of the catalogue
+                if self.retries is not None:
+                    kind, error = failure or (('parse', 'no coffee parsed') if page else ('error', 'fetch failed'))
+                    if self.retries.defer(self.roastery_name, url, kind, error):
+                        self.metrics.deferred += 1
+            
+            yield url, coffee
+    
+    def fetch_retry(self, url: str, kind: str) -> Optional[Page]:
+        # Each kind of failure is retried with the settings most likely to get past it
+        if kind == 'parse':
+            return self.fetch_page(url, browser=True)
+        if kind == 'browser':
+            self.close_driver('reset for retry')
+            return self.fetch_page(url)
+        if kind == 'timeout' and self.fetch_mode != 'browser':
+            return self.fetch_html(url, browser=False, timeout=MAX_TIMEOUT)
+        return self.fetch_page(url)
+    
+    def iter_retried(self) -> Iterator[Tuple[str, Optional[Coffee]]]:
+        # Failures from this run's main pass and from earlier runs that have attempts left
+        entries = self.retries.due(self.roastery_name)
+        if entries:
+            self.logger.info(f"Retrying {len(entries)} deferred detail pages")
+        
+        for entry in entries:
+            url, kind = entry['url'], entry['kind']
+            self.logger.info(f"Retrying {url} after a {kind} failure (attempt {entry['attempts'] + 1})")
+            page = self.fetch_retry(url, kind)
+            coffee = self.parse_fetched(url, page) if page is not None else None
+            failure = self.fetch_failures.pop(url, None)
+            
+            if coffee:
+                self.metrics.parsed += 1
+                self.metrics.recovered += 1
+                self.retries.resolve(self.roastery_name, url)
+                if self.seen is not None:
+                    self.seen.mark_fetched(url)
+            else:
+                kind, error = failure or (('parse', 'no coffee parsed') if page is not None else ('error', 'fetch failed'))
+                self.retries.retried(self.roastery_name, url, kind, error)
+            yield url, coffee
+    
+    def iter_checkpointed_urls(self, progress: RoasteryProgress) -> Iterator[str]:
+        pending = progress.pending_urls()
+        if pending:
+            self.logger.info(f"Resuming {len(pending)} URLs from checkpoint")
+        yield from pending
+        
+        if progress.discovery_complete:
+            return
+        
+        for url in self.iter_discovered_urls(on_skipped=progress.add_skipped):
+            if progress.add_url(url):
+                yield url
+        
+        progress.mark_discovered()
+    
+    def iter_coffees(self, progress: Optional[RoasteryProgress] = None) -> Iterator[Coffee]:
         self.logger.info(f"Starting crawl for {self.roastery_name}")
-        coffee_list = []
+        count = 0
         
         try:
-            urls = self.get_coffee_list_urls()
-            self.logger.info(f"Found {len(urls)} coffee URLs")
+            if progress is None:
+                urls = self.iter_discovered_urls()
+            else:
+                urls = self.iter_checkpointed_urls(progress)
             
-            for i, url in enumerate(urls, 1):
-                self.logger.info(f"Crawling {i}/{len(urls)}: {url}")
-                coffee = self.parse_coffee_detail(url)
-                
+            urls = self.metrics.timed(urls, 'discovery')
+            for url, coffee in self.iter_parsed(self.iter_pages(urls)):
+                if progress is not None:
+                    progress.mark_done(url, coffee)
                 if coffee:
-                    coffee_list.append(coffee)
-                    self.logger.info(f"Successfully parsed: {coffee.coffee_name}")
-                else:
-                    self.logger.warning(f"Failed to parse coffee from {url}")
-                
-                time.sleep(1)
+                    count += 1
+                    yield coffee
             
+            if self.retries is not None:
+                for url, coffee in self.iter_retried():
+                    if coffee:
+                        if progress is not None:
+                            progress.mark_done(url, coffee)
+                        count += 1
+                        yield coffee
+            
+            if progress is not None:
+                progress.finish()
         except Exception as e:
             self.logger.error(f"Error during crawl: {e}")
         finally:
-            if self.use_selenium:
-                self.driver.quit()
-        
-        self.logger.info(f"Crawl complete. Found {len(coffee_list)} coffees")
-        return coffee_list
+            self.close()
+            self.logger.info(f"Crawl complete. Found {count} coffees")
+            if self.fetch_mode == 'hybrid':
+                checked = self.metrics.static_pages + self.metrics.browser_pages
+                self.logger.info(f"Browser needed for {self.metrics.browser_pages} of {checked} detail pages")
+    
+    def crawl(self) -> List[Coffee]:
+        return list(self.iter_coffees())
+    
+    def close(self):
+        self.close_driver('closed')
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
+    
+    def close_driver(self, reason: str):
+        if self._driver is not None:
+            rss = self.driver_rss()
+            usage = f", {rss / 1048576:.0f} MB resident" if rss is not None else ''
+            self.logger.info(f"Browser {reason} after {self._driver_pages} pages{usage}")
+            self._driver_pages = 0
+            
+            if self._attached:
+                # quit() only ends the driver session; the service's browser keeps running for the next crawl
+                try:
+                    self._driver.close()
+                except Exception as e:
+                    self.logger.debug(f"Could not close browser tab: {e}")
+                self._attached = False
+            self._driver.quit()
+            self._driver = None
     
     def clean_text(self, text: Optional[str]) -> Optional[str]:
         if not text:
@@ -105,4 +723,4 @@ class BaseCrawler(ABC):
                 return int(numbers[0].replace(',', ''))
             except:
                 return None
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,337 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Set, Tuple
+
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+
+from . import SPEC_DIR
+from ..models import Coffee
+
+
+COFFEE_FIELDS = {f.name for f in fields(Coffee)} - {'roastery_name', 'url', 'crawled_at'}
+LIST_FIELDS = {'tasting_notes'}
+
+# Rightmost compound of a selector starts with its tag name, if it has one
+LAST_COMPOUND = re.compile(r'(?:^|[\s>+~])([a-zA-Z][\w-]*)?[^\s>+~]*$')
+# soupsieve extensions that document.querySelector does not understand
+SOUPSIEVE_ONLY = re.compile(r':-soup-|:contains\(')
+
+# Runs every detail selector in the page and returns element snapshots instead of the whole DOM.
+# The argument maps selector -> {all, attrs, cells}; cells are the first descendants by tag, for table rows.
+BROWSER_EXTRACT_SCRIPT = r"""
+var plan = arguments[0];
+function snapshot(element, wanted) {
+    var item = {text: element.textContent};
+    if (wanted.attrs.length) {
+        item.attrs = {};
+        wanted.attrs.forEach(function (name) {
+            var value = element.getAttribute(name);
+            if (value !== null) item.attrs[name] = value;
+        });
+    }
+    if (wanted.cells.length) {
+        item.cells = {};
+        wanted.cells.forEach(function (tag) {
+            var cell = element.querySelector(tag);
+            if (cell) item.cells[tag] = cell.textContent;
+        });
+    }
+    return item;
+}
+var found = {};
+Object.keys(plan).forEach(function (selector) {
+    var wanted = plan[selector];
+    var elements = wanted.all ? Array.prototype.slice.call(document.querySelectorAll(selector))
+                              : [document.querySelector(selector)].filter(Boolean);
+    found[selector] = elements.map(function (element) { return snapshot(element, wanted); });
+});
+var structured = Array.prototype.map.call(document.querySelectorAll(
+    'script[type="application/ld+json"], meta[property^="og:"], meta[property^="product:"], ' +
+    'meta[name^="og:"], meta[name^="product:"]'), function (element) { return element.outerHTML; });
+// Cafe24 and Godomall declare the product in inline scripts; only the matching declarations are returned
+var inline = /var\s+(?:product_name|product_price|sSoldOut)\s*=\s*(?:"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|"(?:goodsNm|goodsPrice|soldOutFl)"\s*:\s*"(?:\\.|[^"\\])*"/g;
+Array.prototype.forEach.call(document.querySelectorAll('script:not([src])'), function (script) {
+    structured = structured.concat(script.textContent.match(inline) || []);
+});
+return {found: found, structured: structured.join('\n')};
+"""
+
+
+@dataclass
+class FieldRule:
+    name: str
+    selectors: List[str]
+    all_matches: bool = False
+    attr: Optional[str] = None
+    regex: Optional[Pattern] = None
+    kind: str = 'text'
+    required: bool = False
+
+
+@dataclass
+class TableRule:
+    rows: str
+    cells: List[Tuple[str, str]]
+    labels: List[Tuple[str, List[str]]]
+    split: Pattern
+
+
+@dataclass
+class TextRule:
+    name: str
+    patterns: List[Pattern]
+    split: Pattern
+    join: Optional[str] = None
+    only_if_missing: bool = False
+
+
+@dataclass
+class TextSource:
+    selectors: List[str]
+    each: bool = False
+    rules: List[TextRule] = field(default_factory=list)
+
+
+@dataclass
+class ListingSpec:
+    categories: List[str]
+    links: str
+    max_pages: Optional[int] = None
+    contains: Optional[str] = None
+    follow: Optional[str] = None
+    follow_contains: Optional[str] = None
+
+
+@dataclass
+class DiscoverySpec:
+    enabled: bool = True
+    sitemaps: Optional[List[str]] = None
+    feeds: List[str] = field(default_factory=list)
+    pattern: Optional[Pattern] = None
+
+
+class SpecError(ValueError):
+    pass
+
+
+def split_selector_list(selector: str) -> List[str]:
+    parts, depth, current = [], 0, ''
+    for char in selector:
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if char == ',' and depth == 0:
+            parts.append(current.strip())
+            current = ''
+            continue
+        current += char
+    parts.append(current.strip())
+    return [part for part in parts if part]
+
+
+def selector_tags(selector: str) -> Set[str]:
+    tags = set()
+    for part in split_selector_list(selector):
+        match = LAST_COMPOUND.search(part)
+        tags.add(match.group(1).lower() if match and match.group(1) else '*')
+    return tags
+
+
+class ExtractionPlan:
+    def __init__(self, selectors: Dict[str, bool]):
+        # selector -> whether every match is needed (True) or only the first in document order
+        self.selectors = selectors
+        self.compiled = {selector: soupsieve.compile(selector) for selector in selectors}
+        self.by_tag: Dict[str, List[str]] = {}
+        for selector in selectors:
+            for tag in selector_tags(selector):
+                self.by_tag.setdefault(tag, []).append(selector)
+        self.wildcard = self.by_tag.pop('*', [])
+    
+    def run(self, soup: BeautifulSoup) -> Dict[str, List[Tag]]:
+        found: Dict[str, List[Tag]] = {selector: [] for selector in self.selectors}
+        pending_first = {selector for selector, many in self.selectors.items() if not many}
+        needs_all = any(self.selectors.values())
+        
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            
+            candidates = self.by_tag.get(element.name, ())
+            if self.wildcard:
+                candidates = list(candidates) + self.wildcard
+            
+            for selector in candidates:
+                matches = found[selector]
+                if matches and selector in pending_first:
+                    continue
+                if self.compiled[selector].match(element):
+                    if not matches or matches[-1] is not element:
+                        matches.append(element)
+                    pending_first.discard(selector)
+            
+            if not pending_first and not needs_all:
+                break
+        
+        return found
+
+
+class RenderedElement:
+    # Element snapshot returned by BROWSER_EXTRACT_SCRIPT, with the parts of Tag the extraction rules use
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+    
+    def get(self, attr: str) -> Optional[str]:
+        return (self.data.get('attrs') or {}).get(attr)
+    
+    def get_text(self) -> str:
+        return self.data.get('text') or ''
+    
+    def find(self, tag: str) -> Optional['RenderedElement']:
+        text = (self.data.get('cells') or {}).get(tag)
+        return RenderedElement({'text': text}) if text is not None else None
+
+
+class CrawlerSpec:
+    def __init__(self, name: str, data: Dict[str, Any]):
+        self.name = name
+        try:
+            self.roastery_name: str = data['roastery_name']
+            self.base_url: str = data['base_url']
+            self.fetch_mode: str = data.get('fetch', 'browser' if data.get('use_selenium') else 'static')
+            self.listing = self._listing(data['listing'])
+            self.discovery = self._discovery(data.get('discovery', {}))
+            self.fields = [self._field(key, value) for key, value in data.get('fields', {}).items()]
+            self.table = self._table(data['table']) if data.get('table') else None
+            self.text = [self._text_source(source) for source in data.get('text', [])]
+            self.browser_extract: bool = data.get('browser_extract', True)
+            self.stream_until: List[str] = list(data.get('stream_until', []))
+        except (KeyError, TypeError, re.error) as e:
+            raise SpecError(f"Invalid crawler spec '{name}': {e!r}") from e
+        
+        if not any(rule.required for rule in self.fields):
+            raise SpecError(f"Invalid crawler spec '{name}': no required field")
+        if self.fetch_mode not in ('static', 'browser', 'hybrid'):
+            raise SpecError(f"Invalid crawler spec '{name}': unknown fetch mode '{self.fetch_mode}'")
+        
+        # Fields a static page must yield before hybrid fetching trusts it without the browser
+        self.validate = [self._check_field(field_name) for field_name in
+                         data.get('validate', [rule.name for rule in self.fields if rule.required])]
+        
+        self.plan = ExtractionPlan(self._selectors())
+        self._plans: Dict[FrozenSet[str], ExtractionPlan] = {frozenset(): self.plan}
+        self.browser_plan = self._browser_plan() if self.browser_extract else None
+    
+    def _check_field(self, name: str) -> str:
+        if name not in COFFEE_FIELDS:
+            raise SpecError(f"Invalid crawler spec '{self.name}': unknown field '{name}'")
+        return name
+    
+    def _listing(self, data: Dict[str, Any]) -> ListingSpec:
+        follow = data.get('follow') or {}
+        return ListingSpec(
+            categories=data['categories'],
+            links=data['links'],
+            max_pages=data.get('max_pages'),
+            contains=data.get('contains'),
+            follow=follow.get('select'),
+            follow_contains=follow.get('contains'),
+        )
+    
+    def _discovery(self, data: Any) -> DiscoverySpec:
+        if data is False:
+            return DiscoverySpec(enabled=False)
+        return DiscoverySpec(
+            sitemaps=data.get('sitemaps'),
+            feeds=data.get('feeds', []),
+            pattern=re.compile(data['pattern']) if data.get('pattern') else None,
+        )
+    
+    def _field(self, name: str, data: Dict[str, Any]) -> FieldRule:
+        selectors = data['select']
+        return FieldRule(
+            name=self._check_field(name),
+            selectors=[selectors] if isinstance(selectors, str) else selectors,
+            all_matches=data.get('all', False),
+            attr=data.get('attr'),
+            regex=re.compile(data['regex']) if data.get('regex') else None,
+            kind=data.get('type', 'text'),
+            required=data.get('required', False),
+        )
+    
+    def _table(self, data: Dict[str, Any]) -> TableRule:
+        return TableRule(
+            rows=data['rows'],
+            cells=[tuple(pair) for pair in data.get('cells', [['th', 'td']])],
+            labels=[(self._check_field(name), keywords) for name, keywords in data['labels']],
+            split=re.compile(data.get('split', ',')),
+        )
+    
+    def _text_source(self, data: Dict[str, Any]) -> TextSource:
+        selectors = data['select']
+        rules = []
+        for rule in data['rules']:
+            flags = re.IGNORECASE if rule.get('ignore_case') else 0
+            rules.append(TextRule(
+                name=self._check_field(rule['field']),
+                patterns=[re.compile(pattern, flags) for pattern in rule['patterns']],
+                split=re.compile(rule.get('split', ',')),
+                join=rule.get('join'),
+                only_if_missing=rule.get('only_if_missing', False),
+            ))
+        return TextSource(
+            selectors=[selectors] if isinstance(selectors, str) else selectors,
+            each=data.get('each', False),
+            rules=rules,
+        )
+    
+    def plan_without(self, known: FrozenSet[str]) -> ExtractionPlan:
+        # Field selectors for values that structured data already supplied are left out of the walk
+        known = known & {rule.name for rule in self.fields}
+        if known not in self._plans:
+            self._plans[known] = ExtractionPlan(self._selectors(known))
+        return self._plans[known]
+    
+    def _browser_plan(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        if any(SOUPSIEVE_ONLY.search(selector) for selector in self.plan.selectors):
+            return None
+        
+        plan = {selector: {'all': many, 'attrs': [], 'cells': []} for selector, many in self.plan.selectors.items()}
+        for rule in self.fields:
+            if rule.attr:
+                for selector in rule.selectors:
+                    if rule.attr not in plan[selector]['attrs']:
+                        plan[selector]['attrs'].append(rule.attr)
+        if self.table:
+            plan[self.table.rows]['cells'] = sorted({tag for pair in self.table.cells for tag in pair})
+        return plan
+    
+    def _selectors(self, skip: FrozenSet[str] = frozenset()) -> Dict[str, bool]:
+        selectors: Dict[str, bool] = {}
+        
+        def need(selector: str, many: bool):
+            selectors[selector] = selectors.get(selector, False) or many
+        
+        for rule in self.fields:
+            if rule.name in skip:
+                continue
+            for selector in rule.selectors:
+                need(selector, rule.all_matches)
+        if self.table:
+            need(self.table.rows, True)
+        for source in self.text:
+            for selector in source.selectors:
+                need(selector, source.each)
+        
+        return selectors
+
+
+@lru_cache(maxsize=None)
+def load_spec(name: str) -> CrawlerSpec:
+    with open(os.path.join(SPEC_DIR, f'{name}.json'), encoding='utf-8') as f:
+        return CrawlerSpec(name, json.load(f))
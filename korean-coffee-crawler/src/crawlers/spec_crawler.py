@@ -0,0 +1,211 @@
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional, Pattern, Set
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from .base_crawler import BaseCrawler
+from .spec import (BROWSER_EXTRACT_SCRIPT, COFFEE_FIELDS, LIST_FIELDS, CrawlerSpec, FieldRule,
+                   RenderedElement, TableRule, TextRule)
+from ..models import Coffee
+from ..utils.structured_data import extract_structured
+
+
+class SpecCrawler(BaseCrawler):
+    def __init__(self, spec: CrawlerSpec):
+        super().__init__(
+            roastery_name=spec.roastery_name,
+            base_url=spec.base_url,
+            fetch_mode=spec.fetch_mode
+        )
+        self.required_fields = spec.validate
+        self.spec = spec
+        self.crawler_name = spec.name
+        self.logger = logging.getLogger(f"{self.__class__.__name__}.{spec.name}")
+        self.use_sitemaps = spec.discovery.enabled
+        self.sitemap_scope = spec.discovery.pattern is not None
+        self.sitemaps = spec.discovery.sitemaps
+        self.feeds = spec.discovery.feeds
+        self.stream_until = spec.stream_until
+        if spec.browser_plan is not None:
+            self.browser_extraction = (BROWSER_EXTRACT_SCRIPT, spec.browser_plan)
+    
+    def is_product_url(self, url: str) -> bool:
+        if self.spec.discovery.pattern:
+            return bool(self.spec.discovery.pattern.search(url))
+        return super().is_product_url(url)
+    
+    def iter_coffee_list_urls(self) -> Iterator[str]:
+        listing = self.spec.listing
+        seen: Set[str] = set()
+        categories = list(listing.categories)
+        visited = set(categories)
+        
+        for category in categories:
+            page = 1
+            while True:
+                if listing.max_pages:
+                    separator = '&' if '?' in category else '?'
+                    list_url = f"{urljoin(self.base_url, category)}{separator}page={page}"
+                else:
+                    list_url = urljoin(self.base_url, category)
+                
+                soup = self.get_listing_page(list_url)
+                if not soup:
+                    break
+                
+                products = soup.select(listing.links)
+                if page == 1 and self.listing_needs_browser(list_url, bool(products)):
+                    soup = self.get_page(list_url, browser=True)
+                    if not soup:
+                        break
+                    products = soup.select(listing.links)
+                
+                for product in products:
+                    href = product.get('href')
+                    if not href:
+                        continue
+                    url = urljoin(self.base_url, href)
+                    if listing.contains and listing.contains not in url:
+                        continue
+                    if url not in seen:
+                        seen.add(url)
+                        yield url
+                
+                if listing.follow and page == 1 and category in listing.categories:
+                    for link in soup.select(listing.follow):
+                        href = link.get('href')
+                        if not href or (listing.follow_contains and listing.follow_contains not in href.lower()):
+                            continue
+                        if href not in visited:
+                            visited.add(href)
+                            categories.append(href)
+                
+                page += 1
+                if not products or not listing.max_pages or page > listing.max_pages:
+                    break
+    
+    def parse_coffee_page(self, soup: BeautifulSoup, url: str,
+                          known: Optional[Dict[str, Any]] = None) -> Optional[Coffee]:
+        return self._build_coffee(url, lambda: self.extract(soup, known))
+    
+    def parse_rendered(self, page: Dict[str, Any], url: str) -> Optional[Coffee]:
+        known = extract_structured(page.get('structured') or '') if self.use_structured_data else {}
+        if known:
+            self.metrics.structured_pages += 1
+        found = {selector: [RenderedElement(item) for item in items]
+                 for selector, items in (page.get('found') or {}).items()}
+        return self._build_coffee(url, lambda: self.extract_found(found, known))
+    
+    def _build_coffee(self, url: str, extract: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Coffee]:
+        try:
+            values = extract()
+            if values is None:
+                return None
+            return Coffee(roastery_name=self.roastery_name, url=url, **values)
+        except Exception as e:
+            self.logger.error(f"Error parsing coffee detail from {url}: {e}")
+            return None
+    
+    def extract(self, soup: BeautifulSoup, known: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        known = {name: value for name, value in (known or {}).items() if name in COFFEE_FIELDS}
+        return self.extract_found(self.spec.plan_without(frozenset(known)).run(soup), known)
+    
+    def extract_found(self, found: Dict[str, List[Any]], known: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        # found: matches per selector, as Tags from the plan walk or RenderedElements from the browser
+        spec = self.spec
+        known = {name: value for name, value in (known or {}).items() if name in COFFEE_FIELDS}
+        values: Dict[str, Any] = dict(known)
+        
+        for rule in spec.fields:
+            if rule.name in known:
+                continue
+            value = self._field_value(rule, found)
+            if value is None and rule.required:
+                return None
+            if value is not None:
+                values[rule.name] = value
+        
+        if spec.table:
+            self._apply_table(spec.table, found.get(spec.table.rows, []), values)
+        
+        for source in spec.text:
+            elements = [element for selector in source.selectors for element in found.get(selector, [])]
+            if not source.each:
+                elements = elements[:1]
+            for element in elements:
+                text = element.get_text()
+                for rule in source.rules:
+                    self._apply_text(rule, text, values)
+        
+        for name in LIST_FIELDS:
+            if name in values:
+                values[name] = list(dict.fromkeys(values[name])) or None
+        
+        # Table and text rules may have matched the same field loosely; embedded metadata wins
+        values.update(known)
+        return values
+    
+    def _field_value(self, rule: FieldRule, found: Dict[str, List[Any]]) -> Any:
+        for selector in rule.selectors:
+            elements = found.get(selector, [])
+            if not rule.all_matches:
+                elements = elements[:1]
+            for element in elements:
+                raw = element.get(rule.attr) if rule.attr else element.get_text()
+                if raw and rule.regex:
+                    match = rule.regex.search(raw)
+                    raw = match.group(1) if match else None
+                if not raw:
+                    continue
+                value = self.extract_price(raw) if rule.kind == 'price' else self.clean_text(raw)
+                if value:
+                    return value
+        return None
+    
+    def _apply_table(self, table: TableRule, rows: List[Any], values: Dict[str, Any]):
+        for row in rows:
+            for label_tag, value_tag in table.cells:
+                label_elem = row.find(label_tag)
+                value_elem = row.find(value_tag)
+                if label_elem and value_elem:
+                    break
+            else:
+                continue
+            
+            label = self.clean_text(label_elem.get_text())
+            value = self.clean_text(value_elem.get_text())
+            if not label or not value:
+                continue
+            
+            for name, keywords in table.labels:
+                if any(keyword in label for keyword in keywords):
+                    if name in LIST_FIELDS:
+                        values.setdefault(name, []).extend(self._split(table.split, value))
+                    else:
+                        values[name] = value
+                    break
+    
+    def _apply_text(self, rule: TextRule, text: str, values: Dict[str, Any]):
+        if rule.only_if_missing and values.get(rule.name):
+            return
+        
+        if rule.name in LIST_FIELDS:
+            for pattern in rule.patterns:
+                for match in pattern.findall(text):
+                    values.setdefault(rule.name, []).extend(self._split(rule.split, match))
+            return
+        
+        collected = []
+        for pattern in rule.patterns:
+            match = pattern.search(text)
+            if match:
+                collected.append(match.group(1).strip())
+                if not rule.join:
+                    break
+        
+        if collected:
+            values[rule.name] = rule.join.join(collected) if rule.join else collected[0]
+    
+    def _split(self, pattern: Pattern, text: str) -> List[str]:
+        return [value.strip() for value in pattern.split(text) if value.strip()]
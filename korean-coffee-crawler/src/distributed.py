@@ -0,0 +1,150 @@
+import logging
+import os
+import socket
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .crawlers.base_crawler import BaseCrawler
+from .models import Coffee
+from .utils.job_queue import HostPacer, Job
+from .utils.metrics import CrawlMetrics
+
+
+class CrawlCoordinator:
+    def __init__(self, queue, poll_interval: float = 2.0):
+        self.queue = queue
+        self.poll_interval = poll_interval
+        self.logger = logging.getLogger(self.__class__.__name__)
+    
+    def submit(self, roasteries: List[str]):
+        for name in roasteries:
+            self.queue.push('discover', name)
+        self.logger.info(f"Queued discovery for {len(roasteries)} roasteries")
+    
+    def iter_results(self) -> Iterator[Tuple[str, Coffee]]:
+        after = 0
+        last_report = 0.0
+        
+        while True:
+            # Read the job count before the results so a job finishing in between is still collected
+            active = self.queue.active()
+            results = self.queue.results(after)
+            
+            for seq, roastery, record in results:
+                after = seq
+                yield roastery, Coffee.from_record(record)
+            
+            if results:
+                continue
+            if not active:
+                break
+            
+            if time.monotonic() - last_report >= 30:
+                last_report = time.monotonic()
+                self.logger.info(f"Waiting for workers: {self.queue.counts()}")
+            time.sleep(self.poll_interval)
+        
+        counts = self.queue.counts()
+        if counts['failed']:
+            self.logger.warning(f"{counts['failed']} jobs failed after all retries")
+
+
+class CrawlWorker:
+    def __init__(self, queue, make_crawler: Callable[[str], BaseCrawler], metrics: CrawlMetrics,
+                 host_interval: float = 1.0, idle_timeout: float = 30.0, poll_interval: float = 1.0):
+        self.queue = queue
+        self.make_crawler = make_crawler
+        self.metrics = metrics
+        self.pacer = HostPacer(queue, host_interval)
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.crawlers: Dict[str, BaseCrawler] = {}
+        self.handled = 0
+        self.renewed_at = 0.0
+    
+    def crawler(self, name: str) -> BaseCrawler:
+        if name not in self.crawlers:
+            crawler = self.make_crawler(name)
+            crawler.pacer = self.pacer
+            self.crawlers[name] = crawler
+        return self.crawlers[name]
+    
+    def run(self) -> int:
+        self.logger.info(f"Worker {self.worker_id} waiting for jobs")
+        idle_since: Optional[float] = None
+        
+        try:
+            while True:
+                job = self.queue.lease(self.worker_id)
+                if job is None:
+                    idle_since = idle_since or time.monotonic()
+                    if time.monotonic() - idle_since >= self.idle_timeout:
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+                
+                idle_since = None
+                self.renewed_at = time.monotonic()
+                self.handle(job)
+                self.handled += 1
+        finally:
+            for crawler in self.crawlers.values():
+                crawler.close()
+        
+        self.logger.info(f"Worker {self.worker_id} idle, exiting after {self.handled} jobs")
+        return self.handled
+    
+    def keep_lease(self, job: Job) -> bool:
+        # Renewed between pages once a third of the lease has passed, so a long job is not handed to a second worker
+        now = time.monotonic()
+        if now - self.renewed_at < self.queue.lease_seconds / 3:
+            return True
+        self.renewed_at = now
+        if self.queue.renew(job):
+            return True
+        self.logger.warning(f"Lease on job {job.id} expired and the job went to another worker; dropping it")
+        return False
+    
+    def handle(self, job: Job):
+        crawler = self.crawler(job.roastery)
+        try:
+            if job.kind == 'discover':
+                urls = []
+                for url in crawler.metrics.timed(crawler.iter_discovered_urls(), 'discovery'):
+                    if not self.keep_lease(job):
+                        return
+                    urls.append(url)
+                if not urls and crawler.robots_unavailable():
+                    # Retried later, and not counted as discovered, so its products are not marked unlisted
+                    self.queue.fail(job, 'robots.txt unavailable')
+                    return
+                added = self.queue.push_many('detail', job.roastery, urls)
+                self.logger.info(f"Discovered {len(urls)} URLs for {job.roastery} ({added} new)")
+                self.queue.complete(job)
+                return
+            
+            # Only fetch failures are retried; a page that loads but does not parse would fail again
+            page = crawler.fetch_page(job.url)
+            if page is None:
+                self.queue.fail(job, 'fetch failed')
+                return
+            # Parsing may still load the page in the browser
+            if not self.keep_lease(job):
+                return
+            
+            coffee = crawler.parse_fetched(job.url, page)
+            
+            if coffee:
+                crawler.metrics.parsed += 1
+                self.logger.info(f"Successfully parsed: {coffee.coffee_name}")
+            else:
+                crawler.metrics.failed += 1
+                self.logger.warning(f"Failed to parse coffee from {job.url}")
+            
+            if not self.queue.complete(job, coffee.to_record() if coffee else None):
+                self.logger.warning(f"Lease on job {job.id} expired before it finished; result dropped")
+        except Exception as e:
+            self.logger.error(f"Job {job.id} ({job.kind} {job.roastery} {job.url}) failed: {e}")
+            self.queue.fail(job, str(e))
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 
@@ -17,6 +17,7 @@ class Coffee:
     altitude: Optional[str] = None
     harvest_date: Optional[str] = None
     url: Optional[str] = None
+    available: Optional[bool] = None
     crawled_at: datetime = None
     
     def __post_init__(self):
@@ -40,4 +41,42 @@ class Coffee:
             '수확시기': self.harvest_date,
             'URL': self.url,
             '크롤링시간': self.crawled_at.strftime('%Y-%m-%d %H:%M:%S')
-        }
\ No newline at end of file
+        }
+    
+    @classmethod
+    def from_dict(cls, row: Dict[str, Any]) -> 'Coffee':
+        def value(key):
+            cell = row.get(key)
+            return cell if cell not in ('', None) else None
+        
+        price = value('가격')
+        notes = value('테이스팅노트')
+        crawled_at = value('크롤링시간')
+        
+        return cls(
+            roastery_name=row['로스터리'],
+            coffee_name=row['커피명'],
+            origin=value('원산지'),
+            process=value('가공방식'),
+            tasting_notes=[note.strip() for note in notes.split(',') if note.strip()] if notes else None,
+            price=int(float(price)) if price is not None else None,
+            weight=value('중량'),
+            roast_level=value('로스팅레벨'),
+            variety=value('품종'),
+            altitude=value('고도'),
+            harvest_date=value('수확시기'),
+            url=value('URL'),
+            crawled_at=datetime.strptime(crawled_at, '%Y-%m-%d %H:%M:%S') if crawled_at else None
+        )
+    
+    def to_record(self) -> Dict[str, Any]:
+        record = asdict(self)
+        record['crawled_at'] = self.crawled_at.isoformat()
+        return record
+    
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'Coffee':
+        record = dict(record)
+        if record.get('crawled_at'):
+            record['crawled_at'] = datetime.fromisoformat(record['crawled_at'])
+        return cls(**record)
\ No newline at end of file
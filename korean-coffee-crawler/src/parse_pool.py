@@ -0,0 +1,109 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+from .crawlers.base_crawler import BaseCrawler, Page
+from .models import Coffee
+
+
+# Each parse worker builds a crawler per spec once and reuses it for every page
+_crawlers: Dict[str, BaseCrawler] = {}
+
+
+def worker_crawler(name: str) -> BaseCrawler:
+    if name not in _crawlers:
+        from .crawlers import CRAWLERS
+        _crawlers[name] = CRAWLERS[name]()
+    return _crawlers[name]
+
+
+def parse_in_worker(name: str, url: str, payload: Any, size: int) -> Tuple[Optional[Dict[str, Any]], bool, float]:
+    # payload: name of a shared memory block holding size bytes of UTF-8 HTML, or a rendered page as is
+    start = time.perf_counter()
+    crawler = worker_crawler(name)
+    
+    if isinstance(payload, str):
+        block = shared_memory.SharedMemory(name=payload)
+        try:
+            page = bytes(block.buf[:size]).decode('utf-8')
+        finally:
+            block.close()
+    else:
+        page = payload
+    
+    structured = crawler.metrics.structured_pages
+    coffee = crawler.parse_page(page, url)
+    return (
+        coffee.to_record() if coffee else None,
+        crawler.metrics.structured_pages > structured,
+        time.perf_counter() - start
+    )
+
+
+class ParsePool:
+    def __init__(self, workers: int, in_flight: Optional[int] = None):
+        self.workers = workers
+        self.in_flight = in_flight or workers * 2
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.logger = logging.getLogger(self.__class__.__name__)
+    
+    def submit(self, name: str, url: str, page: Page) -> Tuple[Future, Optional[shared_memory.SharedMemory]]:
+        if not isinstance(page, str):
+            return self.executor.submit(parse_in_worker, name, url, page, 0), None
+        
+        # HTML goes through shared memory so only the block name is pickled through the pool's pipe
+        data = page.encode('utf-8')
+        block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        block.buf[:len(data)] = data
+        return self.executor.submit(parse_in_worker, name, url, block.name, len(data)), block
+    
+    def imap(self, crawler: BaseCrawler,
+             pages: Iterable[Tuple[str, Optional[Page]]]) -> Iterator[Tuple[str, Optional[Page], Optional[Coffee]]]:
+        # Pages keep parsing in the workers while the caller fetches the next ones; results come back in order
+        pending: Deque[Tuple[str, Optional[Page], Optional[Future], Optional[shared_memory.SharedMemory]]] = deque()
+        
+        try:
+            for url, page in pages:
+                if page:
+                    pending.append((url, page) + self.submit(crawler.crawler_name, url, page))
+                else:
+                    pending.append((url, page, None, None))
+                
+                while pending and (len(pending) > self.in_flight or pending[0][2] is None or pending[0][2].done()):
+                    yield self.collect(crawler, *pending.popleft())
+            
+            while pending:
+                yield self.collect(crawler, *pending.popleft())
+        finally:
+            for _, _, future, block in pending:
+                if future is not None:
+                    future.cancel()
+                if block is not None:
+                    block.close()
+                    block.unlink()
+    
+    def collect(self, crawler: BaseCrawler, url: str, page: Optional[Page], future: Optional[Future],
+                block: Optional[shared_memory.SharedMemory]) -> Tuple[str, Optional[Page], Optional[Coffee]]:
+        if future is None:
+            return url, page, None
+        
+        try:
+            record, structured, seconds = future.result()
+        except Exception as e:
+            self.logger.error(f"Parse worker failed on {url}: {e}")
+            record, structured, seconds = None, False, 0.0
+        finally:
+            if block is not None:
+                block.close()
+                block.unlink()
+        
+        crawler.metrics.seconds['parse'] += seconds
+        if structured:
+            crawler.metrics.structured_pages += 1
+        return url, page, Coffee.from_record(record) if record else None
+    
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
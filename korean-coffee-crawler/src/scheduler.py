@@ -0,0 +1,356 @@
+import logging
+import sqlite3
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .crawlers.base_crawler import BaseCrawler
+from .utils.price_history import PriceHistory
+from .utils.urls import url_product_id
+
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recrawl_targets (
+    target TEXT PRIMARY KEY,
+    crawler TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    url TEXT,
+    checks INTEGER NOT NULL DEFAULT 0,
+    changes INTEGER NOT NULL DEFAULT 0,
+    observed_seconds REAL NOT NULL DEFAULT 0,
+    cost REAL NOT NULL DEFAULT 1,
+    last_check REAL,
+    interval REAL,
+    next_due REAL NOT NULL,
+    pinned INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_recrawl_targets_due ON recrawl_targets (next_due);
+CREATE INDEX IF NOT EXISTS idx_recrawl_targets_crawler ON recrawl_targets (crawler, kind);
+
+CREATE TABLE IF NOT EXISTS recrawl_spend (
+    at REAL NOT NULL,
+    cost REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recrawl_spend_at ON recrawl_spend (at);
+"""
+
+
+class ChangeRates:
+    def __init__(self, conn: sqlite3.Connection, prior_interval: float = 3 * DAY):
+        # Until a target has history of its own, assume about one change per prior_interval
+        self.conn = conn
+        self.prior_interval = prior_interval
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.conn.executescript(SCHEMA)
+        # pinned: next_due was set by a lastmod or a failed fetch, and replanning must not push it back
+        if 'pinned' not in {row['name'] for row in self.conn.execute("PRAGMA table_info(recrawl_targets)")}:
+            self.conn.execute("ALTER TABLE recrawl_targets ADD COLUMN pinned INTEGER NOT NULL DEFAULT 0")
+    
+    def seed(self, crawler: str, roastery_name: str, now: float):
+        # Start from what earlier crawls already recorded in the price history
+        if self.conn.execute("SELECT 1 FROM recrawl_targets WHERE crawler = ? LIMIT 1", (crawler,)).fetchone():
+            return
+        
+        self.conn.execute(
+            "INSERT INTO recrawl_targets (target, crawler, kind, next_due) VALUES (?, ?, 'listing', ?)",
+            (f"listing:{crawler}", crawler, now)
+        )
+        
+        rows = self.conn.execute(
+            "SELECT p.product_id, p.url, p.first_seen, p.last_seen, COUNT(c.changed_at) AS changes "
+            "FROM products p LEFT JOIN price_changes c ON c.product_id = p.product_id "
+            "WHERE p.roastery = ? AND p.url IS NOT NULL AND IFNULL(p.available, 1) != 0 "
+            "GROUP BY p.product_id",
+            (roastery_name,)
+        ).fetchall()
+        
+        for row in rows:
+            first_seen = datetime.fromisoformat(row['first_seen']).timestamp()
+            last_seen = datetime.fromisoformat(row['last_seen']).timestamp()
+            # The first price_changes row is the product appearing, not a change
+            self.conn.execute(
+                "INSERT OR IGNORE INTO recrawl_targets "
+                "(target, crawler, kind, url, checks, changes, observed_seconds, last_check, next_due) "
+                "VALUES (?, ?, 'product', ?, ?, ?, ?, ?, ?)",
+                (row['product_id'], crawler, row['url'], max(row['changes'], 1), max(row['changes'] - 1, 0),
+                 last_seen - first_seen, last_seen, last_seen)
+            )
+        
+        self.conn.commit()
+        self.logger.info(f"Seeded {len(rows)} products for {crawler} from price history")
+    
+    def add_product(self, crawler: str, target: str, url: str, now: float) -> bool:
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO recrawl_targets (target, crawler, kind, url, next_due) "
+            "VALUES (?, ?, 'product', ?, ?)",
+            (target, crawler, url, now)
+        )
+        return bool(cursor.rowcount)
+    
+    def remove_products(self, crawler: str, targets: List[str]):
+        self.conn.executemany(
+            "DELETE FROM recrawl_targets WHERE crawler = ? AND target = ?",
+            [(crawler, target) for target in targets]
+        )
+    
+    def product_targets(self, crawler: str) -> Dict[str, str]:
+        rows = self.conn.execute(
+            "SELECT target, url FROM recrawl_targets WHERE crawler = ? AND kind = 'product'", (crawler,)
+        )
+        return {row['target']: row['url'] for row in rows}
+    
+    def due(self, now: float, limit: int = 50) -> List[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM recrawl_targets WHERE next_due <= ? ORDER BY next_due LIMIT ?",
+            (now, limit)
+        ).fetchall()
+    
+    def next_due(self) -> Optional[float]:
+        row = self.conn.execute("SELECT MIN(next_due) AS next_due FROM recrawl_targets").fetchone()
+        return row['next_due']
+    
+    def observe(self, target: sqlite3.Row, changed: bool, cost: float, now: float, min_interval: float):
+        elapsed = now - target['last_check'] if target['last_check'] else 0.0
+        interval = target['interval'] or min_interval
+        # Listing cost is the number of pages it took, which drifts as the catalog grows
+        cost = cost if not target['checks'] else 0.7 * target['cost'] + 0.3 * cost
+        self.conn.execute(
+            "UPDATE recrawl_targets SET checks = checks + 1, changes = changes + ?, "
+            "observed_seconds = observed_seconds + ?, cost = ?, last_check = ?, next_due = ?, pinned = 0 WHERE target = ?",
+            (int(changed), elapsed, cost, now, now + interval, target['target'])
+        )
+    
+    def mark_due(self, crawler: str, changed_since: Dict[str, float], now: float) -> int:
+        # Pages whose sitemap lastmod is newer than our last look get refetched right away
+        cursor = self.conn.executemany(
+            "UPDATE recrawl_targets SET next_due = ?, pinned = 1 "
+            "WHERE crawler = ? AND kind = 'product' AND url = ? AND IFNULL(last_check, 0) < ? AND next_due > ?",
+            [(now, crawler, url, modified, now) for url, modified in changed_since.items()]
+        )
+        return cursor.rowcount
+    
+    def postpone(self, target: sqlite3.Row, seconds: float, now: float):
+        self.conn.execute("UPDATE recrawl_targets SET next_due = ?, pinned = 1 WHERE target = ?",
+                          (now + seconds, target['target']))
+    
+    def record_spend(self, cost: float, now: float):
+        # Kept in the database so the 24h budget holds across --once runs from cron
+        self.conn.execute("INSERT INTO recrawl_spend (at, cost) VALUES (?, ?)", (now, cost))
+    
+    def spent_since(self, since: float) -> List[Tuple[float, float]]:
+        self.conn.execute("DELETE FROM recrawl_spend WHERE at <= ?", (since,))
+        rows = self.conn.execute("SELECT at, cost FROM recrawl_spend ORDER BY at")
+        return [(row['at'], row['cost']) for row in rows]
+    
+    def plan(self, budget_per_day: float, min_interval: float, max_interval: float,
+             target_changes: float = 0.1) -> Tuple[float, float]:
+        rows = self.conn.execute(
+            "SELECT target, crawler, kind, changes, observed_seconds, cost, last_check FROM recrawl_targets"
+        ).fetchall()
+        if not rows:
+            return 0.0, 0.0
+        
+        # Pool each crawler's products (and all listings) into a prior, then shrink each target towards it
+        pooled: Dict[Tuple[str, str], List[float]] = {}
+        for row in rows:
+            group = (row['crawler'] if row['kind'] == 'product' else '', row['kind'])
+            totals = pooled.setdefault(group, [1.0, self.prior_interval])
+            totals[0] += row['changes']
+            totals[1] += row['observed_seconds']
+        
+        rates = []
+        for row in rows:
+            group = (row['crawler'] if row['kind'] == 'product' else '', row['kind'])
+            changes, observed = pooled[group]
+            prior_seconds = observed / changes
+            rates.append((row['changes'] + 1) / (row['observed_seconds'] + prior_seconds))
+        
+        def intervals(expected_changes: float) -> List[float]:
+            return [min(max(expected_changes / rate, min_interval), max_interval) for rate in rates]
+        
+        def daily_requests(expected_changes: float) -> float:
+            return sum(row['cost'] * DAY / interval for row, interval in zip(rows, intervals(expected_changes)))
+        
+        # Revisit each target after the same expected number of changes: target_changes if the
+        # budget allows it, otherwise the lowest number the budget can pay for
+        low, high = target_changes, 1e4
+        if daily_requests(low) <= budget_per_day:
+            high = low
+        for _ in range(60 if high > low else 0):
+            middle = (low * high) ** 0.5
+            if daily_requests(middle) > budget_per_day:
+                low = middle
+            else:
+                high = middle
+        
+        planned = intervals(high)
+        self.conn.executemany(
+            "UPDATE recrawl_targets SET interval = ?, "
+            "next_due = CASE WHEN pinned THEN next_due ELSE IFNULL(last_check + ?, next_due) END WHERE target = ?",
+            [(interval, interval, row['target']) for row, interval in zip(rows, planned)]
+        )
+        self.conn.commit()
+        return high, daily_requests(high)
+
+
+class RecrawlScheduler:
+    def __init__(self, history: PriceHistory, make_crawler: Callable[[str], BaseCrawler], crawler_names: List[str],
+                 budget_per_day: float = 2000, min_interval: float = HOUR, max_interval: float = 7 * DAY,
+                 target_changes: float = 0.1, request_delay: float = 1.0, replan_every: float = 15 * 60):
+        self.history = history
+        self.make_crawler = make_crawler
+        self.crawler_names = crawler_names
+        self.budget_per_day = budget_per_day
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_changes = target_changes
+        self.request_delay = request_delay
+        self.replan_every = replan_every
+        self.logger = logging.getLogger(self.__class__.__name__)
+        
+        self.rates = ChangeRates(history.conn)
+        self.crawlers: Dict[str, BaseCrawler] = {}
+        self._planned_at = 0.0
+    
+    def crawler(self, name: str) -> BaseCrawler:
+        if name not in self.crawlers:
+            self.crawlers[name] = self.make_crawler(name)
+        return self.crawlers[name]
+    
+    def requests_last_day(self, now: float) -> float:
+        return sum(cost for _, cost in self.rates.spent_since(now - DAY))
+    
+    def budget_wait(self, cost: float, now: float) -> float:
+        # Seconds until enough old requests leave the rolling 24h window to make room for this one
+        window = self.rates.spent_since(now - DAY)
+        spent = sum(spent_cost for _, spent_cost in window)
+        if spent + cost <= self.budget_per_day:
+            return 0.0
+        for at, spent_cost in window:
+            spent -= spent_cost
+            if spent + cost <= self.budget_per_day:
+                return at + DAY - now
+        return 0.0
+    
+    def replan(self, now: float):
+        expected_changes, planned = self.rates.plan(self.budget_per_day, self.min_interval, self.max_interval,
+                                                    self.target_changes)
+        self._planned_at = now
+        self.logger.info(f"Recrawl plan: {planned:.0f} requests/day within a budget of {self.budget_per_day:.0f} "
+                         f"(revisit after ~{expected_changes:.2f} expected changes)")
+    
+    def run(self, once: bool = False):
+        now = time.time()
+        for name in self.crawler_names:
+            self.rates.seed(name, self.crawler(name).roastery_name, now)
+        
+        try:
+            while True:
+                now = time.time()
+                if now - self._planned_at >= self.replan_every:
+                    self.replan(now)
+                
+                due = self.rates.due(now)
+                if not due:
+                    if once:
+                        self.replan(now)
+                        break
+                    next_due = self.rates.next_due() or now + self.replan_every
+                    time.sleep(min(max(next_due - now, 1.0), self.replan_every))
+                    continue
+                
+                checked = changed = 0
+                for target in due:
+                    wait = self.budget_wait(target['cost'], time.time())
+                    if wait:
+                        if once:
+                            self.logger.info("Request budget for the last 24h is used up")
+                            return
+                        self.logger.info(f"Request budget used up; waiting {wait / 60:.0f} min")
+                        time.sleep(wait)
+                    
+                    checked += 1
+                    changed += self.check(target)
+                
+                self.history.commit()
+                for crawler in self.crawlers.values():
+                    crawler.close()
+                
+                self.logger.info(f"Checked {checked} targets, {changed} changed; "
+                                 f"{self.requests_last_day(time.time()):.0f} requests in the last 24h")
+        finally:
+            self.history.commit()
+            for crawler in self.crawlers.values():
+                crawler.close()
+    
+    def check(self, target: sqlite3.Row) -> bool:
+        crawler = self.crawler(target['crawler'])
+        before = crawler.metrics.fetch_latency.count
+        
+        try:
+            if target['kind'] == 'listing':
+                changed = self.check_listing(crawler, target)
+            else:
+                changed = self.check_product(crawler, target)
+        except Exception as e:
+            self.logger.error(f"Error checking {target['target']}: {e}")
+            changed = None
+        
+        now = time.time()
+        cost = crawler.metrics.fetch_latency.count - before
+        if cost:
+            self.rates.record_spend(cost, now)
+        
+        if changed is None:
+            # Fetch failed; try again soon without counting it as an observation
+            self.rates.postpone(target, self.min_interval, now)
+            changed = False
+        else:
+            # The first check of a target only sets the baseline to compare later checks against
+            changed = changed and target['checks'] > 0
+            self.rates.observe(target, changed, max(cost, 1), now, self.min_interval)
+        
+        time.sleep(max(self.request_delay, crawler.request_delay(target['url'] or crawler.base_url)))
+        return changed
+    
+    def check_listing(self, crawler: BaseCrawler, target: sqlite3.Row) -> Optional[bool]:
+        now = time.time()
+        urls = list(crawler.iter_discovered_urls())
+        if not urls:
+            return None
+        
+        modified = {url: crawler.lastmod[url].timestamp() for url in urls if crawler.lastmod.get(url)}
+        if modified:
+            refetch = self.rates.mark_due(target['crawler'], modified, now)
+            if refetch:
+                self.logger.info(f"{target['crawler']}: {refetch} products changed according to lastmod")
+        
+        known = self.rates.product_targets(target['crawler'])
+        listed = {url_product_id(crawler.roastery_name, url): url for url in urls}
+        
+        added = [pid for pid, url in listed.items() if self.rates.add_product(target['crawler'], pid, url, now)]
+        gone = [pid for pid in known if pid not in listed]
+        
+        if gone:
+            self.history.mark_unlisted(crawler.roastery_name, seen=set(listed))
+            self.rates.remove_products(target['crawler'], gone)
+        
+        if added or gone:
+            self.logger.info(f"{target['crawler']}: {len(added)} new and {len(gone)} unlisted products")
+        return bool(added or gone)
+    
+    def check_product(self, crawler: BaseCrawler, target: sqlite3.Row) -> Optional[bool]:
+        page = crawler.fetch_page(target['url'])
+        if page is None:
+            return None
+        
+        coffee = crawler.parse_fetched(target['url'], page)
+        if coffee is None:
+            crawler.metrics.failed += 1
+            return False
+        
+        crawler.metrics.parsed += 1
+        return self.history.record(coffee)
@@ -0,0 +1,246 @@
+import csv
+import heapq
+import re
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ..models import Coffee
+from ..utils.urls import product_id
+
+
+TOKEN_SPLIT = re.compile(r'[,/&·]+')
+ALTITUDE_NUMBER = re.compile(r'\d[\d,]*')
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+def normalize(value: str) -> str:
+    return ' '.join(value.lower().split())
+
+
+def split_tokens(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return [normalize(token) for token in TOKEN_SPLIT.split(value) if token.strip()]
+
+
+def origin_tokens(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return [normalize(token) for token in re.split(r'[,/&·\s]+', value) if token.strip()]
+
+
+def whole_value(value: Optional[str]) -> List[str]:
+    return [normalize(value)] if value and value.strip() else []
+
+
+FACETS: Dict[str, Callable[[Coffee], List[str]]] = {
+    'tasting_notes': lambda coffee: [normalize(note) for note in coffee.tasting_notes or [] if note.strip()],
+    'origin': lambda coffee: origin_tokens(coffee.origin),
+    'process': lambda coffee: whole_value(coffee.process),
+    'variety': lambda coffee: split_tokens(coffee.variety),
+}
+
+
+def parse_altitude(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    if not value:
+        return None
+    numbers = [int(n.replace(',', '')) for n in ALTITUDE_NUMBER.findall(value)]
+    numbers = [n for n in numbers if 100 <= n <= 5000]
+    if not numbers:
+        return None
+    return min(numbers), max(numbers)
+
+
+class SortedRange:
+    def __init__(self):
+        self.keys: List[Tuple[float, int]] = []
+    
+    def add(self, value: float, doc: int):
+        insort(self.keys, (value, doc))
+    
+    def remove(self, value: float, doc: int):
+        i = bisect_left(self.keys, (value, doc))
+        if i < len(self.keys) and self.keys[i] == (value, doc):
+            del self.keys[i]
+    
+    def between(self, low: Optional[float], high: Optional[float]) -> Set[int]:
+        start = 0 if low is None else bisect_left(self.keys, (low, -1))
+        end = len(self.keys) if high is None else bisect_right(self.keys, (high, float('inf')))
+        return {doc for _, doc in self.keys[start:end]}
+
+
+@dataclass
+class SearchResult:
+    total: int
+    coffees: List[Coffee]
+    facets: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+class CatalogIndex:
+    def __init__(self):
+        self.docs: Dict[int, Coffee] = {}
+        self.doc_ids: Dict[str, int] = {}
+        self.doc_tokens: Dict[int, Dict[str, List[str]]] = {}
+        self.postings: Dict[str, Dict[str, Set[int]]] = {name: {} for name in FACETS}
+        self.price = SortedRange()
+        self.prices: Dict[int, int] = {}
+        self.altitude_low = SortedRange()
+        self.altitude: Dict[int, Tuple[int, int]] = {}
+        self._next_doc = 0
+    
+    @classmethod
+    def from_csv(cls, path: str) -> 'CatalogIndex':
+        index = cls()
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            index.add_all(Coffee.from_dict(row) for row in csv.DictReader(f))
+        return index
+    
+    def __len__(self) -> int:
+        return len(self.docs)
+    
+    def add_all(self, coffees: Iterable[Coffee]):
+        for coffee in coffees:
+            self.add(coffee)
+    
+    def add(self, coffee: Coffee) -> int:
+        key = product_id(coffee)
+        doc = self.doc_ids.get(key)
+        
+        if doc is None:
+            doc = self._next_doc
+            self._next_doc += 1
+            self.doc_ids[key] = doc
+        else:
+            self._unindex(doc)
+        
+        self.docs[doc] = coffee
+        tokens = {name: sorted(set(extract(coffee))) for name, extract in FACETS.items()}
+        self.doc_tokens[doc] = tokens
+        
+        for name, values in tokens.items():
+            postings = self.postings[name]
+            for value in values:
+                postings.setdefault(value, set()).add(doc)
+        
+        if coffee.price is not None:
+            self.price.add(coffee.price, doc)
+            self.prices[doc] = coffee.price
+        
+        altitude = parse_altitude(coffee.altitude)
+        if altitude:
+            self.altitude[doc] = altitude
+            self.altitude_low.add(altitude[0], doc)
+        
+        return doc
+    
+    def remove(self, coffee: Coffee):
+        doc = self.doc_ids.pop(product_id(coffee), None)
+        if doc is not None:
+            self._unindex(doc)
+            del self.docs[doc]
+    
+    def _unindex(self, doc: int):
+        for name, values in self.doc_tokens.pop(doc, {}).items():
+            postings = self.postings[name]
+            for value in values:
+                docs = postings.get(value)
+                if docs is None:
+                    continue
+                docs.discard(doc)
+                if not docs:
+                    del postings[value]
+        
+        price = self.prices.pop(doc, None)
+        if price is not None:
+            self.price.remove(price, doc)
+        
+        altitude = self.altitude.pop(doc, None)
+        if altitude:
+            self.altitude_low.remove(altitude[0], doc)
+    
+    def facet_postings(self, name: str) -> Dict[str, Set[int]]:
+        if name not in self.postings:
+            raise ValueError(f"Unknown facet {name!r}; expected one of {', '.join(FACETS)}")
+        return self.postings[name]
+    
+    def match(self, filters: Optional[Dict[str, Sequence[str]]] = None,
+              price: Optional[Range] = None, altitude: Optional[Range] = None) -> Set[int]:
+        candidates: List[Set[int]] = []
+        
+        for name, values in (filters or {}).items():
+            postings = self.facet_postings(name)
+            if len(values) == 1:
+                candidates.append(postings.get(normalize(values[0]), set()))
+                continue
+            matched: Set[int] = set()
+            for value in values:
+                matched |= postings.get(normalize(value), set())
+            candidates.append(matched)
+        
+        if candidates:
+            candidates.sort(key=len)
+            result = candidates[0]
+            for docs in candidates[1:]:
+                if not result:
+                    break
+                result = result & docs
+            result = set(result)
+        elif price is not None:
+            result = self.price.between(*price)
+            price = None
+        elif altitude is not None:
+            result = self.altitude_low.between(None, altitude[1])
+        else:
+            return set(self.docs)
+        
+        # Ranges are cheaper to check per document once the postings narrowed the set
+        if price is not None:
+            low, high = price
+            result = {
+                doc for doc in result
+                if self.prices.get(doc) is not None
+                and (low is None or self.prices[doc] >= low)
+                and (high is None or self.prices[doc] <= high)
+            }
+        
+        if altitude is not None:
+            low, high = altitude
+            result = {
+                doc for doc in result
+                if doc in self.altitude
+                and (low is None or self.altitude[doc][1] >= low)
+                and (high is None or self.altitude[doc][0] <= high)
+            }
+        
+        return result
+    
+    def facet_counts(self, docs: Set[int], facets: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, int]]:
+        counts: Dict[str, Dict[str, int]] = {}
+        
+        for name in facets or FACETS:
+            postings = self.facet_postings(name)
+            if len(docs) == len(self.docs):
+                counts[name] = {value: len(ids) for value, ids in postings.items()}
+                continue
+            
+            facet: Dict[str, int] = {}
+            for doc in docs:
+                for value in self.doc_tokens[doc][name]:
+                    facet[value] = facet.get(value, 0) + 1
+            counts[name] = facet
+        
+        return counts
+    
+    def search(self, filters: Optional[Dict[str, Sequence[str]]] = None,
+               price: Optional[Range] = None, altitude: Optional[Range] = None,
+               facets: Optional[Sequence[str]] = None, limit: int = 20) -> SearchResult:
+        docs = self.match(filters, price, altitude)
+        top = heapq.nsmallest(limit, docs) if limit else []
+        
+        return SearchResult(
+            total=len(docs),
+            coffees=[self.docs[doc] for doc in top],
+            facets=self.facet_counts(docs, facets)
+        )
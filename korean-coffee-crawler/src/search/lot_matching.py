@@ -0,0 +1,322 @@
+import csv
+import re
+import unicodedata
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from ..models import Coffee
+from .catalog_index import normalize
+
+
+HANGUL_FIRST = 0xAC00
+HANGUL_LAST = 0xD7A3
+# Revised Romanization of a syllable's initial, medial and final jamo; finals as they sound at a syllable's end
+INITIALS = ('g', 'kk', 'n', 'd', 'tt', 'r', 'm', 'b', 'pp', 's', 'ss', '', 'j', 'jj', 'ch', 'k', 't', 'p', 'h')
+MEDIALS = ('a', 'ae', 'ya', 'yae', 'eo', 'e', 'yeo', 'ye', 'o', 'wa', 'wae', 'oe', 'yo', 'u', 'wo', 'we', 'wi',
+           'yu', 'eu', 'ui', 'i')
+FINALS = ('', 'k', 'k', 'k', 'n', 'n', 'n', 't', 'l', 'k', 'm', 'l', 'l', 'l', 'p', 'l', 'm', 'p', 'p', 't', 't',
+          'ng', 't', 't', 'k', 't', 'p', 't')
+
+TOKEN = re.compile(r'[^\W_]+')
+WEIGHT = re.compile(r'^\d+(g|kg|그램|키로)?$')
+# Spellings that Korean transcription merges: ch/j/z all become ㅈ or ㅊ, f becomes ㅍ, th becomes ㅌ
+DIGRAPHS = (('ph', 'p'), ('th', 't'), ('sh', 's'), ('ch', 'J'), ('ts', 'J'), ('gh', 'g'), ('ck', 'k'),
+            ('qu', 'k'), ('x', 'ks'), ('j', 'J'), ('z', 'J'))
+CONSONANT_CLASSES = str.maketrans({'b': 'p', 'f': 'p', 'v': 'p', 'd': 't', 'g': 'k', 'c': 'k', 'q': 'k', 'r': 'l'})
+# An r after a vowel is not transcribed before a consonant (Yirgacheffe is 예가체프), or at the end as 르
+SILENT_R = re.compile(r'(?<=[aeiouy])r(?=[^aeiouy]|$)')
+TRAILING_REU = re.compile(r'(?<=[aeiou])reu(?![aeiou])')
+VOWELS = re.compile(r'[aeiouyhw]')
+REPEATS = re.compile(r'(.)\1+')
+
+NAME_STOPWORDS = {
+    'coffee', '커피', '원두', 'bean', 'beans', 'specialty', '스페셜티', 'single', '싱글', 'origin', '오리진',
+    '싱글오리진', 'blend', '블렌드', 'new', '신상', 'lot', '랏', '로트', 'grade', '등급', 'roasted', '드립백',
+}
+PROCESSES = {
+    'washed': ('washed', 'wet', '워시드', '워시', '수세식'),
+    'natural': ('natural', 'dry', '내추럴', '내츄럴', '건식'),
+    'honey': ('honey', 'pulped', '허니', '펄프드'),
+    'anaerobic': ('anaerobic', '무산소', '애너로빅', '아나에로빅'),
+    'wet hulled': ('hulled', 'basah', '웻헐', '길링바사'),
+}
+PROCESS_BITS = {name: 1 << i for i, name in enumerate(PROCESSES)}
+PROCESS_WORDS = {word: name for name, words in PROCESSES.items() for word in words}
+
+# Name similarity at which beans from two roasteries are reported as the same lot
+DEFAULT_THRESHOLD = 0.75
+# A conflicting variety keeps a pair only if the names agree almost exactly
+VARIETY_PENALTY = 0.8
+# Name score: whole transliterated tokens, and character n-grams of them for spellings that still differ
+TOKEN_WEIGHT = 0.5
+
+
+def romanize(text: str) -> str:
+    letters = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_FIRST <= code <= HANGUL_LAST:
+            initial, rest = divmod(code - HANGUL_FIRST, 21 * 28)
+            medial, final = divmod(rest, 28)
+            letters.append(INITIALS[initial] + MEDIALS[medial] + FINALS[final])
+        else:
+            letters.append(char)
+    return ''.join(letters)
+
+
+def fold(text: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def skeleton(token: str) -> str:
+    # Consonant outline shared by a Latin name and its Hangul transcription: Yirgacheffe and 예가체프 both give kJp
+    romanized = romanize(token)
+    if romanized != token:
+        token = TRAILING_REU.sub('', romanized)
+    token = fold(token)
+    for source, target in DIGRAPHS:
+        token = token.replace(source, target)
+    token = SILENT_R.sub('', token).translate(CONSONANT_CLASSES)
+    return REPEATS.sub(r'\1', VOWELS.sub('', token))
+
+
+def words(value: Optional[str]) -> List[str]:
+    return TOKEN.findall(normalize(value)) if value else []
+
+
+def phonetic_tokens(value: Optional[str]) -> List[str]:
+    tokens = []
+    for word in words(value):
+        if word in NAME_STOPWORDS or word in PROCESS_WORDS or WEIGHT.match(word):
+            continue
+        token = skeleton(word)
+        if token:
+            tokens.append(token)
+    return tokens
+
+
+def process_mask(coffee: Coffee) -> int:
+    mask = 0
+    for word in words(coffee.process) + words(coffee.coffee_name):
+        name = PROCESS_WORDS.get(word)
+        if name:
+            mask |= PROCESS_BITS[name]
+    return mask
+
+
+def char_ngrams(token: str) -> List[str]:
+    padded = f'^{token}$'
+    return [padded[i:i + n] for n in (2, 3) for i in range(len(padded) - n + 1)]
+
+
+@dataclass
+class LotRecord:
+    coffee: Coffee
+    tokens: List[str]
+    origin: Set[str]
+    variety: Set[str]
+    process: int
+
+
+@dataclass
+class LotCluster:
+    coffees: List[Coffee]
+    score: float
+    
+    @property
+    def roasteries(self) -> List[str]:
+        return sorted({coffee.roastery_name for coffee in self.coffees})
+
+
+class LotMatcher:
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, max_block: int = 50, batch_size: int = 50000):
+        self.threshold = threshold
+        self.max_block = max_block
+        self.batch_size = batch_size
+        self.records: List[LotRecord] = []
+        self.roastery_codes = np.zeros(0, dtype=np.int64)
+        self.stats: Dict[str, int] = {}
+    
+    @classmethod
+    def from_csv(cls, path: str, **options) -> 'LotMatcher':
+        matcher = cls(**options)
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            matcher.add(Coffee.from_dict(row) for row in csv.DictReader(f))
+        return matcher
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def add(self, coffees: Iterable[Coffee]):
+        for coffee in coffees:
+            origin = phonetic_tokens(coffee.origin)
+            tokens = phonetic_tokens(coffee.coffee_name)
+            tokens += [token for token in origin if token not in tokens]
+            self.records.append(LotRecord(
+                coffee=coffee,
+                tokens=tokens,
+                origin=set(origin),
+                variety=set(phonetic_tokens(coffee.variety)),
+                process=process_mask(coffee)
+            ))
+    
+    def blocking_keys(self, record: LotRecord) -> Set[str]:
+        tokens = sorted({token for token in record.tokens if len(token) >= 2})
+        keys = set(tokens)
+        keys.update(f'{a}+{b}' for a, b in combinations(tokens, 2))
+        if record.process:
+            keys.update(f'{token}|{record.process}' for token in tokens)
+        if record.origin and record.variety and record.process:
+            keys.add(f'{min(record.origin)}|{min(record.variety)}|{record.process}')
+        return keys
+    
+    def candidate_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        blocks: Dict[str, List[int]] = {}
+        for row, record in enumerate(self.records):
+            for key in self.blocking_keys(record):
+                blocks.setdefault(key, []).append(row)
+        
+        # Keys shared by too many beans (a country, a common variety) say little; a narrower key covers their pairs
+        left: List[np.ndarray] = []
+        right: List[np.ndarray] = []
+        oversized = 0
+        for rows in blocks.values():
+            if len(rows) < 2:
+                continue
+            if len(rows) > self.max_block:
+                oversized += 1
+                continue
+            members = np.array(rows, dtype=np.int64)
+            i, j = np.triu_indices(len(members), k=1)
+            left.append(members[i])
+            right.append(members[j])
+        
+        self.stats.update(records=len(self.records), blocks=len(blocks), oversized_blocks=oversized)
+        if not left:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        
+        roasteries: Dict[str, int] = {}
+        codes = np.array([roasteries.setdefault(r.coffee.roastery_name, len(roasteries)) for r in self.records])
+        self.roastery_codes = codes
+        left_rows, right_rows = np.concatenate(left), np.concatenate(right)
+        pairs = np.unique(left_rows * len(self.records) + right_rows)
+        left_rows, right_rows = np.divmod(pairs, len(self.records))
+        other = codes[left_rows] != codes[right_rows]
+        return left_rows[other], right_rows[other]
+    
+    def feature_matrix(self, features: List[List[str]], idf: bool = True) -> sp.csr_matrix:
+        vocabulary: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        for row in features:
+            for feature in set(row):
+                indices.append(vocabulary.setdefault(feature, len(vocabulary)))
+            indptr.append(len(indices))
+        
+        counts = sp.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr)),
+            shape=(len(features), len(vocabulary))
+        )
+        if not idf:
+            return counts
+        
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        weights = np.log((1 + len(features)) / (1 + document_frequency)).astype(np.float32) + 1
+        weighted = counts @ sp.diags(weights)
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sp.csr_matrix(sp.diags(1 / norms) @ weighted, dtype=np.float32)
+    
+    def rowwise(self, matrix: sp.csr_matrix, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        # Dot products of the paired rows only, in batches, never the full n x n product
+        result = np.empty(len(left), dtype=np.float32)
+        for start in range(0, len(left), self.batch_size):
+            end = start + self.batch_size
+            product = matrix[left[start:end]].multiply(matrix[right[start:end]])
+            result[start:end] = np.asarray(product.sum(axis=1)).ravel()
+        return result
+    
+    def score(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        tokens = self.feature_matrix([r.tokens for r in self.records])
+        grams = self.feature_matrix([[gram for token in r.tokens for gram in char_ngrams(token)]
+                                     for r in self.records])
+        scores = TOKEN_WEIGHT * self.rowwise(tokens, left, right) + (1 - TOKEN_WEIGHT) * self.rowwise(grams, left, right)
+        
+        # Different processing or origin means a different lot however alike the names are
+        process = np.array([r.process for r in self.records], dtype=np.int64)
+        scores[(process[left] != 0) & (process[right] != 0) & ((process[left] & process[right]) == 0)] = 0
+        
+        for attribute, penalty in (('origin', 0.0), ('variety', VARIETY_PENALTY)):
+            values = [getattr(r, attribute) for r in self.records]
+            known = np.array([bool(value) for value in values], dtype=bool)
+            overlap = self.rowwise(self.feature_matrix([list(value) for value in values], idf=False), left, right)
+            scores[known[left] & known[right] & (overlap == 0)] *= penalty
+        return scores
+    
+    def mutual_best(self, left: np.ndarray, right: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        # A roastery lists a lot once, so each bean keeps only its best match per other roastery, and only if
+        # that bean picks it back; this stops near misses from chaining distinct lots into one cluster
+        n = len(self.records)
+        source = np.concatenate([left, right])
+        target = np.concatenate([right, left])
+        target_roastery = self.roastery_codes[target]
+        order = np.lexsort((-np.concatenate([scores, scores]), target_roastery, source))
+        source, target, target_roastery = source[order], target[order], target_roastery[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (source[1:] != source[:-1]) | (target_roastery[1:] != target_roastery[:-1])
+        best = source[first] * n + target[first]
+        return np.isin(left * n + right, best) & np.isin(right * n + left, best)
+    
+    def clusters(self) -> List[LotCluster]:
+        left, right = self.candidate_pairs()
+        scores = self.score(left, right)
+        above = scores >= self.threshold
+        left, right, scores = left[above], right[above], scores[above]
+        matched = self.mutual_best(left, right, scores)
+        self.stats.update(candidates=int(len(above)), matches=int(matched.sum()))
+        
+        parent = list(range(len(self.records)))
+        
+        def find(row: int) -> int:
+            while parent[row] != row:
+                parent[row] = parent[parent[row]]
+                row = parent[row]
+            return row
+        
+        for a, b in zip(left[matched].tolist(), right[matched].tolist()):
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+        
+        edge_scores: Dict[int, List[float]] = {}
+        for a, score in zip(left[matched].tolist(), scores[matched].tolist()):
+            edge_scores.setdefault(find(a), []).append(score)
+        members: Dict[int, List[int]] = {root: [] for root in edge_scores}
+        for row in np.unique(np.concatenate([left[matched], right[matched]])).tolist():
+            members[find(row)].append(row)
+        
+        clusters = [
+            LotCluster([self.records[row].coffee for row in rows], float(np.mean(edge_scores[root])))
+            for root, rows in members.items()
+        ]
+        clusters.sort(key=lambda cluster: (-len(cluster.coffees), -cluster.score))
+        return clusters
+
+
+def write_clusters(clusters: List[LotCluster], path: str) -> int:
+    # One row per coffee in the saved-data columns, after the lot number, score and roastery count of its lot
+    columns = ['랏', '점수', '로스터리 수'] + list(Coffee('', '').to_dict())
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for number, cluster in enumerate(clusters, 1):
+            for coffee in cluster.coffees:
+                row = {'랏': number, '점수': round(cluster.score, 3), '로스터리 수': len(cluster.roasteries)}
+                row.update(coffee.to_dict())
+                writer.writerow(row)
+    return len(clusters)
@@ -0,0 +1,164 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from ..models import Coffee
+from ..utils.urls import product_id
+from .catalog_index import normalize, origin_tokens, whole_value
+
+
+ATTRIBUTE_WEIGHTS = {
+    'origin': 0.6,
+    'process': 0.4,
+    'roast': 0.3,
+}
+
+
+def coffee_features(coffee: Coffee) -> List[str]:
+    features = [f"note:{normalize(note)}" for note in coffee.tasting_notes or [] if note.strip()]
+    features += [f"origin:{token}" for token in origin_tokens(coffee.origin)]
+    features += [f"process:{value}" for value in whole_value(coffee.process)]
+    features += [f"roast:{value}" for value in whole_value(coffee.roast_level)]
+    return features
+
+
+class SimilarityModel:
+    def __init__(self, batch_size: int = 128):
+        self.batch_size = batch_size
+        self.coffees: List[Coffee] = []
+        self.rows: Dict[str, int] = {}
+        self.vocabulary: Dict[str, int] = {}
+        self.column_weights: List[float] = []
+        self.is_note = np.zeros(0, dtype=bool)
+        self.active = np.zeros(0, dtype=bool)
+        self.counts = sp.csr_matrix((0, 0), dtype=np.float32)
+        self.roasteries = np.zeros(0, dtype=np.int32)
+        self.roastery_ids: Dict[str, int] = {}
+        self._matrix: Optional[sp.csr_matrix] = None
+        self._transposed: Optional[sp.csr_matrix] = None
+    
+    def __len__(self) -> int:
+        return int(self.active.sum())
+    
+    def add(self, coffees: Iterable[Coffee]):
+        indptr = [0]
+        indices: List[int] = []
+        new_rows: List[Coffee] = []
+        replaced: List[int] = []
+        
+        for coffee in coffees:
+            key = product_id(coffee)
+            if key in self.rows:
+                replaced.append(self.rows[key])
+            self.rows[key] = len(self.coffees) + len(new_rows)
+            new_rows.append(coffee)
+            
+            for feature in set(coffee_features(coffee)):
+                column = self.vocabulary.get(feature)
+                if column is None:
+                    column = len(self.vocabulary)
+                    self.vocabulary[feature] = column
+                    kind = feature.split(':', 1)[0]
+                    self.column_weights.append(ATTRIBUTE_WEIGHTS.get(kind, 1.0))
+                indices.append(column)
+            indptr.append(len(indices))
+        
+        if not new_rows:
+            return
+        
+        width = len(self.vocabulary)
+        block = sp.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr)),
+            shape=(len(new_rows), width)
+        )
+        counts = self.counts
+        if counts.shape[1] < width:
+            counts = sp.csr_matrix((counts.data, counts.indices, counts.indptr), shape=(counts.shape[0], width))
+        self.counts = sp.vstack([counts, block], format='csr')
+        
+        self.is_note = np.array([feature.startswith('note:') for feature in self.vocabulary], dtype=bool)
+        self.active = np.concatenate([self.active, np.ones(len(new_rows), dtype=bool)])
+        self.active[replaced] = False
+        roastery_codes = [self.roastery_ids.setdefault(c.roastery_name, len(self.roastery_ids)) for c in new_rows]
+        self.roasteries = np.concatenate([self.roasteries, np.array(roastery_codes, dtype=np.int32)])
+        self.coffees.extend(new_rows)
+        self._matrix = None
+        self._transposed = None
+        
+        if (~self.active).sum() > len(self.coffees) // 4:
+            self._compact()
+    
+    def _compact(self):
+        keep = np.flatnonzero(self.active)
+        self.counts = self.counts[keep]
+        self.roasteries = self.roasteries[keep]
+        self.coffees = [self.coffees[i] for i in keep]
+        self.active = np.ones(len(keep), dtype=bool)
+        self.rows = {product_id(coffee): i for i, coffee in enumerate(self.coffees)}
+        self._matrix = None
+        self._transposed = None
+    
+    @property
+    def matrix(self) -> sp.csr_matrix:
+        if self._matrix is None:
+            self._matrix = self._build_matrix()
+        return self._matrix
+    
+    @property
+    def transposed(self) -> sp.csr_matrix:
+        # Kept until add() changes the matrix, so repeated lookups do not rebuild it
+        if self._transposed is None:
+            self._transposed = self.matrix.T.tocsr()
+        return self._transposed
+    
+    def _build_matrix(self) -> sp.csr_matrix:
+        counts = self.counts.multiply(self.active[:, None]).tocsr()
+        n_docs = max(int(self.active.sum()), 1)
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        
+        weights = np.array(self.column_weights, dtype=np.float32)
+        idf = np.log((1 + n_docs) / (1 + document_frequency)) + 1
+        weights[self.is_note] *= idf[self.is_note]
+        
+        weighted = counts @ sp.diags(weights.astype(np.float32))
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sp.csr_matrix(sp.diags(1 / norms) @ weighted, dtype=np.float32)
+    
+    def top_k(self, rows: Sequence[int], k: int = 10,
+              other_roasteries: bool = False) -> List[List[Tuple[Coffee, float]]]:
+        matrix = self.matrix
+        transposed = self.transposed
+        results: List[List[Tuple[Coffee, float]]] = []
+        
+        for start in range(0, len(rows), self.batch_size):
+            batch = np.asarray(rows[start:start + self.batch_size])
+            scores = (matrix[batch] @ transposed).toarray()
+            
+            scores[:, ~self.active] = -1
+            scores[np.arange(len(batch)), batch] = -1
+            if other_roasteries:
+                scores[self.roasteries[batch][:, None] == self.roasteries[None, :]] = -1
+            
+            n = min(k, scores.shape[1])
+            if n == 0:
+                results.extend([] for _ in batch)
+                continue
+            best = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            order = np.argsort(-best_scores, axis=1)
+            
+            for row_best, row_scores, row_order in zip(best, best_scores, order):
+                results.append([
+                    (self.coffees[row_best[i]], float(row_scores[i]))
+                    for i in row_order if row_scores[i] > 0
+                ])
+        
+        return results
+    
+    def similar_to(self, coffee: Coffee, k: int = 10, other_roasteries: bool = False) -> List[Tuple[Coffee, float]]:
+        key = product_id(coffee)
+        if key not in self.rows:
+            self.add([coffee])
+        return self.top_k([self.rows[key]], k, other_roasteries)[0]
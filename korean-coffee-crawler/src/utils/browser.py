@@ -0,0 +1,216 @@
+import glob
+import json
+import logging
+import os
+import shutil
+import signal
+import sys
+import time
+from typing import Dict, List, Optional
+
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+CHROME_NAMES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+MAC_CHROME = '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'
+# Where Selenium Manager and webdriver-manager leave the drivers they downloaded
+DRIVER_CACHES = (
+    '~/.cache/selenium/chromedriver/*/*/chromedriver*',
+    '~/.wdm/drivers/chromedriver/*/*/*/chromedriver*',
+    '~/.wdm/drivers/chromedriver/*/*/chromedriver*',
+)
+
+logger = logging.getLogger(__name__)
+
+
+def offline() -> bool:
+    return os.environ.get('COFFEE_CRAWLER_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+
+def is_executable(path: str) -> bool:
+    return os.path.isfile(path) and os.access(path, os.X_OK) and not path.endswith('.zip')
+
+
+def find_chrome() -> Optional[str]:
+    pinned = os.environ.get('CHROME_BINARY')
+    if pinned:
+        return pinned
+    for name in CHROME_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return MAC_CHROME if os.path.exists(MAC_CHROME) else None
+
+
+def resolve_chromedriver() -> Optional[str]:
+    # Pinned path, then PATH, then a driver cached by an earlier download; None lets Selenium Manager decide
+    pinned = os.environ.get('CHROMEDRIVER')
+    if pinned:
+        return pinned
+    
+    path = shutil.which('chromedriver')
+    if path:
+        return path
+    
+    cached = [path for pattern in DRIVER_CACHES for path in glob.glob(os.path.expanduser(pattern))
+              if is_executable(path)]
+    if cached:
+        return max(cached, key=os.path.getmtime)
+    
+    if offline():
+        return None
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+    except ImportError:
+        return None
+    return ChromeDriverManager().install()
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    # Resident memory in bytes of pid and all its descendants: chromedriver, Chrome and its renderers
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+    
+    if not os.path.isdir('/proc'):
+        return None
+    
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', encoding='utf-8') as f:
+                # The command name may contain spaces, so fields are counted from its closing parenthesis
+                parent = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+    
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total, found, stack = 0, False, [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f'/proc/{current}/statm', encoding='utf-8') as f:
+                total += int(f.read().split()[1]) * page_size
+            found = True
+        except (OSError, IndexError, ValueError):
+            pass
+        stack.extend(children.get(current, ()))
+    return total if found else None
+
+
+def driver_service():
+    from selenium.webdriver.chrome.service import Service
+    
+    path = resolve_chromedriver()
+    if path is None and offline():
+        # Selenium Manager only looks at its own cache when offline
+        os.environ.setdefault('SE_OFFLINE', 'true')
+    return Service(executable_path=path) if path else Service()
+
+
+class BrowserService:
+    def __init__(self, state_dir: str, port: int = 9222):
+        self.state_dir = state_dir
+        self.port = port
+        self.state_path = os.path.join(state_dir, 'service.json')
+        self.profile_dir = os.path.join(state_dir, 'profile')
+        self.logger = logging.getLogger(self.__class__.__name__)
+    
+    def read_state(self) -> Optional[dict]:
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def responding(self, address: str) -> bool:
+        # Imported here, like subprocess in start(), so importing the crawlers stays cheap
+        import urllib.request
+        
+        try:
+            with urllib.request.urlopen(f"http://{address}/json/version", timeout=0.5) as response:
+                return response.status == 200
+        except OSError:
+            return False
+    
+    def address(self) -> Optional[str]:
+        # Address of a running service to attach to; crawlers launch their own browser when this is None
+        state = self.read_state()
+        if state and self.responding(state['address']):
+            return state['address']
+        return None
+    
+    def start(self) -> str:
+        import subprocess
+        
+        running = self.address()
+        if running:
+            return running
+        
+        chrome = find_chrome()
+        if chrome is None:
+            raise RuntimeError("No Chrome or Chromium found; set CHROME_BINARY")
+        
+        os.makedirs(self.profile_dir, exist_ok=True)
+        address = f"127.0.0.1:{self.port}"
+        process = subprocess.Popen(
+            [
+                chrome,
+                '--headless=new',
+                f'--remote-debugging-port={self.port}',
+                '--remote-debugging-address=127.0.0.1',
+                f'--user-data-dir={self.profile_dir}',
+                '--no-sandbox',
+                '--disable-dev-shm-usage',
+                '--disable-gpu',
+                '--window-size=1920,1080',
+                f'--user-agent={USER_AGENT}',
+                '--no-first-run',
+                'about:blank',
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            # Detached, so the browser outlives the command that started it
+            start_new_session=sys.platform != 'win32'
+        )
+        
+        deadline = time.monotonic() + 15
+        while not self.responding(address):
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f"Browser did not start listening on {address}")
+            time.sleep(0.2)
+        
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump({'address': address, 'pid': process.pid, 'started_at': time.time()}, f)
+        self.logger.info(f"Browser service running at {address} (pid {process.pid})")
+        return address
+    
+    def stop(self) -> bool:
+        state = self.read_state()
+        if not state:
+            return False
+        try:
+            os.kill(state['pid'], signal.SIGTERM)
+        except OSError:
+            pass
+        os.remove(self.state_path)
+        self.logger.info(f"Stopped browser service at {state['address']}")
+        return True
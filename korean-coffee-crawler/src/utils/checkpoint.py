@@ -0,0 +1,193 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..models import Coffee
+
+
+class RoasteryProgress:
+    def __init__(self, journal: 'CrawlJournal', name: str):
+        self.journal = journal
+        self.name = name
+        self.frontier: List[str] = []
+        self.known = set()
+        self.completed = set()
+        self.discovery_complete = False
+        self.finished = False
+    
+    def pending_urls(self) -> List[str]:
+        return [url for url in self.frontier if url not in self.completed]
+    
+    def add_url(self, url: str) -> bool:
+        if url in self.known:
+            return False
+        self.known.add(url)
+        self.frontier.append(url)
+        self.journal.append({'t': 'url', 'r': self.name, 'u': url})
+        return True
+    
+    def add_skipped(self, url: str):
+        # Listed but not fetched this run (--skip-seen); known, so the product is not taken for unlisted
+        if url in self.known:
+            return
+        self.known.add(url)
+        self.journal.append({'t': 'skip', 'r': self.name, 'u': url})
+    
+    def mark_discovered(self):
+        self.discovery_complete = True
+        self.journal.append({'t': 'discovered', 'r': self.name}, flush=True)
+    
+    def mark_done(self, url: str, coffee: Optional[Coffee]):
+        self.completed.add(url)
+        self.journal.append({
+            't': 'done',
+            'r': self.name,
+            'u': url,
+            'c': coffee.to_record() if coffee else None
+        })
+    
+    def finish(self):
+        self.finished = True
+        self.journal.append({'t': 'finished', 'r': self.name}, flush=True)
+    
+    def _apply(self, record: Dict[str, Any]):
+        kind = record['t']
+        if kind == 'url':
+            if record['u'] not in self.known:
+                self.known.add(record['u'])
+                self.frontier.append(record['u'])
+        elif kind == 'skip':
+            self.known.add(record['u'])
+        elif kind == 'discovered':
+            self.discovery_complete = True
+        elif kind == 'done':
+            self.completed.add(record['u'])
+        elif kind == 'finished':
+            self.finished = True
+
+
+class CrawlJournal:
+    def __init__(self, checkpoint_dir: str = os.path.join("data", "checkpoints"),
+                 flush_interval: float = 5.0, flush_every: int = 20):
+        self.checkpoint_dir = checkpoint_dir
+        self.path = os.path.join(checkpoint_dir, "journal.jsonl")
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self.logger = logging.getLogger(self.__class__.__name__)
+        
+        self.run_id: Optional[str] = None
+        self.options: Dict[str, Any] = {}
+        self.completed = False
+        self.progress_by_name: Dict[str, RoasteryProgress] = {}
+        
+        self._file = None
+        self._valid_size = 0
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        
+        os.makedirs(checkpoint_dir, exist_ok=True)
+    
+    def start(self, options: Dict[str, Any]):
+        if self.load() and not self.completed:
+            self.logger.warning(f"Discarding unfinished checkpoint {self.run_id}; use --resume to continue it")
+        
+        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.options = options
+        self.completed = False
+        self.progress_by_name = {}
+        
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self.append({'t': 'start', 'run': self.run_id, 'options': options}, flush=True)
+    
+    def resume(self) -> bool:
+        if not self.load() or self.completed:
+            return False
+        
+        with open(self.path, 'r+b') as f:
+            f.truncate(self._valid_size)
+        
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self.logger.info(f"Resuming crawl {self.run_id} from {self.path}")
+        return True
+    
+    def load(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        
+        self.progress_by_name = {}
+        self.completed = False
+        
+        for record in self._read_records():
+            kind = record['t']
+            if kind == 'start':
+                self.run_id = record['run']
+                self.options = record.get('options', {})
+            elif kind == 'complete':
+                self.completed = True
+            else:
+                self.progress(record['r'])._apply(record)
+        
+        return self.run_id is not None
+    
+    def _read_records(self) -> Iterator[Dict[str, Any]]:
+        self._valid_size = 0
+        
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("incomplete line")
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    # A crash can leave the last line half written
+                    self.logger.warning("Ignoring truncated checkpoint record")
+                    return
+                
+                self._valid_size += len(line)
+                yield record
+    
+    def iter_saved_coffees(self, name: str) -> Iterator[Coffee]:
+        self.flush()
+        for record in self._read_records():
+            if record['t'] == 'done' and record['r'] == name and record.get('c'):
+                yield Coffee.from_record(record['c'])
+    
+    def progress(self, name: str) -> RoasteryProgress:
+        if name not in self.progress_by_name:
+            self.progress_by_name[name] = RoasteryProgress(self, name)
+        return self.progress_by_name[name]
+    
+    def append(self, record: Dict[str, Any], flush: bool = False):
+        if self._file is None:
+            return
+        
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._pending += 1
+        
+        if (flush or self._pending >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+    
+    def flush(self):
+        if self._file is None:
+            return
+        
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_flush = time.monotonic()
+    
+    def complete(self):
+        self.completed = True
+        self.append({'t': 'complete'}, flush=True)
+        self.close()
+    
+    def close(self):
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
@@ -1,11 +1,39 @@
+import csv
 import os
 from datetime import datetime
-from typing import List
-import pandas as pd
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 import logging
 
 from ..models import Coffee
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class CsvStreamWriter:
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.count = 0
+        self._file = None
+        self._writer = None
+    
+    def write(self, coffee: Coffee):
+        row = coffee.to_dict()
+        if self._writer is None:
+            self._file = open(self.filepath, 'w', newline='', encoding='utf-8-sig')
+            self._writer = csv.DictWriter(self._file, fieldnames=list(row.keys()))
+            self._writer.writeheader()
+        self._writer.writerow(row)
+        self._file.flush()
+        self.count += 1
+    
+    def close(self) -> Optional[str]:
+        if self._file is None:
+            return None
+        self._file.close()
+        self._file = None
+        return self.filepath
+
 
 class DataSaver:
     def __init__(self, base_dir: str = "data"):
@@ -29,6 +57,7 @@ class DataSaver:
         filepath = os.path.join(self.processed_dir, filename)
         
         try:
+            import pandas as pd
             df = pd.DataFrame([coffee.to_dict() for coffee in coffees])
             df.to_csv(filepath, index=False, encoding='utf-8-sig')
             self.logger.info(f"Saved {len(coffees)} coffee records to {filepath}")
@@ -49,27 +78,74 @@ class DataSaver:
         filepath = os.path.join(self.processed_dir, filename)
         
         try:
+            import pandas as pd
             df = pd.DataFrame([coffee.to_dict() for coffee in coffees])
+            self._write_excel(df, filepath)
+            self.logger.info(f"Saved {len(coffees)} coffee records to {filepath}")
+            return filepath
+        except Exception as e:
+            self.logger.error(f"Error saving to Excel: {e}")
+            return None
+    
+    def _write_excel(self, df: 'pd.DataFrame', filepath: str):
+        import pandas as pd
+        
+        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+            df.to_excel(writer, sheet_name='Coffee Data', index=False)
             
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='Coffee Data', index=False)
-                
-                worksheet = writer.sheets['Coffee Data']
-                
-                for idx, col in enumerate(df.columns):
-                    max_length = max(
-                        df[col].astype(str).map(len).max(),
-                        len(col)
-                    )
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[chr(65 + idx)].width = adjusted_width
+            worksheet = writer.sheets['Coffee Data']
             
-            self.logger.info(f"Saved {len(coffees)} coffee records to {filepath}")
+            for idx, col in enumerate(df.columns):
+                max_length = max(
+                    df[col].map(lambda value: len(str(value))).max(),
+                    len(col)
+                )
+                adjusted_width = min(max_length + 2, 50)
+                worksheet.column_dimensions[chr(65 + idx)].width = adjusted_width
+    
+    def csv_to_excel(self, csv_path: str) -> Optional[str]:
+        filepath = os.path.splitext(csv_path)[0] + '.xlsx'
+        
+        try:
+            from openpyxl import Workbook
+            from openpyxl.utils import get_column_letter
+            
+            # Two passes over the file keep memory flat: column widths first, then rows into a write-only sheet
+            with open(csv_path, newline='', encoding='utf-8-sig') as f:
+                reader = csv.reader(f)
+                header = next(reader)
+                widths = [len(name) for name in header]
+                for row in reader:
+                    widths = [max(width, len(cell)) for width, cell in zip(widths, row)]
+            
+            workbook = Workbook(write_only=True)
+            worksheet = workbook.create_sheet('Coffee Data')
+            for idx, width in enumerate(widths, 1):
+                worksheet.column_dimensions[get_column_letter(idx)].width = min(width + 2, 50)
+            
+            count = 0
+            with open(csv_path, newline='', encoding='utf-8-sig') as f:
+                reader = csv.reader(f)
+                worksheet.append(next(reader))
+                price_column = header.index('가격') if '가격' in header else None
+                for row in reader:
+                    # Cells as they were streamed to the CSV; only prices are numbers
+                    cells: List[Any] = [cell if cell != '' else None for cell in row]
+                    if price_column is not None and cells[price_column] is not None:
+                        cells[price_column] = int(cells[price_column])
+                    worksheet.append(cells)
+                    count += 1
+            
+            workbook.save(filepath)
+            self.logger.info(f"Saved {count} coffee records to {filepath}")
             return filepath
         except Exception as e:
             self.logger.error(f"Error saving to Excel: {e}")
             return None
     
+    def open_stream(self, filename: str) -> CsvStreamWriter:
+        return CsvStreamWriter(os.path.join(self.processed_dir, filename))
+    
     def save_by_roastery(self, coffees: List[Coffee]):
         if not coffees:
             self.logger.warning("No coffee data to save")
@@ -110,4 +186,50 @@ class DataSaver:
         csv_file = self.save_to_csv(coffees, f"all_coffee_data_{timestamp}.csv")
         excel_file = self.save_to_excel(coffees, f"all_coffee_data_{timestamp}.xlsx")
         
-        return [csv_file, excel_file] if csv_file and excel_file else []
\ No newline at end of file
+        return [csv_file, excel_file] if csv_file and excel_file else []
+
+
+class StreamingSink:
+    def __init__(self, saver: DataSaver, save_mode: str = 'both', excel: bool = True):
+        self.saver = saver
+        self.save_mode = save_mode
+        self.excel = excel
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.count = 0
+        self.combined: Optional[CsvStreamWriter] = None
+        self.by_roastery: Dict[str, CsvStreamWriter] = {}
+        
+        if save_mode in ['combined', 'both']:
+            self.combined = saver.open_stream(f"all_coffee_data_{self.timestamp}.csv")
+    
+    def write(self, coffee: Coffee):
+        if self.combined is not None:
+            self.combined.write(coffee)
+        
+        if self.save_mode in ['separate', 'both']:
+            writer = self.by_roastery.get(coffee.roastery_name)
+            if writer is None:
+                safe_name = coffee.roastery_name.replace(' ', '_').replace('/', '_')
+                writer = self.saver.open_stream(f"{safe_name}_{self.timestamp}.csv")
+                self.by_roastery[coffee.roastery_name] = writer
+            writer.write(coffee)
+        
+        self.count += 1
+    
+    def close(self) -> Dict[str, List[str]]:
+        saved = {'combined': [], 'separate': []}
+        
+        writers = [('combined', self.combined)] if self.combined is not None else []
+        writers += [('separate', writer) for writer in self.by_roastery.values()]
+        
+        for kind, writer in writers:
+            csv_file = writer.close()
+            if not csv_file:
+                continue
+            saved[kind].append(csv_file)
+            if self.excel:
+                excel_file = self.saver.csv_to_excel(csv_file)
+                if excel_file:
+                    saved[kind].append(excel_file)
+        
+        return saved
\ No newline at end of file
@@ -0,0 +1,173 @@
+import gzip
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+from xml.etree import ElementTree
+
+from .metrics import RoasteryMetrics
+from .urls import canonical_url, product_key
+
+
+# Sitemap indexes of larger shops split products from pages, blog posts and categories
+PRODUCT_SITEMAP = re.compile(r'product|goods|shop', re.IGNORECASE)
+
+
+def local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1].lower()
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    value = value.strip().replace('Z', '+00:00')
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = datetime.strptime(value[:10], '%Y-%m-%d')
+        except ValueError:
+            return None
+    # Compare in local time like the rest of the crawler's timestamps
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def parse_sitemap(content: bytes) -> Tuple[List[Tuple[str, Optional[datetime]]], List[str]]:
+    # Returns (page URLs with lastmod, child sitemap URLs); understands sitemaps, RSS and Atom feeds
+    if content[:2] == b'\x1f\x8b':
+        content = gzip.decompress(content)
+    
+    try:
+        root = ElementTree.fromstring(content)
+    except ElementTree.ParseError:
+        return [], []
+    
+    pages: List[Tuple[str, Optional[datetime]]] = []
+    children: List[str] = []
+    kind = local_name(root.tag)
+    
+    for entry in root.iter():
+        name = local_name(entry.tag)
+        if name not in ('url', 'sitemap', 'item', 'entry'):
+            continue
+        
+        fields: Dict[str, str] = {}
+        for child in entry:
+            child_name = local_name(child.tag)
+            if child_name == 'link' and child.get('href'):
+                fields.setdefault('link', child.get('href'))
+            elif child.text and child.text.strip():
+                fields.setdefault(child_name, child.text.strip())
+        
+        location = fields.get('loc') or fields.get('link')
+        if not location:
+            continue
+        lastmod = parse_lastmod(fields.get('lastmod') or fields.get('updated') or fields.get('pubdate'))
+        
+        if kind == 'sitemapindex' and name == 'sitemap':
+            children.append(location)
+        else:
+            pages.append((location, lastmod))
+    
+    return pages, children
+
+
+def robots_sitemaps(text: str) -> List[str]:
+    sitemaps = []
+    for line in text.splitlines():
+        key, _, value = line.partition(':')
+        if key.strip().lower() == 'sitemap' and value.strip():
+            sitemaps.append(value.strip())
+    return sitemaps
+
+
+def site_host(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def is_platform_product(url: str) -> bool:
+    return not product_key(url).startswith('url:')
+
+
+class SitemapDiscovery:
+    def __init__(self, base_url: str, session=None, metrics: Optional[RoasteryMetrics] = None,
+                 sitemaps: Optional[List[str]] = None, feeds: Optional[List[str]] = None,
+                 is_product: Callable[[str], bool] = is_platform_product,
+                 pace: Optional[Callable[[str], None]] = None,
+                 max_fetches: int = 20, timeout: float = 10):
+        self.base_url = base_url
+        self.metrics = metrics
+        self.sitemaps = sitemaps
+        self.feeds = feeds or []
+        self.is_product = is_product
+        # Waits for the host's next request slot, so sitemap fetches are spaced like page fetches
+        self.pace = pace
+        self.max_fetches = max_fetches
+        self.timeout = timeout
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.fetches = 0
+        
+        if session is None:
+            import requests
+            session = requests.Session()
+        self.session = session
+    
+    def fetch(self, url: str) -> Optional[bytes]:
+        self.fetches += 1
+        if self.pace is not None:
+            self.pace(url)
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except Exception as e:
+            if self.metrics:
+                self.metrics.record_fetch(time.perf_counter() - start, None)
+            self.logger.debug(f"No sitemap at {url}: {e}")
+            return None
+        
+        if self.metrics:
+            self.metrics.record_fetch(time.perf_counter() - start, len(response.content))
+        return response.content
+    
+    def candidates(self) -> List[str]:
+        if self.sitemaps is not None:
+            sitemaps = [urljoin(self.base_url, sitemap) for sitemap in self.sitemaps]
+        else:
+            robots = self.fetch(urljoin(self.base_url, '/robots.txt'))
+            sitemaps = robots_sitemaps(robots.decode('utf-8', 'replace')) if robots else []
+            sitemaps = sitemaps or [urljoin(self.base_url, '/sitemap.xml')]
+        return sitemaps + [urljoin(self.base_url, feed) for feed in self.feeds]
+    
+    def discover(self) -> Dict[str, Optional[datetime]]:
+        found: Dict[str, Optional[datetime]] = {}
+        host = site_host(self.base_url)
+        pending = self.candidates()
+        visited = set()
+        
+        while pending and self.fetches < self.max_fetches:
+            location = pending.pop(0)
+            if location in visited:
+                continue
+            visited.add(location)
+            
+            content = self.fetch(location)
+            if not content:
+                continue
+            pages, children = parse_sitemap(content)
+            
+            product_children = [child for child in children if PRODUCT_SITEMAP.search(child)]
+            pending.extend(product_children or children)
+            
+            for url, lastmod in pages:
+                url = urljoin(location, url)
+                if site_host(url) != host or not self.is_product(url):
+                    continue
+                url = canonical_url(url)
+                if url not in found or (lastmod and (found[url] is None or lastmod > found[url])):
+                    found[url] = lastmod
+        
+        return found
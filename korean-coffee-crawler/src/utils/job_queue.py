@@ -0,0 +1,456 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    roastery TEXT NOT NULL,
+    url TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_until REAL,
+    worker TEXT,
+    error TEXT,
+    UNIQUE (kind, roastery, url)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state, lease_until);
+
+CREATE TABLE IF NOT EXISTS results (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    roastery TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS host_slots (
+    host TEXT PRIMARY KEY,
+    next_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+STATES = ('pending', 'leased', 'done', 'failed')
+
+
+@dataclass
+class Job:
+    id: int
+    kind: str
+    roastery: str
+    url: str
+    attempts: int
+    worker: str
+
+
+class SQLiteJobQueue:
+    def __init__(self, db_path: str = os.path.join("data", "queue.db"),
+                 lease_seconds: float = 120.0, max_attempts: int = 3):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.logger = logging.getLogger(self.__class__.__name__)
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        # Autocommit mode; every state change runs in its own BEGIN IMMEDIATE transaction
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+    
+    @contextmanager
+    def _transaction(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+    
+    def push(self, kind: str, roastery: str, url: str = '') -> bool:
+        return self.push_many(kind, roastery, [url]) > 0
+    
+    def push_many(self, kind: str, roastery: str, urls: Iterable[str]) -> int:
+        with self._transaction():
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO jobs (kind, roastery, url) VALUES (?, ?, ?)",
+                [(kind, roastery, url) for url in urls]
+            )
+            return self.conn.total_changes - before
+    
+    def lease(self, worker: str) -> Optional[Job]:
+        now = time.time()
+        with self._transaction():
+            self._expire(now)
+            # Discovery jobs go first so detail jobs reach every worker as early as possible
+            row = self.conn.execute(
+                "SELECT id, kind, roastery, url, attempts FROM jobs WHERE state = 'pending' "
+                "ORDER BY kind = 'detail', id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET state = 'leased', attempts = attempts + 1, lease_until = ?, worker = ? "
+                "WHERE id = ?",
+                (now + self.lease_seconds, worker, row['id'])
+            )
+        return Job(row['id'], row['kind'], row['roastery'], row['url'], row['attempts'] + 1, worker)
+    
+    def renew(self, job: Job) -> bool:
+        # Extends a lease the worker still holds; False once the job expired and went to another worker
+        with self._transaction():
+            cursor = self.conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND state = 'leased' AND worker = ?",
+                (time.time() + self.lease_seconds, job.id, job.worker)
+            )
+        return bool(cursor.rowcount)
+    
+    def _expire(self, now: float):
+        self.conn.execute(
+            "UPDATE jobs SET state = 'failed', error = 'lease expired' "
+            "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?",
+            (now, self.max_attempts)
+        )
+        self.conn.execute(
+            "UPDATE jobs SET state = 'pending', worker = NULL WHERE state = 'leased' AND lease_until < ?",
+            (now,)
+        )
+    
+    def complete(self, job: Job, record: Optional[Dict[str, Any]] = None) -> bool:
+        with self._transaction():
+            # A worker whose lease ran out lost the job to someone else; drop its late result
+            cursor = self.conn.execute(
+                "UPDATE jobs SET state = 'done', lease_until = NULL, error = NULL "
+                "WHERE id = ? AND state = 'leased' AND worker = ?",
+                (job.id, job.worker)
+            )
+            if not cursor.rowcount:
+                return False
+            if record is not None:
+                self.conn.execute(
+                    "INSERT INTO results (job_id, roastery, record) VALUES (?, ?, ?)",
+                    (job.id, job.roastery, json.dumps(record, ensure_ascii=False))
+                )
+        return True
+    
+    def fail(self, job: Job, error: str) -> bool:
+        state = 'failed' if job.attempts >= self.max_attempts else 'pending'
+        with self._transaction():
+            cursor = self.conn.execute(
+                "UPDATE jobs SET state = ?, lease_until = NULL, worker = NULL, error = ? "
+                "WHERE id = ? AND state = 'leased' AND worker = ?",
+                (state, error, job.id, job.worker)
+            )
+        return bool(cursor.rowcount)
+    
+    def results(self, after: int = 0, limit: int = 500) -> List[Tuple[int, str, Dict[str, Any]]]:
+        rows = self.conn.execute(
+            "SELECT seq, roastery, record FROM results WHERE seq > ? ORDER BY seq LIMIT ?",
+            (after, limit)
+        )
+        return [(row['seq'], row['roastery'], json.loads(row['record'])) for row in rows]
+    
+    def counts(self) -> Dict[str, int]:
+        counts = {state: 0 for state in STATES}
+        for row in self.conn.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"):
+            counts[row['state']] = row['n']
+        return counts
+    
+    def active(self) -> int:
+        counts = self.counts()
+        return counts['pending'] + counts['leased']
+    
+    def discovered(self) -> List[str]:
+        rows = self.conn.execute("SELECT roastery FROM jobs WHERE kind = 'discover' AND state = 'done'")
+        return [row['roastery'] for row in rows]
+    
+    def detail_urls(self, roastery: str) -> List[str]:
+        # Every detail page discovery queued for the roastery, whether it was fetched or not
+        rows = self.conn.execute("SELECT url FROM jobs WHERE kind = 'detail' AND roastery = ?", (roastery,))
+        return [row['url'] for row in rows]
+    
+    def reserve_host(self, host: str, interval: float) -> float:
+        # Book the next free request slot for the host; returns how long the caller must wait for it
+        now = time.time()
+        with self._transaction():
+            row = self.conn.execute("SELECT next_at FROM host_slots WHERE host = ?", (host,)).fetchone()
+            slot = max(now, row['next_at']) if row else now
+            self.conn.execute(
+                "INSERT OR REPLACE INTO host_slots VALUES (?, ?)",
+                (host, slot + interval)
+            )
+        return slot - now
+    
+    def clear(self):
+        with self._transaction():
+            self.conn.execute("DELETE FROM jobs")
+            self.conn.execute("DELETE FROM results")
+            self.conn.execute("DELETE FROM host_slots")
+    
+    def close(self):
+        self.conn.close()
+
+
+LEASE_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local prefix, worker = ARGV[1], ARGV[2]
+local lease_seconds, max_attempts = tonumber(ARGV[3]), tonumber(ARGV[4])
+
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now)) do
+    redis.call('ZREM', KEYS[1], id)
+    local job = prefix .. ':job:' .. id
+    if tonumber(redis.call('HGET', job, 'attempts')) >= max_attempts then
+        redis.call('HSET', job, 'state', 'failed', 'error', 'lease expired')
+        redis.call('HINCRBY', KEYS[4], 'failed', 1)
+    else
+        redis.call('HSET', job, 'state', 'pending', 'worker', '')
+        if redis.call('HGET', job, 'kind') == 'discover' then
+            redis.call('RPUSH', KEYS[2], id)
+        else
+            redis.call('RPUSH', KEYS[3], id)
+        end
+    end
+end
+
+local id = redis.call('LPOP', KEYS[2])
+if not id then
+    id = redis.call('LPOP', KEYS[3])
+end
+if not id then
+    return false
+end
+
+local job = prefix .. ':job:' .. id
+redis.call('HINCRBY', job, 'attempts', 1)
+redis.call('HSET', job, 'state', 'leased', 'worker', worker)
+redis.call('ZADD', KEYS[1], now + lease_seconds, id)
+return id
+"""
+
+FINISH_SCRIPT = """
+local prefix, id, worker, state = ARGV[1], ARGV[2], ARGV[3], ARGV[4]
+local job = prefix .. ':job:' .. id
+if not redis.call('ZSCORE', KEYS[1], id) or redis.call('HGET', job, 'worker') ~= worker then
+    return 0
+end
+redis.call('ZREM', KEYS[1], id)
+
+if state == 'pending' then
+    redis.call('HSET', job, 'state', 'pending', 'worker', '', 'error', ARGV[5])
+    if redis.call('HGET', job, 'kind') == 'discover' then
+        redis.call('RPUSH', KEYS[2], id)
+    else
+        redis.call('RPUSH', KEYS[3], id)
+    end
+    return 1
+end
+
+redis.call('HSET', job, 'state', state, 'error', ARGV[5])
+redis.call('HINCRBY', KEYS[4], state, 1)
+if state == 'done' and redis.call('HGET', job, 'kind') == 'discover' then
+    redis.call('SADD', KEYS[6], redis.call('HGET', job, 'roastery'))
+end
+if ARGV[6] ~= '' then
+    redis.call('RPUSH', KEYS[5], ARGV[6])
+end
+return 1
+"""
+
+RENEW_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local prefix, id, worker, lease_seconds = ARGV[1], ARGV[2], ARGV[3], tonumber(ARGV[4])
+if not redis.call('ZSCORE', KEYS[1], id) or redis.call('HGET', prefix .. ':job:' .. id, 'worker') ~= worker then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + lease_seconds, id)
+return 1
+"""
+
+PUSH_SCRIPT = """
+local prefix, kind, roastery = ARGV[1], ARGV[2], ARGV[3]
+local added = 0
+for i = 4, #ARGV do
+    local url = ARGV[i]
+    if redis.call('SADD', KEYS[1], kind .. '|' .. roastery .. '|' .. url) == 1 then
+        local id = redis.call('INCR', KEYS[2])
+        redis.call('HSET', prefix .. ':job:' .. id, 'kind', kind, 'roastery', roastery, 'url', url,
+                   'state', 'pending', 'attempts', 0, 'worker', '')
+        redis.call('RPUSH', KEYS[3], id)
+        added = added + 1
+    end
+end
+return added
+"""
+
+# URLs per PUSH_SCRIPT call, so one discovery does not block Redis for long
+PUSH_BATCH = 500
+
+RESERVE_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local slot = tonumber(redis.call('GET', KEYS[1]) or '0')
+if slot < now then
+    slot = now
+end
+redis.call('SET', KEYS[1], tostring(slot + interval), 'PX', math.ceil((slot - now + interval) * 1000) + 60000)
+return tostring(slot - now)
+"""
+
+
+class RedisJobQueue:
+    def __init__(self, url: str = 'redis://localhost:6379/0', prefix: str = 'coffee_crawler',
+                 lease_seconds: float = 120.0, max_attempts: int = 3):
+        # Optional dependency, only needed when the queue is shared between machines
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("Redis queues need the redis package (pip install redis)")
+        
+        self.url = url
+        self.prefix = prefix
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.logger = logging.getLogger(self.__class__.__name__)
+        
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self._lease = self.redis.register_script(LEASE_SCRIPT)
+        self._finish = self.redis.register_script(FINISH_SCRIPT)
+        self._reserve = self.redis.register_script(RESERVE_SCRIPT)
+        self._renew = self.redis.register_script(RENEW_SCRIPT)
+        self._push = self.redis.register_script(PUSH_SCRIPT)
+    
+    def _key(self, *parts: str) -> str:
+        return ':'.join((self.prefix,) + parts)
+    
+    def _queue_keys(self) -> List[str]:
+        return [self._key('leased'), self._key('pending', 'discover'), self._key('pending', 'detail'),
+                self._key('counts'), self._key('results'), self._key('discovered')]
+    
+    def push(self, kind: str, roastery: str, url: str = '') -> bool:
+        return self.push_many(kind, roastery, [url]) > 0
+    
+    def push_many(self, kind: str, roastery: str, urls: Iterable[str]) -> int:
+        # Deduplication, job hash and queue entry in one script, so a dropped connection cannot mark a URL as
+        # queued without queueing it
+        urls = list(urls)
+        keys = [self._key('keys'), self._key('seq'), self._key('pending', kind)]
+        added = 0
+        for start in range(0, len(urls), PUSH_BATCH):
+            added += int(self._push(keys=keys, args=[self.prefix, kind, roastery] + urls[start:start + PUSH_BATCH]))
+        return added
+    
+    def lease(self, worker: str) -> Optional[Job]:
+        job_id = self._lease(keys=self._queue_keys()[:4],
+                             args=[self.prefix, worker, self.lease_seconds, self.max_attempts])
+        if not job_id:
+            return None
+        data = self.redis.hgetall(self._key('job', str(job_id)))
+        return Job(int(job_id), data['kind'], data['roastery'], data['url'], int(data['attempts']), worker)
+    
+    def renew(self, job: Job) -> bool:
+        return bool(self._renew(keys=[self._key('leased')],
+                                args=[self.prefix, job.id, job.worker, self.lease_seconds]))
+    
+    def complete(self, job: Job, record: Optional[Dict[str, Any]] = None) -> bool:
+        payload = json.dumps({'roastery': job.roastery, 'record': record}, ensure_ascii=False) if record else ''
+        return bool(self._finish(keys=self._queue_keys(),
+                                 args=[self.prefix, job.id, job.worker, 'done', '', payload]))
+    
+    def fail(self, job: Job, error: str) -> bool:
+        state = 'failed' if job.attempts >= self.max_attempts else 'pending'
+        return bool(self._finish(keys=self._queue_keys(),
+                                 args=[self.prefix, job.id, job.worker, state, error, '']))
+    
+    def results(self, after: int = 0, limit: int = 500) -> List[Tuple[int, str, Dict[str, Any]]]:
+        # Positions in the results list stand in for sequence numbers, starting at 1
+        items = self.redis.lrange(self._key('results'), after, after + limit - 1)
+        results = []
+        for offset, item in enumerate(items, after + 1):
+            data = json.loads(item)
+            results.append((offset, data['roastery'], data['record']))
+        return results
+    
+    def counts(self) -> Dict[str, int]:
+        finished = self.redis.hgetall(self._key('counts'))
+        return {
+            'pending': self.redis.llen(self._key('pending', 'discover')) + self.redis.llen(self._key('pending', 'detail')),
+            'leased': self.redis.zcard(self._key('leased')),
+            'done': int(finished.get('done', 0)),
+            'failed': int(finished.get('failed', 0)),
+        }
+    
+    def active(self) -> int:
+        counts = self.counts()
+        return counts['pending'] + counts['leased']
+    
+    def discovered(self) -> List[str]:
+        return sorted(self.redis.smembers(self._key('discovered')))
+    
+    def detail_urls(self, roastery: str) -> List[str]:
+        # Read from the deduplication set, which keeps every queued job whatever its state
+        prefix = f"detail|{roastery}|"
+        return [member[len(prefix):] for member in self.redis.sscan_iter(self._key('keys'), match=prefix + '*')]
+    
+    def reserve_host(self, host: str, interval: float) -> float:
+        return float(self._reserve(keys=[self._key('host', host)], args=[interval]))
+    
+    def clear(self):
+        keys = list(self.redis.scan_iter(match=f"{self.prefix}:*"))
+        if keys:
+            self.redis.delete(*keys)
+    
+    def close(self):
+        self.redis.close()
+
+
+def open_queue(location: str, **options):
+    if location.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisJobQueue(location, **options)
+    if location.startswith('sqlite:///'):
+        location = location[len('sqlite:///'):]
+    return SQLiteJobQueue(location, **options)
+
+
+class LocalHostSlots:
+    # In-process stand-in for a queue's host slots, for crawls that share no queue
+    def __init__(self):
+        self.next_at: Dict[str, float] = {}
+        self.lock = threading.Lock()
+    
+    def reserve_host(self, host: str, interval: float) -> float:
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_at.get(host, now))
+            self.next_at[host] = slot + interval
+        return slot - now
+
+
+class HostPacer:
+    def __init__(self, queue, interval: float = 1.0):
+        self.queue = queue
+        self.interval = interval
+    
+    def wait(self, url: str, interval: Optional[float] = None):
+        # interval: the host's own minimum spacing (robots.txt Crawl-delay), if longer than the default
+        host = urlparse(url).netloc.lower()
+        if not host:
+            return
+        delay = self.queue.reserve_host(host, max(self.interval, interval or 0))
+        if delay > 0:
+            time.sleep(delay)
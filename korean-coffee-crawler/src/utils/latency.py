@@ -0,0 +1,57 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+
+# Below this many samples a host keeps the fixed default timeout and is never hedged
+MIN_SAMPLES = 20
+DEFAULT_TIMEOUT = 10.0
+MIN_TIMEOUT = 3.0
+MAX_TIMEOUT = 30.0
+# Timeout as a multiple of the host's p99, so only requests far outside its usual range are given up on
+TIMEOUT_FACTOR = 4.0
+# Hedged duplicates may add at most this share of extra requests to a host
+HEDGE_BUDGET = 0.05
+
+
+class HostLatency:
+    def __init__(self, window: int = 200):
+        self.window = window
+        self.samples: Dict[str, Deque[float]] = {}
+        self.requests: Dict[str, int] = {}
+        self.hedges: Dict[str, int] = {}
+        # Sorted copies of the windows, rebuilt only after new samples arrive
+        self.sorted: Dict[str, List[float]] = {}
+    
+    def observe(self, host: str, seconds: float):
+        if host not in self.samples:
+            self.samples[host] = deque(maxlen=self.window)
+        self.samples[host].append(seconds)
+        self.requests[host] = self.requests.get(host, 0) + 1
+        self.sorted.pop(host, None)
+    
+    def percentile(self, host: str, q: float) -> Optional[float]:
+        samples = self.samples.get(host)
+        if not samples or len(samples) < MIN_SAMPLES:
+            return None
+        if host not in self.sorted:
+            self.sorted[host] = sorted(samples)
+        ordered = self.sorted[host]
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    
+    def timeout(self, host: str) -> float:
+        p99 = self.percentile(host, 0.99)
+        if p99 is None:
+            return DEFAULT_TIMEOUT
+        return min(MAX_TIMEOUT, max(MIN_TIMEOUT, p99 * TIMEOUT_FACTOR))
+    
+    def hedge_after(self, host: str) -> Optional[float]:
+        # Seconds after which a duplicate request is worth sending, or None when the host's budget is spent
+        p95 = self.percentile(host, 0.95)
+        if p95 is None:
+            return None
+        if self.hedges.get(host, 0) + 1 > HEDGE_BUDGET * self.requests.get(host, 0):
+            return None
+        return p95
+    
+    def record_hedge(self, host: str):
+        self.hedges[host] = self.hedges.get(host, 0) + 1
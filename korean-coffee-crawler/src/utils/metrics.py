@@ -0,0 +1,270 @@
+import json
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+
+T = TypeVar('T')
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PHASES = ('discovery', 'fetch', 'parse', 'wait', 'save')
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+    
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+    
+    def cumulative(self) -> List[Tuple[str, int]]:
+        bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+        running = 0
+        result = []
+        for bound, count in zip(bounds, self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+    
+    def quantile(self, q: float) -> Optional[float]:
+        # Upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return None
+        rank = q * self.count
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            if running >= rank:
+                return bound
+        return float('inf')
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': dict(self.cumulative()),
+        }
+
+
+class RoasteryMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.fetch_latency = Histogram()
+        self.seconds: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self.bytes_downloaded = 0
+        self.fetch_errors = 0
+        self.parsed = 0
+        self.failed = 0
+        self.saved = 0
+        self.structured_pages = 0
+        self.static_pages = 0
+        self.browser_pages = 0
+        self.browser_listings = 0
+        self.streamed_pages = 0
+        self.stream_refetches = 0
+        self.duplicate_urls = 0
+        self.seen_skipped = 0
+        self.robots_blocked = 0
+        self.driver_restarts = 0
+        self.browser_peak_rss = 0
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self.deferred = 0
+        self.recovered = 0
+    
+    def record_fetch(self, seconds: float, size: Optional[int]):
+        self.fetch_latency.observe(seconds)
+        self.seconds['fetch'] += seconds
+        if size is None:
+            self.fetch_errors += 1
+        else:
+            self.bytes_downloaded += size
+    
+    @contextmanager
+    def timer(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[phase] += time.perf_counter() - start
+    
+    def timed(self, items: Iterable[T], phase: str) -> Iterator[T]:
+        # Only the time spent producing each item counts, not the consumer's work in between
+        iterator = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.seconds[phase] += time.perf_counter() - start
+                return
+            self.seconds[phase] += time.perf_counter() - start
+            yield item
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'seconds': dict(self.seconds),
+            'fetch_latency': self.fetch_latency.to_dict(),
+            'pages_fetched': self.fetch_latency.count,
+            'bytes_downloaded': self.bytes_downloaded,
+            'fetch_errors': self.fetch_errors,
+            'parsed': self.parsed,
+            'failed': self.failed,
+            'saved': self.saved,
+            'structured_pages': self.structured_pages,
+            'static_pages': self.static_pages,
+            'browser_pages': self.browser_pages,
+            'browser_listings': self.browser_listings,
+            'streamed_pages': self.streamed_pages,
+            'stream_refetches': self.stream_refetches,
+            'duplicate_urls': self.duplicate_urls,
+            'seen_skipped': self.seen_skipped,
+            'robots_blocked': self.robots_blocked,
+            'driver_restarts': self.driver_restarts,
+            'browser_peak_rss': self.browser_peak_rss,
+            'hedged_requests': self.hedged_requests,
+            'hedge_wins': self.hedge_wins,
+            'deferred': self.deferred,
+            'recovered': self.recovered,
+            'escalation_rate': self.escalation_rate(),
+        }
+    
+    def escalation_rate(self) -> Optional[float]:
+        checked = self.static_pages + self.browser_pages
+        return self.browser_pages / checked if checked else None
+
+
+class CrawlMetrics:
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.started = time.perf_counter()
+        self.finalize_seconds = 0.0
+        self.roasteries: Dict[str, RoasteryMetrics] = {}
+    
+    def roastery(self, name: str) -> RoasteryMetrics:
+        if name not in self.roasteries:
+            self.roasteries[name] = RoasteryMetrics(name)
+        return self.roasteries[name]
+    
+    @contextmanager
+    def finalizing(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.finalize_seconds += time.perf_counter() - start
+    
+    def report(self) -> Dict[str, Any]:
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'duration_seconds': time.perf_counter() - self.started,
+            'finalize_seconds': self.finalize_seconds,
+            'roasteries': {name: metrics.to_dict() for name, metrics in self.roasteries.items()},
+        }
+    
+    def to_prometheus(self, report: Dict[str, Any]) -> str:
+        lines = [
+            '# HELP coffee_crawler_run_duration_seconds Wall time of the last crawl run.',
+            '# TYPE coffee_crawler_run_duration_seconds gauge',
+            f"coffee_crawler_run_duration_seconds {report['duration_seconds']:.3f}",
+            '# HELP coffee_crawler_last_run_timestamp_seconds When the last crawl run started.',
+            '# TYPE coffee_crawler_last_run_timestamp_seconds gauge',
+            f"coffee_crawler_last_run_timestamp_seconds {self.started_at.timestamp():.0f}",
+            '# HELP coffee_crawler_phase_seconds Time spent per crawl phase in the last run.',
+            '# TYPE coffee_crawler_phase_seconds gauge',
+        ]
+        
+        for name, metrics in self.roasteries.items():
+            for phase, seconds in metrics.seconds.items():
+                lines.append(f'coffee_crawler_phase_seconds{{roastery="{name}",phase="{phase}"}} {seconds:.3f}')
+        
+        lines += [
+            '# HELP coffee_crawler_fetch_seconds Page fetch latency in the last run.',
+            '# TYPE coffee_crawler_fetch_seconds histogram',
+        ]
+        for name, metrics in self.roasteries.items():
+            histogram = metrics.fetch_latency
+            for bound, count in histogram.cumulative():
+                lines.append(f'coffee_crawler_fetch_seconds_bucket{{roastery="{name}",le="{bound}"}} {count}')
+            lines.append(f'coffee_crawler_fetch_seconds_sum{{roastery="{name}"}} {histogram.total:.3f}')
+            lines.append(f'coffee_crawler_fetch_seconds_count{{roastery="{name}"}} {histogram.count}')
+        
+        lines += [
+            '# HELP coffee_crawler_bytes_downloaded Bytes downloaded in the last run.',
+            '# TYPE coffee_crawler_bytes_downloaded gauge',
+        ]
+        for name, metrics in self.roasteries.items():
+            lines.append(f'coffee_crawler_bytes_downloaded{{roastery="{name}"}} {metrics.bytes_downloaded}')
+        
+        lines += [
+            '# HELP coffee_crawler_pages Pages handled in the last run by outcome.',
+            '# TYPE coffee_crawler_pages gauge',
+        ]
+        for name, metrics in self.roasteries.items():
+            for result, value in (('parsed', metrics.parsed), ('failed', metrics.failed),
+                                  ('fetch_error', metrics.fetch_errors), ('saved', metrics.saved),
+                                  ('deferred', metrics.deferred), ('recovered', metrics.recovered)):
+                lines.append(f'coffee_crawler_pages{{roastery="{name}",result="{result}"}} {value}')
+        
+        lines += [
+            '# HELP coffee_crawler_hybrid_pages Detail pages of hybrid crawlers by how they were fetched.',
+            '# TYPE coffee_crawler_hybrid_pages gauge',
+        ]
+        for name, metrics in self.roasteries.items():
+            if metrics.static_pages or metrics.browser_pages:
+                lines.append(f'coffee_crawler_hybrid_pages{{roastery="{name}",fetch="static"}} {metrics.static_pages}')
+                lines.append(f'coffee_crawler_hybrid_pages{{roastery="{name}",fetch="browser"}} {metrics.browser_pages}')
+        
+        lines += [
+            '# HELP coffee_crawler_browser_peak_rss_bytes Largest resident memory seen for a crawler\'s browser.',
+            '# TYPE coffee_crawler_browser_peak_rss_bytes gauge',
+        ]
+        for name, metrics in self.roasteries.items():
+            if metrics.browser_peak_rss:
+                lines.append(f'coffee_crawler_browser_peak_rss_bytes{{roastery="{name}"}} {metrics.browser_peak_rss}')
+        
+        lines += [
+            '# HELP coffee_crawler_driver_restarts Browser restarts (recycled or crashed) in the last run.',
+            '# TYPE coffee_crawler_driver_restarts gauge',
+        ]
+        for name, metrics in self.roasteries.items():
+            if metrics.driver_restarts:
+                lines.append(f'coffee_crawler_driver_restarts{{roastery="{name}"}} {metrics.driver_restarts}')
+        
+        lines += [
+            '# HELP coffee_crawler_hedged_requests Duplicate requests sent for slow pages, and how many answered first.',
+            '# TYPE coffee_crawler_hedged_requests gauge',
+        ]
+        for name, metrics in self.roasteries.items():
+            if metrics.hedged_requests:
+                lines.append(f'coffee_crawler_hedged_requests{{roastery="{name}",result="sent"}} {metrics.hedged_requests}')
+                lines.append(f'coffee_crawler_hedged_requests{{roastery="{name}",result="won"}} {metrics.hedge_wins}')
+        
+        return '\n'.join(lines) + '\n'
+    
+    def write(self, directory: str) -> Tuple[str, str]:
+        os.makedirs(directory, exist_ok=True)
+        report = self.report()
+        
+        json_path = os.path.join(directory, f"crawl_report_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        
+        # The textfile collector may read at any moment, so swap the file in atomically
+        prom_path = os.path.join(directory, 'coffee_crawler.prom')
+        with open(prom_path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus(report))
+        os.replace(prom_path + '.tmp', prom_path)
+        
+        return json_path, prom_path
@@ -0,0 +1,153 @@
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models import Coffee
+from .urls import product_id
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    product_id TEXT PRIMARY KEY,
+    roastery TEXT NOT NULL,
+    coffee_name TEXT,
+    url TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    price INTEGER,
+    available INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_products_roastery ON products (roastery);
+
+CREATE TABLE IF NOT EXISTS price_changes (
+    product_id TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    price INTEGER,
+    available INTEGER,
+    PRIMARY KEY (product_id, changed_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_price_changes_changed_at ON price_changes (changed_at);
+"""
+
+
+class PriceHistory:
+    def __init__(self, db_path: str = os.path.join("data", "history.db"), commit_every: int = 100):
+        self.db_path = db_path
+        self.commit_every = commit_every
+        self.logger = logging.getLogger(self.__class__.__name__)
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        
+        self._state: Dict[str, Tuple[Optional[int], Optional[int]]] = {
+            row['product_id']: (row['price'], row['available'])
+            for row in self.conn.execute("SELECT product_id, price, available FROM products")
+        }
+        self._seen: Dict[str, Set[str]] = {}
+        self._uncommitted = 0
+        self.changes = 0
+    
+    def record(self, coffee: Coffee) -> bool:
+        pid = product_id(coffee)
+        seen_at = coffee.crawled_at.isoformat(timespec='seconds')
+        available = None if coffee.available is None else int(coffee.available)
+        self._seen.setdefault(coffee.roastery_name, set()).add(pid)
+        
+        previous = self._state.get(pid)
+        if previous is None:
+            self.conn.execute(
+                "INSERT INTO products VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (pid, coffee.roastery_name, coffee.coffee_name, coffee.url,
+                 seen_at, seen_at, coffee.price, available)
+            )
+            changed = True
+        else:
+            old_price, old_available = previous
+            if available is None:
+                # Reappearing in the catalog counts as being back on sale
+                available = 1 if old_available == 0 else old_available
+            changed = (coffee.price, available) != (old_price, old_available)
+            self.conn.execute(
+                "UPDATE products SET coffee_name = ?, url = ?, last_seen = ?, price = ?, available = ? "
+                "WHERE product_id = ?",
+                (coffee.coffee_name, coffee.url, seen_at, coffee.price, available, pid)
+            )
+        
+        if changed:
+            self._add_change(pid, seen_at, coffee.price, available)
+        
+        self._state[pid] = (coffee.price, available)
+        self._tick()
+        return changed
+    
+    def mark_unlisted(self, roastery: str, at: Optional[datetime] = None, seen: Optional[Set[str]] = None,
+                      listed: Iterable[str] = ()):
+        # seen replaces the products recorded by this process; listed adds products found without being recorded
+        if seen is None:
+            seen = self._seen.get(roastery, set())
+        seen = seen.union(listed)
+        changed_at = (at or datetime.now()).isoformat(timespec='seconds')
+        
+        rows = self.conn.execute(
+            "SELECT product_id, price FROM products WHERE roastery = ? AND IFNULL(available, 1) != 0",
+            (roastery,)
+        ).fetchall()
+        
+        for row in rows:
+            if row['product_id'] in seen:
+                continue
+            self.conn.execute("UPDATE products SET available = 0 WHERE product_id = ?", (row['product_id'],))
+            self._add_change(row['product_id'], changed_at, row['price'], 0)
+            self._state[row['product_id']] = (row['price'], 0)
+        
+        self.conn.commit()
+    
+    def _add_change(self, pid: str, changed_at: str, price: Optional[int], available: Optional[int]):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO price_changes VALUES (?, ?, ?, ?)",
+            (pid, changed_at, price, available)
+        )
+        self.changes += 1
+    
+    def _tick(self):
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.conn.commit()
+            self._uncommitted = 0
+    
+    def commit(self):
+        self.conn.commit()
+        self._uncommitted = 0
+    
+    def history(self, pid: str) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT changed_at, price, available FROM price_changes WHERE product_id = ? ORDER BY changed_at",
+            (pid,)
+        )
+        return [dict(row) for row in rows]
+    
+    def changed_since(self, since: datetime, roastery: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = (
+            "SELECT c.product_id, p.roastery, p.coffee_name, p.url, c.changed_at, c.price, c.available "
+            "FROM price_changes c JOIN products p ON p.product_id = c.product_id "
+            "WHERE c.changed_at >= ?"
+        )
+        params: List[Any] = [since.isoformat(timespec='seconds')]
+        
+        if roastery:
+            query += " AND p.roastery = ?"
+            params.append(roastery)
+        
+        rows = self.conn.execute(query + " ORDER BY c.changed_at", params)
+        return [dict(row) for row in rows]
+    
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
@@ -0,0 +1,133 @@
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Set
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deferred (
+    roastery TEXT NOT NULL,
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    first_failed_at REAL NOT NULL,
+    last_failed_at REAL NOT NULL,
+    dead INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (roastery, url)
+) WITHOUT ROWID;
+"""
+
+# Retries after the main pass (in this run and later ones) before a URL counts as a persistent failure
+MAX_ATTEMPTS = 3
+# Failures that no retry can fix: the page is gone, or robots.txt forbids it
+PERMANENT = ('gone',)
+NOT_DEFERRED = ('robots',)
+
+
+def classify_error(error: Exception) -> str:
+    # Imported here so the CLI can open the queue without loading requests; fetching has loaded it already
+    import requests
+    
+    if isinstance(error, requests.Timeout):
+        return 'timeout'
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        if status in (404, 410):
+            return 'gone'
+        if status == 429 or status >= 500:
+            return 'server'
+        return 'http'
+    if isinstance(error, requests.ConnectionError):
+        return 'network'
+    # Selenium exceptions, matched by name so this module does not import selenium
+    name = type(error).__name__
+    if name == 'TimeoutException':
+        return 'timeout'
+    if name.endswith(('WebDriverException', 'SessionIdException')):
+        return 'browser'
+    return 'error'
+
+
+class RetryQueue:
+    def __init__(self, db_path: str = os.path.join("data", "retry.db")):
+        self.db_path = db_path
+        self.logger = logging.getLogger(self.__class__.__name__)
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        # Queued URLs per roastery, so successful pages in the main pass cost no query
+        self._queued: Dict[str, Set[str]] = {}
+    
+    def queued(self, roastery: str) -> Set[str]:
+        if roastery not in self._queued:
+            self._queued[roastery] = {
+                row['url'] for row in self.conn.execute("SELECT url FROM deferred WHERE roastery = ?", (roastery,))
+            }
+        return self._queued[roastery]
+    
+    def defer(self, roastery: str, url: str, kind: str, error: Optional[str]) -> bool:
+        if kind in NOT_DEFERRED:
+            return False
+        now = time.time()
+        dead = int(kind in PERMANENT)
+        self.conn.execute(
+            """
+            INSERT INTO deferred (roastery, url, kind, error, first_failed_at, last_failed_at, dead)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (roastery, url) DO UPDATE SET
+                kind = excluded.kind, error = excluded.error,
+                last_failed_at = excluded.last_failed_at, dead = MAX(dead, excluded.dead)
+            """,
+            (roastery, url, kind, error, now, now, dead)
+        )
+        self.conn.commit()
+        self.queued(roastery).add(url)
+        return True
+    
+    def due(self, roastery: str) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT url, kind, attempts FROM deferred WHERE roastery = ? AND dead = 0 ORDER BY first_failed_at",
+            (roastery,)
+        )
+        return [dict(row) for row in rows]
+    
+    def retried(self, roastery: str, url: str, kind: str, error: Optional[str]):
+        if kind in NOT_DEFERRED:
+            self.resolve(roastery, url)
+            return
+        self.conn.execute(
+            """
+            UPDATE deferred SET kind = ?, error = ?, attempts = attempts + 1, last_failed_at = ?,
+                dead = (attempts + 1 >= ? OR ?)
+            WHERE roastery = ? AND url = ?
+            """,
+            (kind, error, time.time(), MAX_ATTEMPTS, int(kind in PERMANENT), roastery, url)
+        )
+        self.conn.commit()
+    
+    def resolve(self, roastery: str, url: str):
+        # Also clears persistent failures, should the page come back
+        queued = self.queued(roastery)
+        if url not in queued:
+            return
+        queued.discard(url)
+        self.conn.execute("DELETE FROM deferred WHERE roastery = ? AND url = ?", (roastery, url))
+        self.conn.commit()
+    
+    def failures(self, roastery: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM deferred WHERE dead = 1"
+        params: tuple = ()
+        if roastery:
+            query += " AND roastery = ?"
+            params = (roastery,)
+        return [dict(row) for row in self.conn.execute(query + " ORDER BY roastery, last_failed_at", params)]
+    
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,192 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .metrics import RoasteryMetrics
+
+
+ROBOTS_TTL = 24 * 3600
+# After a failed robots.txt fetch (5xx or unreachable) with nothing cached, nothing is crawled until it is
+# asked for again this much later
+RETRY_TTL = 3600
+
+
+def parse_robots(text: str, agent: str) -> Dict[str, Any]:
+    # Returns the rules of the most specific group for agent (else '*'), plus Sitemap lines
+    groups: List[Tuple[List[str], List[Tuple[bool, str]], Optional[float]]] = []
+    sitemaps: List[str] = []
+    agents: List[str] = []
+    rules: List[Tuple[bool, str]] = []
+    delay: Optional[float] = None
+    in_rules = False
+    
+    for line in text.splitlines():
+        key, _, value = line.split('#', 1)[0].partition(':')
+        key, value = key.strip().lower(), value.strip()
+        
+        if key == 'user-agent':
+            if in_rules:
+                groups.append((agents, rules, delay))
+                agents, rules, delay, in_rules = [], [], None, False
+            agents.append(value.lower())
+        elif key in ('allow', 'disallow'):
+            in_rules = True
+            if value:
+                rules.append((key == 'allow', value))
+        elif key == 'crawl-delay':
+            in_rules = True
+            try:
+                delay = float(value)
+            except ValueError:
+                pass
+        elif key == 'sitemap' and value:
+            sitemaps.append(value)
+    if agents:
+        groups.append((agents, rules, delay))
+    
+    agent = agent.lower()
+    chosen = None
+    for names, group_rules, group_delay in groups:
+        if any(name != '*' and name in agent for name in names):
+            chosen = (group_rules, group_delay)
+            break
+        if chosen is None and '*' in names:
+            chosen = (group_rules, group_delay)
+    
+    group_rules, group_delay = chosen or ([], None)
+    return {'rules': group_rules, 'crawl_delay': group_delay, 'sitemaps': sitemaps}
+
+
+class RobotsRules:
+    def __init__(self, rules: List[Tuple[bool, str]], crawl_delay: Optional[float] = None,
+                 sitemaps: Optional[List[str]] = None, unavailable: bool = False):
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps or []
+        # Set when robots.txt could not be fetched; the rules then disallow everything
+        self.unavailable = unavailable
+        # Plain path prefixes go into a character trie, so a check walks the path once however many rules there are
+        self.trie: Dict[str, Any] = {}
+        patterns = []
+        
+        for allow, path in rules:
+            if '*' in path or path.endswith('$'):
+                anchored = path.endswith('$')
+                body = '.*'.join(re.escape(part) for part in path.rstrip('$').split('*'))
+                patterns.append((len(path), allow, body + ('$' if anchored else '')))
+                continue
+            node = self.trie
+            for char in path:
+                node = node.setdefault(char, {})
+            # Allow wins over Disallow for the same path
+            node[''] = node.get('', False) or allow
+        
+        self.patterns = [(length, allow, re.compile(pattern)) for length, allow, pattern in patterns]
+    
+    def allowed(self, url: str) -> bool:
+        parsed = urlparse(url)
+        path = (parsed.path or '/') + (f'?{parsed.query}' if parsed.query else '')
+        
+        best_length, verdict = -1, True
+        node = self.trie
+        if '' in node:
+            best_length, verdict = 0, node['']
+        for depth, char in enumerate(path, 1):
+            node = node.get(char)
+            if node is None:
+                break
+            if '' in node:
+                best_length, verdict = depth, node['']
+        
+        # The longest matching rule wins; wildcard rules are measured by their pattern length
+        for length, allow, pattern in self.patterns:
+            if (length > best_length or (length == best_length and allow)) and pattern.match(path):
+                best_length, verdict = length, allow
+        return verdict
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RobotsRules':
+        return cls([tuple(rule) for rule in data['rules']], data.get('crawl_delay'), data.get('sitemaps'),
+                   data.get('unavailable', False))
+
+
+class RobotsCache:
+    def __init__(self, path: Optional[str] = None, session=None, agent: str = '*', ttl: float = ROBOTS_TTL,
+                 timeout: float = 10):
+        self.path = path
+        self.agent = agent
+        self.ttl = ttl
+        self.timeout = timeout
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.rules: Dict[str, RobotsRules] = {}
+        
+        if session is None:
+            import requests
+            session = requests.Session()
+        # Crawlers pass their own session so robots.txt is requested with the crawler's User-Agent
+        self.session = session
+        
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Ignoring unreadable robots cache {path}: {e}")
+    
+    def for_url(self, url: str, metrics: Optional[RoasteryMetrics] = None, session=None) -> RobotsRules:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme or 'https'}://{parsed.netloc.lower()}"
+        
+        entry = self.entries.get(origin)
+        if entry is None or entry['expires'] <= time.time():
+            entry = self.fetch(origin, entry, metrics, session or self.session)
+            self.entries[origin] = entry
+            self.rules.pop(origin, None)
+            self.save()
+        
+        if origin not in self.rules:
+            self.rules[origin] = RobotsRules.from_dict(entry)
+        return self.rules[origin]
+    
+    def fetch(self, origin: str, stale: Optional[Dict[str, Any]], metrics: Optional[RoasteryMetrics],
+              session) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            response = session.get(f"{origin}/robots.txt", timeout=self.timeout)
+            if metrics:
+                metrics.record_fetch(time.perf_counter() - start, len(response.content))
+        except Exception as e:
+            if metrics:
+                metrics.record_fetch(time.perf_counter() - start, None)
+            response = None
+            self.logger.warning(f"Could not fetch {origin}/robots.txt: {e}")
+        
+        if response is not None and response.status_code < 500:
+            # A missing robots.txt (4xx) allows everything
+            text = response.text if response.ok else ''
+            entry = parse_robots(text, self.agent)
+            entry['expires'] = time.time() + self.ttl
+            return entry
+        
+        if stale is not None:
+            return dict(stale, expires=time.time() + RETRY_TTL)
+        # A server error may be hiding rules that forbid crawling, so everything is disallowed until the retry
+        self.logger.warning(f"No robots.txt for {origin}; not crawling it for {RETRY_TTL // 60} minutes")
+        return {'rules': [(False, '/')], 'crawl_delay': None, 'sitemaps': [], 'unavailable': True,
+                'expires': time.time() + RETRY_TTL}
+    
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        # Written to a temporary file first so concurrent workers never read a half-written cache
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
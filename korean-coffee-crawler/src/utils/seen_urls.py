@@ -0,0 +1,79 @@
+import hashlib
+import logging
+import sqlite3
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Optional, Set
+
+from .urls import canonical_url
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_urls (
+    hash INTEGER PRIMARY KEY,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# Older fetches are dropped when the store is opened so the file stays bounded
+RETENTION = 30 * 24 * 3600
+
+
+def url_hash(url: str) -> int:
+    # 64-bit digest of the canonical URL; collisions are negligible at a shop catalogue's scale
+    digest = hashlib.blake2b(canonical_url(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class SeenURLs:
+    def __init__(self, path: Optional[str] = None, window: Optional[float] = None, flush_every: int = 100):
+        self.window = window
+        self.flush_every = flush_every
+        self.logger = logging.getLogger(self.__class__.__name__)
+        # Detail URLs handed out in this run, shared by every crawler that uses this store
+        self.claimed: Set[int] = set()
+        # Hashes fetched within the window by earlier runs, sorted for bisect (8 bytes per URL)
+        self.recent = array('q')
+        self.fetched: Dict[int, float] = {}
+        self.conn: Optional[sqlite3.Connection] = None
+        
+        if path:
+            self.conn = sqlite3.connect(path)
+            self.conn.executescript(SCHEMA)
+            self.conn.execute('DELETE FROM seen_urls WHERE fetched_at < ?', (time.time() - RETENTION,))
+            self.conn.commit()
+            if window:
+                rows = self.conn.execute('SELECT hash FROM seen_urls WHERE fetched_at >= ? ORDER BY hash',
+                                         (time.time() - window,))
+                self.recent = array('q', (row[0] for row in rows))
+                self.logger.info(f"Skipping {len(self.recent)} detail URLs fetched in the last {window / 3600:g}h")
+    
+    def fetched_recently(self, key: int) -> bool:
+        index = bisect_left(self.recent, key)
+        return index < len(self.recent) and self.recent[index] == key
+    
+    def claim(self, url: str) -> bool:
+        key = url_hash(url)
+        if key in self.claimed or self.fetched_recently(key):
+            return False
+        self.claimed.add(key)
+        return True
+    
+    def mark_fetched(self, url: str):
+        self.fetched[url_hash(url)] = time.time()
+        if len(self.fetched) >= self.flush_every:
+            self.flush()
+    
+    def flush(self):
+        if self.conn is not None and self.fetched:
+            self.conn.executemany('INSERT OR REPLACE INTO seen_urls (hash, fetched_at) VALUES (?, ?)',
+                                  self.fetched.items())
+            self.conn.commit()
+        self.fetched.clear()
+    
+    def close(self):
+        self.flush()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
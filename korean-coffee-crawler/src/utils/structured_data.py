@@ -0,0 +1,155 @@
+import html as htmllib
+import json
+import re
+from typing import Any, Dict, Iterator, Optional
+
+
+JSON_LD = re.compile(
+    r'<script[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+META_TAG = re.compile(r'<meta\s[^>]*>', re.IGNORECASE)
+TAG_ATTR = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+# Cafe24 and Godomall product pages declare the product as inline script variables
+INLINE_VAR = re.compile(
+    r'var\s+(product_name|product_price|sSoldOut)\s*=\s*(?:"((?:\\.|[^"\\])*)"|\'((?:\\.|[^\'\\])*)\')'
+)
+GODOMALL_FIELD = re.compile(r'"(goodsNm|goodsPrice|soldOutFl)"\s*:\s*"((?:\\.|[^"\\])*)"')
+JS_ESCAPE = re.compile(r'\\(.)', re.DOTALL)
+
+IN_STOCK = ('instock', 'in stock', 'limitedavailability', 'onlineonly', 'preorder', 'presale')
+OUT_OF_STOCK = ('outofstock', 'out of stock', 'oos', 'soldout', 'sold out', 'discontinued')
+
+
+def parse_price(value: Any) -> Optional[int]:
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) if value > 0 else None
+    digits = re.sub(r'[^\d.]', '', str(value))
+    try:
+        price = int(float(digits))
+    except ValueError:
+        return None
+    return price if price > 0 else None
+
+
+def parse_availability(value: Any) -> Optional[bool]:
+    if not isinstance(value, str):
+        return None
+    value = value.rsplit('/', 1)[-1].strip().lower()
+    if value in IN_STOCK:
+        return True
+    if value in OUT_OF_STOCK:
+        return False
+    return None
+
+
+def json_ld_products(node: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(node, list):
+        for item in node:
+            yield from json_ld_products(item)
+    elif isinstance(node, dict):
+        kind = node.get('@type')
+        kinds = kind if isinstance(kind, list) else [kind]
+        if 'Product' in kinds or 'ProductGroup' in kinds:
+            yield node
+        if '@graph' in node:
+            yield from json_ld_products(node['@graph'])
+
+
+def from_json_ld(html: str) -> Dict[str, Any]:
+    found: Dict[str, Any] = {}
+    for match in JSON_LD.finditer(html):
+        try:
+            data = json.loads(match.group(1).strip())
+        except ValueError:
+            continue
+        
+        for product in json_ld_products(data):
+            if isinstance(product.get('name'), str):
+                found.setdefault('coffee_name', htmllib.unescape(product['name']).strip())
+            
+            offers = product.get('offers')
+            for offer in offers if isinstance(offers, list) else [offers]:
+                if not isinstance(offer, dict):
+                    continue
+                price = parse_price(offer.get('price', offer.get('lowPrice')))
+                if price:
+                    found.setdefault('price', price)
+                available = parse_availability(offer.get('availability'))
+                if available is not None:
+                    found.setdefault('available', available)
+    return found
+
+
+def from_meta(html: str) -> Dict[str, Any]:
+    meta: Dict[str, str] = {}
+    for tag in META_TAG.finditer(html):
+        attrs = {name.lower(): double if double is not None else single
+                 for name, double, single in TAG_ATTR.findall(tag.group(0))}
+        key = (attrs.get('property') or attrs.get('name') or '').lower()
+        if key.startswith(('og:', 'product:')) and 'content' in attrs:
+            meta.setdefault(key, htmllib.unescape(attrs['content']).strip())
+    
+    found: Dict[str, Any] = {}
+    title = meta.get('og:title')
+    if title:
+        # Some shops append their name ("Product - Shop"); only strip it when og:site_name confirms it
+        site = meta.get('og:site_name')
+        for separator in (' - ', ' | ', ' :: '):
+            if site and title.endswith(separator + site):
+                title = title[:-len(separator + site)]
+        found['coffee_name'] = title
+    
+    price = parse_price(meta.get('product:price:amount') or meta.get('og:price:amount'))
+    if price:
+        found['price'] = price
+    
+    available = parse_availability(meta.get('product:availability') or meta.get('og:availability'))
+    if available is not None:
+        found['available'] = available
+    return found
+
+
+def decode_js_string(value: str) -> str:
+    # Single-quoted JS strings escape their quote as \', which JSON does not know
+    value = JS_ESCAPE.sub(lambda match: "'" if match.group(1) == "'" else match.group(0), value)
+    try:
+        return json.loads(f'"{value}"')
+    except ValueError:
+        return value
+
+
+def from_inline_vars(html: str) -> Dict[str, Any]:
+    found: Dict[str, Any] = {}
+    values: Dict[str, str] = {}
+    for match in INLINE_VAR.finditer(html):
+        raw = match.group(2) if match.group(2) is not None else match.group(3)
+        values.setdefault(match.group(1), decode_js_string(raw))
+    for match in GODOMALL_FIELD.finditer(html):
+        values.setdefault(match.group(1), decode_js_string(match.group(2)))
+    
+    name = values.get('product_name') or values.get('goodsNm')
+    if name:
+        found['coffee_name'] = htmllib.unescape(name).strip()
+    
+    price = parse_price(values.get('product_price') or values.get('goodsPrice'))
+    if price:
+        found['price'] = price
+    
+    sold_out = values.get('sSoldOut') or values.get('soldOutFl')
+    if sold_out in ('T', 'F', 'y', 'n'):
+        found['available'] = sold_out in ('F', 'n')
+    return found
+
+
+def extract_structured(html: str) -> Dict[str, Any]:
+    # Regex scans over the raw page, so no DOM is built; earlier sources win
+    found: Dict[str, Any] = {}
+    for source in (from_json_ld, from_inline_vars, from_meta):
+        for key, value in source(html).items():
+            if value not in (None, ''):
+                found.setdefault(key, value)
+    return found
@@ -0,0 +1,54 @@
+import re
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlparse, urlunparse
+
+from ..models import Coffee
+
+
+CAFE24_SEO_PATH = re.compile(r'^/product/[^/]+/(\d+)(?:/|$)')
+# Query parameters that only record how a product page was reached: category, listing block, ad tracking
+NAVIGATION_PARAMS = re.compile(r'^(?:utm_\w+|cate_no|display_group|category_no|cateCd|fbclid|gclid|NaPm|n_\w+)$')
+
+
+def product_key(url: str) -> str:
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    
+    if query.get('product_no'):
+        return f"cafe24:{query['product_no'][0]}"
+    
+    if query.get('goodsNo'):
+        return f"godomall:{query['goodsNo'][0]}"
+    
+    match = CAFE24_SEO_PATH.match(parsed.path)
+    if match:
+        return f"cafe24:{match.group(1)}"
+    
+    path = parsed.path.rstrip('/') or '/'
+    return f"url:{parsed.netloc.lower()}{path}"
+
+
+def canonical_url(url: str) -> str:
+    # One URL per product, so a product listed under several categories is fetched once
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower() or 'https'
+    netloc = parsed.netloc.lower()
+    key = product_key(url)
+    
+    if key.startswith('cafe24:'):
+        return f"{scheme}://{netloc}/product/detail.html?product_no={key.split(':', 1)[1]}"
+    if key.startswith('godomall:'):
+        return f"{scheme}://{netloc}/goods/goods_view.php?goodsNo={key.split(':', 1)[1]}"
+    
+    query = urlencode(sorted((name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+                             if not NAVIGATION_PARAMS.match(name)))
+    return urlunparse((scheme, netloc, parsed.path or '/', parsed.params, query, ''))
+
+
+def product_id(coffee: Coffee) -> str:
+    if coffee.url:
+        return url_product_id(coffee.roastery_name, coffee.url)
+    return f"{coffee.roastery_name}|name:{coffee.coffee_name}"
+
+
+def url_product_id(roastery_name: str, url: str) -> str:
+    return f"{roastery_name}|{product_key(url)}"
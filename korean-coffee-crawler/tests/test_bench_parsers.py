@@ -0,0 +1,23 @@
+import pytest
+
+from benchmarks.bench_parsers import bench_crawler, compare
+from src.crawlers import CRAWLERS
+
+
+@pytest.mark.parametrize('name', sorted(CRAWLERS))
+def test_fixtures_cover_listing_and_detail(name):
+    result = bench_crawler(name, iterations=1, repeats=1)
+    assert result['listing_pages_per_sec'] > 0 and result['detail_pages_per_sec'] > 0
+    assert result['detail_bytes'] > 0 and result['peak_kib'] > 0
+
+
+def test_regressions_are_scaled_by_machine_speed():
+    baseline = {'calibration': 0.1, 'results': {'fritz': {'listing_pages_per_sec': 100.0,
+                                                          'detail_pages_per_sec': 100.0}}}
+    result = {'fritz': {'listing_pages_per_sec': 45.0, 'detail_pages_per_sec': 90.0}}
+    
+    [(name, message)] = compare(result, baseline, calibration=0.1, threshold=0.2)
+    assert name == 'fritz' and 'listing_pages_per_sec' in message
+    # Half as fast a machine expects half the pages per second
+    assert compare(result, baseline, calibration=0.2, threshold=0.2) == []
+    assert compare({'momos': result['fritz']}, baseline, calibration=0.1, threshold=0.2) == []
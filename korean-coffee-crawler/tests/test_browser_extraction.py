@@ -0,0 +1,80 @@
+import os
+
+import pytest
+import soupsieve
+from bs4 import BeautifulSoup
+
+from src.crawlers import CRAWLERS
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+URL = 'https://example.com/product/detail.html?product_no=1'
+BROWSER_SPECS = [name for name in sorted(CRAWLERS) if CRAWLERS[name]().browser_extraction]
+
+
+def run_plan(html: str, plan):
+    # What BROWSER_EXTRACT_SCRIPT returns for this page, with soupsieve standing in for querySelector
+    soup = BeautifulSoup(html, 'lxml')
+    found = {}
+    for selector, wanted in plan.items():
+        elements = soupsieve.select(selector, soup) if wanted['all'] else [soupsieve.select_one(selector, soup)]
+        items = []
+        for element in filter(None, elements):
+            item = {'text': element.get_text()}
+            if wanted['attrs']:
+                item['attrs'] = {name: element.get(name) for name in wanted['attrs'] if element.get(name) is not None}
+            if wanted['cells']:
+                item['cells'] = {tag: element.find(tag).get_text() for tag in wanted['cells'] if element.find(tag)}
+            items.append(item)
+        found[selector] = items
+    return {'found': found, 'structured': ''}
+
+
+@pytest.mark.parametrize('name', BROWSER_SPECS)
+def test_snapshots_parse_like_the_page(name):
+    crawler = CRAWLERS[name]()
+    crawler.use_structured_data = False
+    with open(os.path.join(FIXTURES, name, 'detail.html'), encoding='utf-8') as f:
+        html = f.read()
+    
+    _, plan = crawler.browser_extraction
+    rendered = crawler.parse_page(run_plan(html, plan), URL)
+    parsed = crawler.parse_page(html, URL)
+    assert rendered is not None
+    rendered.crawled_at = parsed.crawled_at
+    assert rendered == parsed
+
+
+class FakeDriver:
+    def __init__(self, result):
+        self.result = result
+        self.scripts = []
+    
+    def execute_script(self, script, argument):
+        self.scripts.append(argument)
+        return self.result
+
+
+def rendering_crawler(monkeypatch, result):
+    crawler = CRAWLERS[BROWSER_SPECS[0]]()
+    crawler.respect_robots = False
+    crawler.request_interval = 0
+    crawler._driver = FakeDriver(result)
+    monkeypatch.setattr(crawler, 'browser_get', lambda url: None)
+    monkeypatch.setattr('src.crawlers.base_crawler.time.sleep', lambda seconds: None)
+    return crawler
+
+
+def test_rendered_fetch_returns_the_snapshot(monkeypatch):
+    page = {'found': {}, 'structured': '<meta property="og:title" content="게이샤">'}
+    crawler = rendering_crawler(monkeypatch, page)
+    
+    assert crawler.fetch_page(URL, browser=True) == page
+    assert crawler._driver.scripts == [crawler.browser_extraction[1]]
+    assert crawler.metrics.fetch_latency.count == 1 and crawler.metrics.fetch_errors == 0
+
+
+def test_unexpected_script_result_is_a_failed_fetch(monkeypatch):
+    crawler = rendering_crawler(monkeypatch, None)
+    assert crawler.fetch_page(URL, browser=True) is None
+    assert crawler.metrics.fetch_errors == 1
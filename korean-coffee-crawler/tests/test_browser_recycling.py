@@ -0,0 +1,88 @@
+import pytest
+
+from src.crawlers import CRAWLERS
+from src.crawlers.base_crawler import RSS_CHECK_EVERY
+from src.utils.browser import BrowserService
+
+
+URL = 'https://fritz.co.kr/product/detail.html?product_no=1'
+
+
+class FakeDriver:
+    service = None
+    
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = []
+    
+    def get(self, url):
+        self.calls.append('get')
+        if self.fail:
+            raise RuntimeError('chrome not reachable')
+    
+    def close(self):
+        self.calls.append('close')
+    
+    def quit(self):
+        self.calls.append('quit')
+
+
+def browser_crawler(attached: bool = False):
+    crawler = CRAWLERS['fritz']()
+    drivers = []
+    
+    def setup_driver():
+        drivers.append(FakeDriver())
+        crawler._attached = attached
+        return drivers[-1]
+    
+    crawler._setup_driver = setup_driver
+    return crawler, drivers
+
+
+def test_browser_is_recycled_by_page_count():
+    crawler, drivers = browser_crawler()
+    crawler.driver_max_pages = 3
+    for _ in range(7):
+        crawler.browser_get(URL)
+    
+    assert len(drivers) == 3 and crawler.metrics.driver_restarts == 2
+    assert drivers[0].calls == ['get'] * 3 + ['quit']
+    assert drivers[2].calls == ['get']
+
+
+def test_browser_is_recycled_by_memory(monkeypatch):
+    crawler, drivers = browser_crawler()
+    crawler.driver_max_pages = 0
+    monkeypatch.setattr(crawler, 'driver_rss', lambda: crawler.driver_max_rss)
+    for _ in range(RSS_CHECK_EVERY + 1):
+        crawler.browser_get(URL)
+    
+    # Memory is only sampled every RSS_CHECK_EVERY loads
+    assert len(drivers) == 2 and crawler.metrics.driver_restarts == 1
+
+
+def test_attached_tab_ignores_the_shared_browsers_memory(monkeypatch, tmp_path):
+    crawler, drivers = browser_crawler(attached=True)
+    crawler.browser_service = BrowserService(str(tmp_path))
+    crawler.driver_max_pages = 0
+    monkeypatch.setattr(crawler, 'driver_rss', lambda: crawler.driver_max_rss)
+    for _ in range(RSS_CHECK_EVERY * 2 + 1):
+        crawler.browser_get(URL)
+    assert len(drivers) == 1
+    
+    # Closing an attached crawler closes its tab and ends the session, not the service's browser
+    crawler.close()
+    assert drivers[0].calls[-2:] == ['close', 'quit']
+    assert not crawler._attached and crawler._driver is None
+
+
+def test_failed_load_restarts_the_browser():
+    crawler, drivers = browser_crawler()
+    crawler._driver = FakeDriver(fail=True)
+    with pytest.raises(RuntimeError):
+        crawler.browser_get(URL)
+    assert crawler._driver is None and crawler.metrics.driver_restarts == 1
+    
+    crawler.browser_get(URL)
+    assert len(drivers) == 1 and crawler._driver_pages == 1
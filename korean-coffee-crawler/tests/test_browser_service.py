@@ -0,0 +1,46 @@
+import json
+import os
+import signal
+
+from src.utils import browser
+from src.utils.browser import BrowserService
+
+
+def test_browser_service_state(monkeypatch, tmp_path):
+    service = BrowserService(str(tmp_path))
+    assert service.address() is None and not service.stop()
+    
+    with open(service.state_path, 'w', encoding='utf-8') as f:
+        json.dump({'address': '127.0.0.1:9222', 'pid': 4242, 'started_at': 0}, f)
+    monkeypatch.setattr(service, 'responding', lambda address: False)
+    assert service.address() is None
+    monkeypatch.setattr(service, 'responding', lambda address: True)
+    assert service.address() == '127.0.0.1:9222'
+    assert service.start() == '127.0.0.1:9222'
+    
+    killed = []
+    monkeypatch.setattr(os, 'kill', lambda pid, sig: killed.append((pid, sig)))
+    assert service.stop()
+    assert killed == [(4242, signal.SIGTERM)] and not os.path.exists(service.state_path)
+
+
+def test_cached_chromedriver_is_used_offline(monkeypatch, tmp_path):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('COFFEE_CRAWLER_OFFLINE', '1')
+    monkeypatch.delenv('CHROMEDRIVER', raising=False)
+    monkeypatch.setattr(browser.shutil, 'which', lambda name: None)
+    assert browser.resolve_chromedriver() is None
+    
+    paths = []
+    for version in ('120.0', '121.0'):
+        directory = tmp_path / '.cache' / 'selenium' / 'chromedriver' / 'linux64' / version
+        directory.mkdir(parents=True)
+        path = directory / 'chromedriver'
+        path.write_text('')
+        path.chmod(0o755)
+        paths.append(str(path))
+    os.utime(paths[0], (0, 0))
+    assert browser.resolve_chromedriver() == paths[1]
+    
+    monkeypatch.setenv('CHROMEDRIVER', '/opt/chromedriver')
+    assert browser.resolve_chromedriver() == '/opt/chromedriver'
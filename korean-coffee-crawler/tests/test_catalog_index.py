@@ -0,0 +1,43 @@
+import pytest
+
+from src.models import Coffee
+from src.search.catalog_index import CatalogIndex
+
+
+@pytest.fixture
+def index() -> CatalogIndex:
+    index = CatalogIndex()
+    index.add_all([
+        Coffee('프릳츠', '예가체프', origin='Ethiopia Yirgacheffe', process='Washed', price=18000,
+               altitude='1900-2100m', url='https://fritz.co.kr/product/detail.html?product_no=1'),
+        Coffee('센터', '케냐 AA', origin='Kenya Nyeri', process='Washed', price=22000,
+               altitude='1700m', url='https://centercoffee.kr/product/detail.html?product_no=1'),
+        Coffee('센터', '구지', origin='Ethiopia Guji', process='Natural', price=20000,
+               url='https://centercoffee.kr/product/detail.html?product_no=2'),
+    ])
+    return index
+
+
+def names(index: CatalogIndex, docs) -> set:
+    return {index.docs[doc].coffee_name for doc in docs}
+
+
+def test_facets_and_ranges_combine(index):
+    assert names(index, index.match({'origin': ['ethiopia']})) == {'예가체프', '구지'}
+    assert names(index, index.match({'origin': ['ethiopia', 'kenya'], 'process': ['washed']})) == {'예가체프', '케냐 AA'}
+    assert names(index, index.match({'process': ['washed']}, price=(None, 20000))) == {'예가체프'}
+    assert names(index, index.match(altitude=(1800, None))) == {'예가체프'}
+
+
+def test_readding_a_product_replaces_it(index):
+    index.add(Coffee('센터', '구지', origin='Ethiopia Guji', process='Honey', price=21000,
+                     url='https://centercoffee.kr/product/detail.html?product_no=2'))
+    
+    assert len(index) == 3
+    assert names(index, index.match({'process': ['natural']})) == set()
+    assert names(index, index.match({'process': ['honey']})) == {'구지'}
+
+
+def test_unknown_facet_is_rejected(index):
+    with pytest.raises(ValueError, match='origin'):
+        index.match({'roast': ['light']})
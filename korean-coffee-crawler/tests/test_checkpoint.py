@@ -0,0 +1,74 @@
+from src.models import Coffee
+from src.utils.checkpoint import CrawlJournal
+
+
+def interrupted_journal(path) -> CrawlJournal:
+    journal = CrawlJournal(str(path))
+    journal.start({'roasteries': ['fritz'], 'save_mode': 'both'})
+    progress = journal.progress('fritz')
+    for number in (1, 2, 3):
+        progress.add_url(f'https://fritz.co.kr/product/detail.html?product_no={number}')
+    progress.mark_discovered()
+    progress.mark_done('https://fritz.co.kr/product/detail.html?product_no=1', Coffee('프릳츠', '에티오피아'))
+    progress.mark_done('https://fritz.co.kr/product/detail.html?product_no=2', None)
+    journal.close()
+    return journal
+
+
+def test_resume_restores_progress(tmp_path):
+    interrupted_journal(tmp_path)
+    
+    journal = CrawlJournal(str(tmp_path))
+    assert journal.resume()
+    progress = journal.progress('fritz')
+    
+    assert journal.options['roasteries'] == ['fritz']
+    assert progress.discovery_complete and not progress.finished
+    assert progress.pending_urls() == ['https://fritz.co.kr/product/detail.html?product_no=3']
+    assert [coffee.coffee_name for coffee in journal.iter_saved_coffees('fritz')] == ['에티오피아']
+    journal.close()
+
+
+def test_resume_drops_half_written_record(tmp_path):
+    journal = interrupted_journal(tmp_path)
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"t": "done", "r": "fritz", "u": "https://fritz.co')
+    
+    journal = CrawlJournal(str(tmp_path))
+    assert journal.resume()
+    assert len(journal.progress('fritz').pending_urls()) == 1
+    
+    # New records follow the last complete line instead of the cut one
+    journal.progress('fritz').finish()
+    journal.close()
+    reloaded = CrawlJournal(str(tmp_path))
+    assert reloaded.load()
+    assert reloaded.progress('fritz').finished
+
+
+def test_completed_crawl_is_not_resumed(tmp_path):
+    interrupted_journal(tmp_path)
+    journal = CrawlJournal(str(tmp_path))
+    journal.resume()
+    journal.complete()
+    
+    assert not CrawlJournal(str(tmp_path)).resume()
+
+
+def test_skipped_urls_stay_known_after_resume(tmp_path):
+    journal = CrawlJournal(str(tmp_path))
+    journal.start({'roasteries': ['fritz'], 'save_mode': 'both'})
+    progress = journal.progress('fritz')
+    progress.add_url('https://fritz.co.kr/product/detail.html?product_no=1')
+    progress.add_skipped('https://fritz.co.kr/product/detail.html?product_no=2')
+    progress.mark_discovered()
+    journal.close()
+    
+    journal = CrawlJournal(str(tmp_path))
+    assert journal.resume()
+    progress = journal.progress('fritz')
+    
+    # Skipped pages are not fetched, but still count as listed
+    assert progress.pending_urls() == ['https://fritz.co.kr/product/detail.html?product_no=1']
+    assert 'https://fritz.co.kr/product/detail.html?product_no=2' in progress.known
+    journal.close()
@@ -0,0 +1,24 @@
+from openpyxl import load_workbook
+
+from src.models import Coffee
+from src.utils.data_saver import DataSaver, StreamingSink
+
+
+def test_excel_keeps_streamed_values(tmp_path):
+    sink = StreamingSink(DataSaver(str(tmp_path)), save_mode='combined')
+    sink.write(Coffee('프릳츠', '에티오피아', price=15000, weight='200g'))
+    sink.write(Coffee('프릳츠', '콜롬비아', origin='', weight='0200'))
+    saved = sink.close()
+    
+    csv_path, excel_path = saved['combined']
+    assert csv_path.endswith('.csv') and excel_path.endswith('.xlsx')
+    
+    rows = list(load_workbook(excel_path).active.iter_rows(values_only=True))
+    header = rows[0]
+    first = dict(zip(header, rows[1]))
+    second = dict(zip(header, rows[2]))
+    
+    assert first['가격'] == 15000
+    assert second['가격'] is None
+    assert second['원산지'] is None
+    assert second['중량'] == '0200'
@@ -0,0 +1,64 @@
+import copy
+import re
+from datetime import datetime
+
+from src.crawlers.spec import DiscoverySpec, load_spec
+from src.crawlers.spec_crawler import SpecCrawler
+
+
+SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://fritz.co.kr/product/detail.html?product_no=1</loc><lastmod>2026-10-01</lastmod></url>
+  <url><loc>https://fritz.co.kr/product/detail.html?product_no=2</loc><lastmod>2026-10-02</lastmod></url>
+  <url><loc>https://fritz.co.kr/product/detail.html?product_no=900</loc><lastmod>2026-10-03</lastmod></url>
+  <url><loc>https://fritz.co.kr/board/notice.html</loc></url>
+</urlset>
+"""
+COFFEE = ['https://fritz.co.kr/product/detail.html?product_no=1&cate_no=89',
+          'https://fritz.co.kr/product/detail.html?product_no=2&cate_no=89']
+
+
+class FakeResponse:
+    status_code = 200
+    
+    def __init__(self, content: bytes):
+        self.content = content
+    
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def get(self, url, timeout=None):
+        return FakeResponse(SITEMAP)
+
+
+def mixed_shop_crawler(pattern: str = None) -> SpecCrawler:
+    # product_no=900 is a grinder: in the sitemap, but not in the coffee category listing
+    spec = load_spec('fritz')
+    if pattern:
+        spec = copy.copy(spec)
+        spec.discovery = DiscoverySpec(pattern=re.compile(pattern))
+    crawler = SpecCrawler(spec)
+    crawler.session = FakeSession()
+    crawler.respect_robots = False
+    crawler.sitemaps = ['/sitemap.xml']
+    crawler.iter_coffee_list_urls = lambda: iter(COFFEE)
+    return crawler
+
+
+def test_sitemap_only_dates_the_coffee_listing():
+    crawler = mixed_shop_crawler()
+    urls = list(crawler.iter_discovered_urls())
+    
+    assert urls == ['https://fritz.co.kr/product/detail.html?product_no=1',
+                    'https://fritz.co.kr/product/detail.html?product_no=2']
+    assert crawler.lastmod[urls[1]] == datetime(2026, 10, 2)
+
+
+def test_product_pattern_lets_the_sitemap_replace_the_listing():
+    crawler = mixed_shop_crawler(pattern=r'product_no=[12]$')
+    crawler.iter_coffee_list_urls = lambda: iter(())
+    
+    assert sorted(crawler.iter_discovered_urls()) == ['https://fritz.co.kr/product/detail.html?product_no=1',
+                                                       'https://fritz.co.kr/product/detail.html?product_no=2']
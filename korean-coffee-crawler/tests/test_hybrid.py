@@ -0,0 +1,61 @@
+from src.crawlers import CRAWLERS
+
+
+URL = 'https://centercoffee.co.kr/product/detail.html?product_no=1'
+NAME = '<div class="headingArea"><h2>콜롬비아 핑크 버번</h2></div>'
+PRICE = '<span id="span_product_price_text">22,000원</span>'
+
+
+def hybrid_crawler(rendered: str):
+    crawler = CRAWLERS['center']()
+    crawler.use_structured_data = False
+    loads = []
+    
+    def fetch_page(url, browser=None):
+        loads.append(browser)
+        return rendered
+    
+    crawler.fetch_page = fetch_page
+    return crawler, loads
+
+
+def test_static_page_with_every_validated_field_is_kept():
+    crawler, loads = hybrid_crawler(NAME + PRICE)
+    coffee = crawler.parse_fetched(URL, NAME + PRICE)
+    
+    assert (coffee.coffee_name, coffee.price) == ('콜롬비아 핑크 버번', 22000)
+    assert loads == []
+    assert (crawler.metrics.static_pages, crawler.metrics.browser_pages) == (1, 0)
+
+
+def test_missing_validated_field_loads_the_page_in_the_browser():
+    # The price is rendered by script, so the static HTML has the name only
+    crawler, loads = hybrid_crawler(NAME + PRICE)
+    coffee = crawler.parse_fetched(URL, NAME)
+    
+    assert coffee.price == 22000
+    assert loads == [True]
+    assert (crawler.metrics.static_pages, crawler.metrics.browser_pages) == (0, 1)
+
+
+def test_static_result_is_kept_when_the_browser_fails():
+    crawler, loads = hybrid_crawler(None)
+    coffee = crawler.parse_fetched(URL, NAME)
+    assert coffee.coffee_name == '콜롬비아 핑크 버번' and coffee.price is None
+    assert loads == [True]
+
+
+def test_static_crawlers_never_escalate():
+    crawler, loads = hybrid_crawler(NAME + PRICE)
+    crawler.fetch_mode = 'static'
+    assert crawler.parse_fetched(URL, NAME).price is None
+    assert loads == []
+
+
+def test_empty_static_listing_switches_listings_to_the_browser():
+    crawler, _ = hybrid_crawler('')
+    assert not crawler.listing_needs_browser('https://centercoffee.co.kr/list', True)
+    assert crawler.listing_needs_browser('https://centercoffee.co.kr/list', False)
+    # Decided once; later listing pages go straight to the browser
+    assert not crawler.listing_needs_browser('https://centercoffee.co.kr/list?page=2', False)
+    assert crawler.metrics.browser_listings == 1
@@ -0,0 +1,65 @@
+import time
+
+from src.utils.job_queue import SQLiteJobQueue
+
+
+def test_push_skips_queued_urls(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / 'queue.db'))
+    assert queue.push_many('detail', 'fritz', ['a', 'b']) == 2
+    assert queue.push_many('detail', 'fritz', ['b', 'c']) == 1
+    assert queue.counts()['pending'] == 3
+    queue.close()
+
+
+def test_expired_lease_goes_to_another_worker(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / 'queue.db'), lease_seconds=0.05)
+    queue.push('detail', 'fritz', 'a')
+    first = queue.lease('worker-1')
+    time.sleep(0.1)
+    
+    second = queue.lease('worker-2')
+    assert second.id == first.id and second.attempts == 2
+    # The first worker's late result and renewal are refused
+    assert not queue.renew(first)
+    assert not queue.complete(first, {'coffee_name': 'late'})
+    assert queue.complete(second, {'coffee_name': 'on time'})
+    assert [record['coffee_name'] for _, _, record in queue.results()] == ['on time']
+    queue.close()
+
+
+def test_renewed_lease_is_kept(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / 'queue.db'), lease_seconds=0.2)
+    queue.push('discover', 'fritz')
+    job = queue.lease('worker-1')
+    
+    for _ in range(3):
+        time.sleep(0.1)
+        assert queue.renew(job)
+    
+    assert queue.lease('worker-2') is None
+    assert queue.complete(job)
+    queue.close()
+
+
+def test_failed_job_is_retried_until_attempts_run_out(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / 'queue.db'), max_attempts=2)
+    queue.push('detail', 'fritz', 'a')
+    
+    assert queue.fail(queue.lease('worker-1'), 'timeout')
+    assert queue.fail(queue.lease('worker-1'), 'timeout')
+    assert queue.lease('worker-1') is None
+    assert queue.counts()['failed'] == 1
+    queue.close()
+
+
+def test_detail_urls_include_every_state(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / 'queue.db'), max_attempts=1)
+    queue.push_many('detail', 'fritz', ['a', 'b', 'c'])
+    queue.push('detail', 'center', 'd')
+    queue.complete(queue.lease('worker-1'))
+    queue.fail(queue.lease('worker-1'), 'fetch failed')
+    
+    # Done, failed and still pending pages are all listed
+    assert sorted(queue.detail_urls('fritz')) == ['a', 'b', 'c']
+    assert queue.detail_urls('center') == ['d']
+    queue.close()
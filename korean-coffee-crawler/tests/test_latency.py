@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+from src.crawlers import CRAWLERS
+from src.utils.latency import DEFAULT_TIMEOUT, MAX_TIMEOUT, MIN_SAMPLES, MIN_TIMEOUT, HostLatency
+
+
+HOST = 'fritz.co.kr'
+URL = f'https://{HOST}/product/detail.html?product_no=1'
+
+
+def test_timeout_follows_the_hosts_p99():
+    latency = HostLatency()
+    for _ in range(MIN_SAMPLES - 1):
+        latency.observe(HOST, 2.0)
+    assert latency.timeout(HOST) == DEFAULT_TIMEOUT
+    
+    latency.observe(HOST, 2.0)
+    assert latency.timeout(HOST) == 8.0
+    for _ in range(200):
+        latency.observe(HOST, 0.1)
+    assert latency.timeout(HOST) == MIN_TIMEOUT
+    for _ in range(MIN_SAMPLES):
+        latency.observe('slow.example.com', 60.0)
+    assert latency.timeout('slow.example.com') == MAX_TIMEOUT
+
+
+def test_hedging_stays_within_budget():
+    latency = HostLatency()
+    for i in range(100):
+        latency.observe(HOST, 0.01 * (i + 1))
+    assert latency.hedge_after(HOST) == pytest.approx(0.96)
+    
+    for _ in range(5):
+        latency.record_hedge(HOST)
+    assert latency.hedge_after(HOST) is None
+
+
+class FakeResponse:
+    def __init__(self, name: str):
+        self.name = name
+        self.closed = False
+    
+    def close(self):
+        self.closed = True
+
+
+class SlowFirstSession:
+    def __init__(self, first_delay: float, fail: bool = False):
+        self.first_delay = first_delay
+        self.fail = fail
+        self.calls = 0
+        self.responses = []
+        self.lock = threading.Lock()
+    
+    def get(self, url, timeout=None):
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            time.sleep(self.first_delay)
+        if self.fail:
+            raise ConnectionError(f'copy {call} failed')
+        response = FakeResponse(f'copy {call}')
+        self.responses.append(response)
+        return response
+
+
+def hedging_crawler(session):
+    crawler = CRAWLERS['fritz']()
+    crawler.session = session
+    return crawler
+
+
+def test_duplicate_wins_and_the_slow_copy_is_released():
+    session = SlowFirstSession(first_delay=0.3)
+    crawler = hedging_crawler(session)
+    
+    response = crawler.hedged_get(URL, HOST, timeout=5, delay=0.05)
+    assert response.name == 'copy 2'
+    assert (crawler.metrics.hedged_requests, crawler.metrics.hedge_wins) == (1, 1)
+    assert crawler.latency.hedges[HOST] == 1
+    
+    # The losing copy closes its response once it arrives, returning the connection to the pool
+    crawler._hedge_executor.shutdown(wait=True)
+    loser = next(r for r in session.responses if r.name == 'copy 1')
+    assert loser.closed and not response.closed
+
+
+def test_fast_response_sends_no_duplicate():
+    session = SlowFirstSession(first_delay=0)
+    crawler = hedging_crawler(session)
+    assert crawler.hedged_get(URL, HOST, timeout=5, delay=0.5).name == 'copy 1'
+    assert session.calls == 1 and crawler.metrics.hedged_requests == 0
+    crawler.close()
+
+
+def test_both_copies_failing_raises():
+    crawler = hedging_crawler(SlowFirstSession(first_delay=0.1, fail=True))
+    with pytest.raises(ConnectionError):
+        crawler.hedged_get(URL, HOST, timeout=5, delay=0.01)
+    crawler.close()
@@ -0,0 +1,47 @@
+import csv
+
+from src.models import Coffee
+from src.search.lot_matching import LotMatcher, skeleton, write_clusters
+
+
+def make(roastery: str, number: int, name: str, origin: str, process: str) -> Coffee:
+    return Coffee(roastery, name, origin=origin, process=process, price=18000,
+                  url=f'https://{roastery}.kr/product/detail.html?product_no={number}')
+
+
+COFFEES = [
+    make('fritz', 1, '에티오피아 예가체프 코케 워시드', '에티오피아', '워시드'),
+    make('center', 1, 'Ethiopia Yirgacheffe Koke Washed', 'Ethiopia', 'Washed'),
+    make('center', 2, 'Ethiopia Yirgacheffe Koke Natural', 'Ethiopia', 'Natural'),
+    make('fritz', 2, '브라질 세하도', '브라질', '내추럴'),
+]
+
+
+def test_hangul_and_latin_spellings_share_a_skeleton():
+    assert skeleton('예가체프') == skeleton('yirgacheffe')
+    assert skeleton('코케') == skeleton('koke')
+
+
+def test_same_lot_across_roasteries_is_clustered():
+    matcher = LotMatcher()
+    matcher.add(COFFEES)
+    clusters = matcher.clusters()
+    
+    # The natural is a different lot however alike its name is
+    assert len(clusters) == 1
+    assert clusters[0].roasteries == ['center', 'fritz']
+    assert {coffee.url for coffee in clusters[0].coffees} == {COFFEES[0].url, COFFEES[1].url}
+    assert clusters[0].score >= matcher.threshold
+
+
+def test_write_clusters(tmp_path):
+    matcher = LotMatcher()
+    matcher.add(COFFEES)
+    path = str(tmp_path / 'lots.csv')
+    assert write_clusters(matcher.clusters(), path) == 1
+    
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['랏'] for row in rows] == ['1', '1']
+    assert {row['로스터리 수'] for row in rows} == {'2'}
+    assert {Coffee.from_dict(row).roastery_name for row in rows} == {'center', 'fritz'}
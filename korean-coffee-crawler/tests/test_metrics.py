@@ -0,0 +1,63 @@
+import json
+import os
+
+import pytest
+
+from src.utils.metrics import CrawlMetrics, Histogram
+
+
+def test_histogram_quantiles_are_bucket_bounds():
+    histogram = Histogram(buckets=(0.1, 1.0, 10.0))
+    assert histogram.quantile(0.5) is None
+    
+    for value in (0.05, 0.1, 0.5, 0.9, 5.0, 60.0):
+        histogram.observe(value)
+    assert histogram.cumulative() == [('0.1', 2), ('1.0', 4), ('10.0', 5), ('+Inf', 6)]
+    assert histogram.quantile(0.5) == 1.0
+    assert histogram.quantile(0.99) == float('inf')
+    assert histogram.total == pytest.approx(66.55)
+
+
+def test_fetch_errors_and_timed_phases():
+    metrics = CrawlMetrics().roastery('fritz')
+    metrics.record_fetch(0.2, 1000)
+    metrics.record_fetch(0.3, None)
+    assert (metrics.fetch_latency.count, metrics.bytes_downloaded, metrics.fetch_errors) == (2, 1000, 1)
+    assert metrics.seconds['fetch'] == 0.5
+    
+    seen = list(metrics.timed(iter([1, 2, 3]), 'discovery'))
+    assert seen == [1, 2, 3] and metrics.seconds['discovery'] >= 0
+    with metrics.timer('save'):
+        pass
+    assert metrics.seconds['save'] > 0
+    
+    assert metrics.escalation_rate() is None
+    metrics.static_pages, metrics.browser_pages = 3, 1
+    assert metrics.to_dict()['escalation_rate'] == 0.25
+
+
+def test_report_files(tmp_path):
+    crawl = CrawlMetrics()
+    fritz = crawl.roastery('fritz')
+    assert crawl.roastery('fritz') is fritz
+    fritz.record_fetch(0.2, 512)
+    fritz.parsed = fritz.saved = 1
+    fritz.hedged_requests, fritz.hedge_wins = 2, 1
+    crawl.roastery('momos')
+    
+    json_path, prom_path = crawl.write(str(tmp_path))
+    with open(json_path, encoding='utf-8') as f:
+        report = json.load(f)
+    assert set(report['roasteries']) == {'fritz', 'momos'}
+    assert report['roasteries']['fritz']['pages_fetched'] == 1
+    
+    assert not os.path.exists(prom_path + '.tmp')
+    with open(prom_path, encoding='utf-8') as f:
+        prom = f.read()
+    assert 'coffee_crawler_fetch_seconds_bucket{roastery="fritz",le="0.25"} 1' in prom
+    assert 'coffee_crawler_fetch_seconds_count{roastery="momos"} 0' in prom
+    assert 'coffee_crawler_pages{roastery="fritz",result="saved"} 1' in prom
+    assert 'coffee_crawler_hedged_requests{roastery="fritz",result="won"} 1' in prom
+    # Counters that never moved are left out rather than exported as zero
+    assert 'coffee_crawler_hedged_requests{roastery="momos"' not in prom
+    assert 'coffee_crawler_driver_restarts{' not in prom
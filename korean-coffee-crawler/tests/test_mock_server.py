@@ -0,0 +1,67 @@
+import argparse
+import socket
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmarks.mock_server import PRODUCT_NUMBER, mock_base_url, serve
+from src.crawlers import CRAWLERS
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def mock_server():
+    servers = []
+    
+    def start(name: str, **overrides) -> str:
+        # --port is the first roastery's; pick it so that this roastery lands on a free one
+        port = free_port() - list(CRAWLERS).index(name)
+        options = argparse.Namespace(host='127.0.0.1', port=port, roasteries=[name], pages=2, latency=0.0,
+                                     jitter=0.0, error_rate=0.0, rate_limit=0.0, retry_after=1, seed=0,
+                                     verbose=False)
+        vars(options).update(overrides)
+        servers.extend(serve(options).values())
+        return mock_base_url(f'127.0.0.1:{port}', name)
+    
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def status(url: str):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, dict(response.headers)
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers)
+
+
+def test_crawler_reads_the_mock_shop(mock_server):
+    crawler = CRAWLERS['fritz']()
+    crawler.base_url = mock_server('fritz')
+    crawler.respect_robots = False
+    crawler.request_interval = 0
+    
+    urls = crawler.get_coffee_list_urls()
+    # The second listing page renumbers the first page's products, and the third is empty
+    first_page = [url for url in urls if int(PRODUCT_NUMBER.search(url).group(2)) < 1000]
+    assert first_page and len(urls) == 2 * len(first_page) == len(set(urls))
+    coffee = crawler.parse_coffee_detail(urls[0])
+    assert coffee is not None and coffee.coffee_name
+
+
+def test_rate_limit_and_errors(mock_server):
+    base_url = mock_server('fritz', rate_limit=0.01, retry_after=7)
+    assert status(base_url + '/product/list.html')[0] == 200
+    code, headers = status(base_url + '/product/list.html')
+    assert code == 429 and headers['Retry-After'] == '7'
+    
+    base_url = mock_server('momos', error_rate=1.0)
+    assert status(base_url + '/goods/goods_view.php?goodsNo=1')[0] == 503
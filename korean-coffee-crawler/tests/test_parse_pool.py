@@ -0,0 +1,37 @@
+import os
+
+from src.crawlers import CRAWLERS
+from src.crawlers.base_crawler import PartialHTML
+from src.parse_pool import ParsePool
+
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures',
+                       'fritz', 'detail.html')
+
+
+def test_pool_parses_like_the_crawler_and_keeps_order():
+    with open(FIXTURE, encoding='utf-8') as f:
+        html = f.read()
+    crawler = CRAWLERS['fritz']()
+    pages = [
+        ('https://fritz.co.kr/product/detail.html?product_no=1', html),
+        ('https://fritz.co.kr/product/detail.html?product_no=2', None),
+        ('https://fritz.co.kr/product/detail.html?product_no=3', PartialHTML('<html><body></body></html>')),
+        ('https://fritz.co.kr/product/detail.html?product_no=4', html.replace('코체레', '첼베사')),
+    ]
+    
+    pool = ParsePool(2, in_flight=1)
+    try:
+        results = list(pool.imap(crawler, pages))
+    finally:
+        pool.close()
+    
+    assert [url for url, _, _ in results] == [url for url, _ in pages]
+    first, missing, partial, last = results
+    expected = crawler.parse_page(html, pages[0][0])
+    assert first[2].to_record() | {'crawled_at': None} == expected.to_record() | {'crawled_at': None}
+    assert missing[2] is None
+    # The page itself comes back unchanged, so a cut page can still be refetched whole
+    assert isinstance(partial[1], PartialHTML) and partial[2] is None
+    assert last[2].coffee_name == '에티오피아 예가체프 첼베사'
+    assert crawler.metrics.seconds['parse'] > 0
@@ -0,0 +1,62 @@
+import csv
+import os
+
+from src.crawlers import CRAWLERS
+from src.utils.data_saver import DataSaver, StreamingSink
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+URLS = [f'https://fritz.co.kr/product/detail.html?product_no={number}' for number in (1, 2, 3)]
+
+
+def pipeline_crawler(events):
+    crawler = CRAWLERS['fritz']()
+    crawler.respect_robots = False
+    crawler.request_interval = 0
+    with open(os.path.join(FIXTURES, 'fritz', 'detail.html'), encoding='utf-8') as f:
+        detail = f.read()
+    
+    def iter_candidate_urls():
+        for url in URLS:
+            events.append(('found', url))
+            yield url
+    
+    def fetch_page(url, browser=None):
+        events.append(('fetched', url))
+        # The second page is gone; the crawl goes on without it
+        return None if url == URLS[1] else detail
+    
+    crawler.iter_candidate_urls = iter_candidate_urls
+    crawler.fetch_page = fetch_page
+    return crawler
+
+
+def test_coffees_stream_as_urls_are_found():
+    events = []
+    coffees = pipeline_crawler(events).iter_coffees()
+    
+    first = next(coffees)
+    assert first.coffee_name
+    # The first coffee arrives before discovery has looked past its URL
+    assert events == [('found', URLS[0]), ('fetched', URLS[0])]
+    
+    assert len(list(coffees)) == 1
+    assert events[2:] == [('found', URLS[1]), ('fetched', URLS[1]), ('found', URLS[2]), ('fetched', URLS[2])]
+
+
+def test_stage_counts():
+    crawler = pipeline_crawler([])
+    assert len(crawler.crawl()) == 2
+    assert (crawler.metrics.parsed, crawler.metrics.failed) == (2, 1)
+
+
+def test_rows_are_on_disk_before_the_run_ends(tmp_path):
+    sink = StreamingSink(DataSaver(str(tmp_path)), save_mode='separate', excel=False)
+    for coffee in pipeline_crawler([]).iter_coffees():
+        sink.write(coffee)
+        [writer] = sink.by_roastery.values()
+        with open(writer.filepath, encoding='utf-8-sig') as f:
+            assert len(list(csv.DictReader(f))) == sink.count
+    
+    saved = sink.close()
+    assert saved['combined'] == [] and len(saved['separate']) == 1
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from src.models import Coffee
+from src.utils.price_history import PriceHistory
+from src.utils.urls import product_id, url_product_id
+
+
+def coffee(number: int, price: int = 18000) -> Coffee:
+    return Coffee('프릳츠', f'커피 {number}', price=price,
+                  url=f'https://fritz.co.kr/product/detail.html?product_no={number}')
+
+
+def test_records_only_changes(tmp_path):
+    history = PriceHistory(str(tmp_path / 'history.db'))
+    assert history.record(coffee(1))
+    assert not history.record(coffee(1))
+    assert history.record(coffee(1, price=19000))
+    
+    prices = [row['price'] for row in history.history(product_id(coffee(1)))]
+    history.close()
+    
+    # Both records are stamped within the same second, so the later one replaces the first
+    assert prices[-1] == 19000
+
+
+def test_unlists_products_missing_from_the_crawl(tmp_path):
+    path = str(tmp_path / 'history.db')
+    history = PriceHistory(path)
+    for number in (1, 2):
+        history.record(coffee(number))
+    history.close()
+    
+    history = PriceHistory(path)
+    history.record(coffee(1))
+    history.mark_unlisted('프릳츠', at=datetime(2030, 1, 1))
+    
+    assert history.history(product_id(coffee(2)))[-1]['available'] == 0
+    assert history.history(product_id(coffee(1)))[-1]['available'] is None
+    history.close()
+
+
+def test_listed_products_are_not_unlisted(tmp_path):
+    path = str(tmp_path / 'history.db')
+    history = PriceHistory(path)
+    for number in (1, 2, 3):
+        history.record(coffee(number))
+    history.close()
+    
+    # A resumed crawl: product 1 was recorded before the interruption, product 2 failed to parse this run
+    history = PriceHistory(path)
+    history.record(coffee(3))
+    listed = [url_product_id('프릳츠', f'https://fritz.co.kr/product/item/{number}/') for number in (1, 2)]
+    history.mark_unlisted('프릳츠', at=datetime(2030, 1, 1), listed=listed)
+    
+    assert history.changes == 0
+    history.close()
@@ -0,0 +1,23 @@
+import pytest
+
+from benchmarks.import_budget import SCENARIOS, measure
+from src.crawlers import CRAWLERS, spec_names
+
+
+def test_registry_lists_every_spec():
+    assert list(CRAWLERS) == spec_names() and len(CRAWLERS) == len(spec_names())
+    assert 'fritz' in CRAWLERS and 'nope' not in CRAWLERS
+    with pytest.raises(KeyError):
+        CRAWLERS['nope']
+    
+    factory = CRAWLERS['fritz']
+    assert CRAWLERS['fritz'] is factory
+    assert factory().roastery_name == '프릳츠커피'
+
+
+@pytest.mark.parametrize('scenario', sorted(SCENARIOS))
+def test_startup_leaves_heavy_modules_unloaded(scenario):
+    command, _, forbidden = SCENARIOS[scenario]
+    _, modules, _ = measure(command)
+    loaded = [module for module in forbidden if any(m == module or m.startswith(module + '.') for m in modules)]
+    assert loaded == []
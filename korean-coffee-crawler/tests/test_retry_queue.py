@@ -0,0 +1,98 @@
+import pytest
+import requests
+
+from src.utils.retry_queue import MAX_ATTEMPTS, RetryQueue, classify_error
+
+
+URL = 'https://fritz.co.kr/product/detail.html?product_no=1'
+
+
+def test_deferred_page_dies_after_max_attempts(tmp_path):
+    queue = RetryQueue(str(tmp_path / 'retry.db'))
+    assert queue.defer('fritz', URL, 'timeout', 'read timed out')
+    assert [row['url'] for row in queue.due('fritz')] == [URL]
+    
+    for _ in range(MAX_ATTEMPTS - 1):
+        queue.retried('fritz', URL, 'server', '503')
+        assert queue.due('fritz') and not queue.failures()
+    queue.retried('fritz', URL, 'server', '503')
+    
+    assert queue.due('fritz') == []
+    [failure] = queue.failures('fritz')
+    assert failure['kind'] == 'server' and failure['attempts'] == MAX_ATTEMPTS
+    queue.close()
+
+
+def test_gone_pages_are_not_retried(tmp_path):
+    queue = RetryQueue(str(tmp_path / 'retry.db'))
+    queue.defer('fritz', URL, 'gone', '404')
+    assert queue.due('fritz') == []
+    assert [row['url'] for row in queue.failures()] == [URL]
+    
+    # A page that was only slow becomes permanent once it is found gone
+    other = 'https://fritz.co.kr/product/detail.html?product_no=2'
+    queue.defer('fritz', other, 'timeout', None)
+    queue.retried('fritz', other, 'gone', '410')
+    assert queue.due('fritz') == []
+    queue.close()
+
+
+def test_robots_blocked_pages_are_not_deferred(tmp_path):
+    queue = RetryQueue(str(tmp_path / 'retry.db'))
+    assert not queue.defer('fritz', URL, 'robots', 'disallowed by robots.txt')
+    assert queue.due('fritz') == [] and queue.failures() == []
+    
+    queue.defer('fritz', URL, 'network', None)
+    queue.retried('fritz', URL, 'robots', 'disallowed by robots.txt')
+    assert queue.due('fritz') == [] and queue.failures() == []
+    queue.close()
+
+
+def test_resolve_clears_failures_across_runs(tmp_path):
+    path = str(tmp_path / 'retry.db')
+    queue = RetryQueue(path)
+    queue.defer('fritz', URL, 'gone', '404')
+    queue.close()
+    
+    queue = RetryQueue(path)
+    assert URL in queue.queued('fritz')
+    queue.resolve('fritz', URL)
+    assert queue.failures() == [] and not queue.queued('fritz')
+    queue.close()
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f'{status} error', response=response)
+
+
+class TimeoutException(Exception):
+    pass
+
+
+class WebDriverException(Exception):
+    pass
+
+
+class InvalidSessionIdException(Exception):
+    pass
+
+
+@pytest.mark.parametrize('error, kind', [
+    (requests.ReadTimeout('read timed out'), 'timeout'),
+    (requests.ConnectTimeout('connect timed out'), 'timeout'),
+    (http_error(404), 'gone'),
+    (http_error(410), 'gone'),
+    (http_error(429), 'server'),
+    (http_error(503), 'server'),
+    (http_error(403), 'http'),
+    (requests.HTTPError('no response'), 'error'),
+    (requests.ConnectionError('connection refused'), 'network'),
+    (TimeoutException('page load'), 'timeout'),
+    (WebDriverException('chrome not reachable'), 'browser'),
+    (InvalidSessionIdException('session deleted'), 'browser'),
+    (ValueError('unexpected'), 'error'),
+])
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
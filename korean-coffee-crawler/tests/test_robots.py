@@ -0,0 +1,130 @@
+import requests
+
+from src.crawlers import CRAWLERS
+from src.utils.discovery import SitemapDiscovery
+from src.utils.robots import RobotsCache, RobotsRules, parse_robots
+
+
+ROBOTS = """
+User-agent: *
+Disallow: /member/
+Allow: /member/login
+Disallow: /*.pdf$
+Crawl-delay: 2
+Sitemap: https://fritz.co.kr/sitemap.xml
+
+User-agent: CoffeeCrawler
+Disallow: /product/
+"""
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, text: str = ''):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode('utf-8')
+        self.ok = status_code < 400
+    
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f'{self.status_code} error', response=self)
+
+
+class FakeSession:
+    def __init__(self, response=None):
+        self.response = response
+        self.requests = 0
+    
+    def get(self, url, timeout=None, stream=False):
+        self.requests += 1
+        if self.response is None:
+            raise requests.ConnectionError('unreachable')
+        return self.response
+
+
+def test_longest_rule_wins():
+    entry = parse_robots(ROBOTS, 'Mozilla/5.0')
+    rules = RobotsRules.from_dict(entry)
+    
+    assert rules.crawl_delay == 2
+    assert rules.sitemaps == ['https://fritz.co.kr/sitemap.xml']
+    assert rules.allowed('https://fritz.co.kr/product/detail.html?product_no=1')
+    assert not rules.allowed('https://fritz.co.kr/member/orders')
+    assert rules.allowed('https://fritz.co.kr/member/login')
+    assert not rules.allowed('https://fritz.co.kr/files/menu.pdf')
+    assert rules.allowed('https://fritz.co.kr/files/menu.pdf?v=2')
+
+
+def test_specific_agent_group_is_chosen():
+    rules = RobotsRules.from_dict(parse_robots(ROBOTS, 'CoffeeCrawler/1.0'))
+    assert not rules.allowed('https://fritz.co.kr/product/detail.html?product_no=1')
+    assert rules.allowed('https://fritz.co.kr/member/orders')
+
+
+def test_missing_robots_allows_everything():
+    cache = RobotsCache(session=FakeSession(FakeResponse(404)))
+    rules = cache.for_url('https://fritz.co.kr/product/detail.html?product_no=1')
+    assert rules.allowed('https://fritz.co.kr/member/orders')
+    assert not rules.unavailable
+
+
+def test_unreachable_robots_disallows_everything(tmp_path):
+    for session in (FakeSession(FakeResponse(503)), FakeSession()):
+        cache = RobotsCache(str(tmp_path / 'robots.json'), session=session)
+        rules = cache.for_url('https://fritz.co.kr/')
+        assert rules.unavailable
+        assert not rules.allowed('https://fritz.co.kr/product/detail.html?product_no=1')
+        
+        # Not asked again until the retry time
+        cache.for_url('https://fritz.co.kr/shop')
+        assert session.requests == 1
+        (tmp_path / 'robots.json').unlink()
+
+
+def test_server_error_keeps_stale_rules(tmp_path):
+    path = str(tmp_path / 'robots.json')
+    cache = RobotsCache(path, session=FakeSession(FakeResponse(200, ROBOTS)), ttl=0)
+    cache.for_url('https://fritz.co.kr/')
+    
+    cache = RobotsCache(path, session=FakeSession(FakeResponse(500)))
+    rules = cache.for_url('https://fritz.co.kr/')
+    assert not rules.unavailable
+    assert rules.allowed('https://fritz.co.kr/product/detail.html?product_no=1')
+    assert not rules.allowed('https://fritz.co.kr/member/orders')
+
+
+class ShopSession(FakeSession):
+    def get(self, url, timeout=None, stream=False):
+        self.requests += 1
+        return FakeResponse(200, ROBOTS if url.endswith('/robots.txt') else '<urlset></urlset>')
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_local_crawl_paces_every_request(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr('src.utils.job_queue.time', clock)
+    crawler = CRAWLERS['fritz']()
+    crawler.session = ShopSession()
+    
+    # Listing, sitemap and detail requests share the host's slots, spaced by its Crawl-delay
+    assert crawler.fetch_html('https://fritz.co.kr/product/list.html?cate_no=1') is not None
+    SitemapDiscovery(crawler.base_url, session=crawler.session, pace=crawler.pace).fetch(
+        'https://fritz.co.kr/sitemap.xml')
+    assert crawler.fetch_html('https://fritz.co.kr/product/detail.html?product_no=1') is not None
+    assert clock.sleeps == [2, 2]
+    
+    # A disallowed page is neither fetched nor given a slot; the four requests are robots.txt and the three above
+    assert crawler.fetch_html('https://fritz.co.kr/member/orders') is None
+    assert clock.sleeps == [2, 2] and crawler.session.requests == 4
@@ -0,0 +1,46 @@
+import time
+
+from src.scheduler import DAY, RecrawlScheduler
+from src.utils.price_history import PriceHistory
+
+
+def scheduler(path: str, budget: float = 100) -> RecrawlScheduler:
+    return RecrawlScheduler(PriceHistory(path), make_crawler=None, crawler_names=[], budget_per_day=budget)
+
+
+def test_budget_holds_across_runs(tmp_path):
+    path = str(tmp_path / 'history.db')
+    now = time.time()
+    
+    first = scheduler(path)
+    first.rates.record_spend(60, now - DAY - 1)
+    first.rates.record_spend(70, now - 3600)
+    first.history.close()
+    
+    # A later --once run starts with the spend of the earlier one, minus what left the 24h window
+    second = scheduler(path)
+    assert second.requests_last_day(now) == 70
+    assert second.budget_wait(20, now) == 0
+    assert abs(second.budget_wait(40, now) - (DAY - 3600)) < 1
+    second.history.close()
+
+
+def test_replanning_keeps_lastmod_and_retry_times(tmp_path):
+    rates = scheduler(str(tmp_path / 'history.db')).rates
+    now = time.time()
+    for number in (1, 2, 3):
+        rates.add_product('fritz', f'p{number}', f'https://fritz.co.kr/{number}', now)
+    for target in rates.due(now):
+        rates.observe(target, False, 1, now, 3600)
+    rates.plan(budget_per_day=1000, min_interval=3600, max_interval=7 * DAY)
+    
+    # Sitemap lastmod says p1 changed; fetching p2 failed and is retried in an hour
+    later = now + 60
+    assert rates.mark_due('fritz', {'https://fritz.co.kr/1': later}, later) == 1
+    rates.postpone(next(row for row in rates.due(now + 7 * DAY) if row['target'] == 'p2'), 3600, later)
+    rates.plan(budget_per_day=1000, min_interval=3600, max_interval=7 * DAY)
+    
+    due = {row['target']: row['next_due'] for row in rates.due(now + 30 * DAY)}
+    assert due['p1'] == later
+    assert due['p2'] == later + 3600
+    assert due['p3'] > later + 3600
@@ -0,0 +1,41 @@
+from src.utils.seen_urls import SeenURLs
+from src.utils.urls import canonical_url, product_key
+
+
+def test_canonical_url_merges_category_links():
+    assert canonical_url('https://Fritz.co.kr/product/에티오피아/12/category/24/display/1/') == \
+        'https://fritz.co.kr/product/detail.html?product_no=12'
+    assert canonical_url('https://fritz.co.kr/product/detail.html?cate_no=24&product_no=12') == \
+        'https://fritz.co.kr/product/detail.html?product_no=12'
+    assert canonical_url('https://shop.example.com/goods/goods_view.php?goodsNo=7&cateCd=001') == \
+        'https://shop.example.com/goods/goods_view.php?goodsNo=7'
+    assert canonical_url('https://shop.example.com/p/kenya?utm_source=x&size=200g') == \
+        'https://shop.example.com/p/kenya?size=200g'
+
+
+def test_product_key():
+    assert product_key('https://fritz.co.kr/product/detail.html?product_no=12') == 'cafe24:12'
+    assert product_key('https://shop.example.com/goods/goods_view.php?goodsNo=7') == 'godomall:7'
+    assert product_key('https://Shop.example.com/p/kenya/') == 'url:shop.example.com/p/kenya'
+
+
+def test_claim_hands_out_each_product_once():
+    seen = SeenURLs()
+    assert seen.claim('https://fritz.co.kr/product/detail.html?product_no=12')
+    assert not seen.claim('https://fritz.co.kr/product/detail.html?cate_no=24&product_no=12')
+    assert seen.claim('https://fritz.co.kr/product/detail.html?product_no=13')
+
+
+def test_fetches_within_window_are_skipped_by_later_runs(tmp_path):
+    path = str(tmp_path / 'seen_urls.db')
+    seen = SeenURLs(path)
+    seen.mark_fetched('https://fritz.co.kr/product/detail.html?product_no=12')
+    seen.close()
+    
+    # Without a window earlier fetches are recorded but not skipped
+    assert SeenURLs(path).claim('https://fritz.co.kr/product/detail.html?product_no=12')
+    
+    seen = SeenURLs(path, window=3600)
+    assert not seen.claim('https://fritz.co.kr/product/detail.html?product_no=12')
+    assert seen.claim('https://fritz.co.kr/product/detail.html?product_no=13')
+    seen.close()
@@ -0,0 +1,34 @@
+from src.models import Coffee
+from src.search.similarity import SimilarityModel
+
+
+def make(roastery: str, number: int, notes, origin: str) -> Coffee:
+    return Coffee(roastery, f'{origin} {number}', origin=origin, tasting_notes=notes,
+                  url=f'https://{roastery}.kr/product/detail.html?product_no={number}')
+
+
+def test_similar_coffees_rank_first():
+    model = SimilarityModel()
+    floral = make('fritz', 1, ['jasmine', 'lemon'], 'Ethiopia')
+    model.add([
+        floral,
+        make('center', 1, ['jasmine', 'lemon', 'honey'], 'Ethiopia'),
+        make('center', 2, ['chocolate', 'nutty'], 'Brazil'),
+        make('fritz', 2, ['jasmine'], 'Ethiopia'),
+    ])
+    
+    names = [coffee.coffee_name for coffee, _ in model.similar_to(floral, k=3)]
+    assert names[0] == 'Ethiopia 1' and 'Brazil 2' not in names
+    
+    other = model.similar_to(floral, k=3, other_roasteries=True)
+    assert {coffee.roastery_name for coffee, _ in other} == {'center'}
+
+
+def test_adding_coffees_refreshes_the_cached_matrix():
+    model = SimilarityModel()
+    first = make('fritz', 1, ['jasmine'], 'Ethiopia')
+    model.add([first, make('center', 1, ['chocolate'], 'Brazil')])
+    assert model.similar_to(first) == []
+    
+    model.add([make('center', 2, ['jasmine'], 'Kenya')])
+    assert [coffee.coffee_name for coffee, _ in model.similar_to(first)] == ['Kenya 2']
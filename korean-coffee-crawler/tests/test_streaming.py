@@ -0,0 +1,92 @@
+from src.crawlers import CRAWLERS
+from src.crawlers.base_crawler import PartialHTML
+
+
+URL = 'https://fritz.co.kr/product/detail.html?product_no=1'
+MARKER = '<div id="reviews"'
+HEAD = '<html><body><div class="headingArea"><h2>에티오피아 구지</h2></div><p>' + '설명' * 40 + '</p>'
+PAGE = HEAD + MARKER + '>' + '리뷰' * 200 + '</div></body></html>'
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, chunk_size: int, content_type: str = 'text/html'):
+        self.content = body
+        self.chunk_size = chunk_size
+        self.headers = {'content-type': content_type}
+        self.encoding = content_type.split('charset=')[-1] if 'charset=' in content_type else 'ISO-8859-1'
+        self.status_code = 200
+        self.closed = False
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding if 'charset=' in self.headers['content-type'] else 'utf-8')
+    
+    def raise_for_status(self):
+        pass
+    
+    def iter_content(self, size):
+        for start in range(0, len(self.content), self.chunk_size):
+            yield self.content[start:start + self.chunk_size]
+    
+    def close(self):
+        self.closed = True
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeSession:
+    def __init__(self, body: bytes, chunk_size: int, content_type: str = 'text/html'):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.content_type = content_type
+        self.requests = []
+    
+    def get(self, url, timeout=None, stream=False):
+        self.requests.append(stream)
+        return FakeResponse(self.body, self.chunk_size, self.content_type)
+
+
+def streaming_crawler(session: FakeSession):
+    crawler = CRAWLERS['fritz']()
+    crawler.session = session
+    crawler.respect_robots = False
+    crawler.stream_until = [MARKER]
+    return crawler
+
+
+def test_cut_lands_exactly_at_the_marker_for_any_chunking():
+    body = PAGE.encode('utf-8')
+    # Chunk sizes that split the marker, split a Hangul character (3 bytes) or hold the page in one chunk
+    for chunk_size in (1, 2, 7, 16, len(HEAD.encode('utf-8')) + 5, len(body)):
+        html = streaming_crawler(FakeSession(body, chunk_size)).fetch_streamed(URL)
+        assert isinstance(html, PartialHTML), chunk_size
+        assert html == HEAD, chunk_size
+
+
+def test_page_without_marker_is_returned_whole():
+    body = HEAD.encode('utf-8') + '</body></html>'.encode('utf-8')
+    html = streaming_crawler(FakeSession(body, 10)).fetch_streamed(URL)
+    assert html == body.decode('utf-8') and not isinstance(html, PartialHTML)
+
+
+def test_meta_charset_decodes_legacy_pages():
+    head = '<html><head><meta charset="euc-kr"></head><body><h2>콜롬비아</h2>'
+    body = (head + MARKER + '>리뷰</div>').encode('euc-kr')
+    html = streaming_crawler(FakeSession(body, 5)).fetch_streamed(URL)
+    assert html == head
+
+
+def test_partial_page_missing_required_fields_is_refetched_whole():
+    # The name only appears after the marker, so the cut page does not parse
+    page = '<html><body>' + MARKER + '></div><div class="headingArea"><h2>케냐 AA</h2></div></body></html>'
+    session = FakeSession(page.encode('utf-8'), 8)
+    crawler = streaming_crawler(session)
+    
+    coffee = crawler.parse_fetched(URL, crawler.fetch_page(URL))
+    assert coffee.coffee_name == '케냐 AA'
+    assert session.requests == [True, False]
+    assert crawler.metrics.streamed_pages == 1 and crawler.metrics.stream_refetches == 1
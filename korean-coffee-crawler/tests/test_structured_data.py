@@ -0,0 +1,75 @@
+from src.crawlers import CRAWLERS
+from src.utils.structured_data import extract_structured
+
+
+URL = 'https://fritz.co.kr/product/detail.html?product_no=1'
+JSON_LD = """<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [
+  {"@type": "BreadcrumbList"},
+  {"@type": "Product", "name": "에티오피아 구지 &amp; 시다마",
+   "offers": {"@type": "Offer", "price": "21000", "availability": "https://schema.org/OutOfStock"}}
+]}
+</script>"""
+DOM = """<div class="headingArea"><h2>에티오피아 (DOM)</h2></div>
+<span id="span_product_price_text">18,000원</span>
+<table class="xans-product-additional"><tbody><tr><th>원산지</th><td>에티오피아</td></tr></tbody></table>"""
+
+
+def page(head: str, body: str = DOM) -> str:
+    return f'<html><head>{head}</head><body>{body}</body></html>'
+
+
+def test_json_ld_product_in_graph():
+    assert extract_structured(page(JSON_LD)) == {
+        'coffee_name': '에티오피아 구지 & 시다마', 'price': 21000, 'available': False
+    }
+
+
+def test_embedded_data_overrides_dom_fields():
+    crawler = CRAWLERS['fritz']()
+    coffee = crawler.parse_page(page(JSON_LD), URL)
+    
+    # Name and price come from JSON-LD even though the selectors found others; the rest still from the DOM
+    assert coffee.coffee_name == '에티오피아 구지 & 시다마'
+    assert coffee.price == 21000
+    assert coffee.available is False
+    assert coffee.origin == '에티오피아'
+    
+    crawler.use_structured_data = False
+    coffee = crawler.parse_page(page(JSON_LD), URL)
+    assert (coffee.coffee_name, coffee.price, coffee.available) == ('에티오피아 (DOM)', 18000, None)
+
+
+def test_malformed_json_ld_falls_back_to_later_sources():
+    broken = '<script type="application/ld+json">{"@type": "Product", "name": "cut off",</script>'
+    meta = ('<meta property="og:title" content="케냐 AA - 프릳츠">'
+            '<meta property="og:site_name" content="프릳츠">'
+            '<meta property="product:price:amount" content="19,500">')
+    assert extract_structured(page(broken + meta, '')) == {'coffee_name': '케냐 AA', 'price': 19500}
+    
+    # With nothing embedded the selectors decide
+    coffee = CRAWLERS['fritz']().parse_page(page(broken), URL)
+    assert (coffee.coffee_name, coffee.price) == ('에티오피아 (DOM)', 18000)
+
+
+def test_cafe24_inline_vars():
+    script = """<script>
+    var product_name = '콜롬비아 \\'수프리모\\'';
+    var product_price = "16000.00";
+    var sSoldOut = 'T';
+    </script>"""
+    assert extract_structured(page('', script)) == {
+        'coffee_name': "콜롬비아 '수프리모'", 'price': 16000, 'available': False
+    }
+
+
+def test_godomall_inline_fields():
+    script = '<script>var goodsView = {"goodsNm":"\\ud30c\\ub098\\ub9c8 \\uac8c\\uc774\\uc0e4", "goodsPrice":"45000", "soldOutFl":"n"};</script>'
+    assert extract_structured(page('', script)) == {'coffee_name': '파나마 게이샤', 'price': 45000, 'available': True}
+
+
+def test_json_ld_wins_over_inline_vars_and_meta():
+    inline = '<script>var product_price = "9900";</script>'
+    meta = '<meta property="product:price:amount" content="8800">'
+    assert extract_structured(page(JSON_LD + meta, inline))['price'] == 21000
+    assert extract_structured(page(meta, inline))['price'] == 9900